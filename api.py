@@ -0,0 +1,302 @@
+# api.py — read-only JSON live-score API for MPGB Cricket Club
+# A small HTTP server next to APP.py for clients that only want the score (the club
+# WhatsApp bot, a TV screen at the ground), so they never load the Streamlit UI.
+# Standard library only; reads the same store as the app (files or SQLite).
+#
+#   GET /matches                                   live matches
+#   GET /matches/<mid>                             score summary
+#   GET /matches/<mid>/scorecard                   batting / bowling figures
+#   GET /matches/<mid>/balls?since=N&corrections=C balls_log entries from index N on
+#
+# Every response carries an ETag and Last-Modified. A poller that sends them back
+# (If-None-Match / If-Modified-Since) gets 304 with no body until a ball lands, and
+# that check is just store.match_version() (two stat() calls for files), with no
+# state loaded or JSON built. Bodies are built once per match version and shared.
+# Deltas: a client keeps `balls` from the last reply as its next `since`. An undo /
+# edit bumps "corrections"; when the client's value is stale it gets the whole list
+# with "reset": true.
+#
+#   python api.py [--host 0.0.0.0] [--port 8502]
+#   python api.py --load-test 2000 [--secs 30]    pollers against a local server
+
+import hashlib, json, os, sys, threading, time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import metrics, storage
+from scoring import latest_commentary, overs_str, rr
+
+PORT = 8502
+CACHE_SIZE = 512  # rendered bodies kept (per path + query + match version)
+
+
+# -------------------- Views (pure: state in, dict out) --------------------
+def _score(s, side):
+    sc = s["score"][side]
+    return {"runs": sc["runs"], "wkts": sc["wkts"], "overs": overs_str(sc["balls"]), "balls": sc["balls"]}
+
+
+def summary(mid, meta, s):
+    bat, bowl = s["bat_team"], s["bowl_team"]; sc = s["score"][bat]
+    names = meta.get("team_names") or {}
+    out = {"mid": mid, "title": meta.get("title", ""), "venue": meta.get("venue", ""), "status": s["status"],
+           "innings": s["innings"], "overs_limit": s["overs_limit"], "batting": bat, "bowling": bowl,
+           "team_names": {side: names.get(side, side) for side in s["score"]},
+           "score": {side: _score(s, side) for side in s["score"]}, "crr": rr(sc["runs"], sc["balls"]),
+           "seq": s.get("_seq", 0), "balls": ball_count(s), "corrections": s.get("corrections", 0)}
+    if s["innings"] == 2:
+        target = s["score"][bowl]["runs"] + 1; left = s["overs_limit"] * 6 - sc["balls"]
+        need = max(target - sc["runs"], 0)
+        out.update(target=target, need=need, balls_left=left, rrr=rr(need, left) if left > 0 else None)
+    bs = s.get("batsman_stats", {}); bw = s.get("bowler_stats", {})
+    out["batters"] = [dict(name=p, striker=p == s["batting"].get("striker"), **bs.get(p, {}))
+                      for p in (s["batting"].get("striker"), s["batting"].get("non_striker")) if p]
+    b = s["bowling"].get("current_bowler")
+    out["bowler"] = dict(name=b, overs=overs_str(bw[b]["B"]), runs=bw[b]["R"], wkts=bw[b]["W"]) if b in bw else None
+    out["recent"] = [x["txt"] for x in s.get("balls_log", [])[-6:]]
+    out["commentary"] = latest_commentary(s, 5)
+    return out
+
+
+def scorecard(mid, meta, s):
+    team_of = {p: side for side, ps in s["teams"].items() for p in ps}
+    bat = {side: [] for side in s["teams"]}; bowl = {side: [] for side in s["teams"]}
+    for p, b in s.get("batsman_stats", {}).items():
+        if p in team_of: bat[team_of[p]].append(dict(name=p, runs=b["R"], balls=b["B"], fours=b["4"], sixes=b["6"]))
+    for p, b in s.get("bowler_stats", {}).items():
+        if p in team_of: bowl[team_of[p]].append(dict(name=p, overs=overs_str(b["B"]), runs=b["R"], wkts=b["W"],
+                                                      econ=rr(b["R"], b["B"])))
+    return {"mid": mid, "title": meta.get("title", ""), "status": s["status"], "seq": s.get("_seq", 0),
+            "score": {side: _score(s, side) for side in s["score"]}, "batting": bat, "bowling": bowl}
+
+
+def ball_count(s): return s.get("balls_paged", 0) + len(s.get("balls_log", []))
+
+
+def balls_since(s, since=0, corrections=None, history=None):
+    # history(start): balls_log entries from `start` on, older pages included (the
+    # state itself only holds the newest ones; see storage.page_out)
+    n = ball_count(s); fixes = s.get("corrections", 0)
+    reset = since > n or (corrections is not None and corrections != fixes)
+    start = 0 if reset else max(since, 0)
+    items = history(start) if history else s.get("balls_log", [])[max(start - s.get("balls_paged", 0), 0):]
+    return {"since": start, "balls": n, "corrections": fixes, "reset": reset, "seq": s.get("_seq", 0),
+            "items": items}
+
+
+# -------------------- Server --------------------
+class LiveAPI:
+    # Routing + conditional GET; shared by every handler thread
+    def __init__(self, db=None):
+        self.db = db or storage.store()
+        self.states = storage.state_cache() if db is None else storage.StateCache(db)
+        self._lock = threading.Lock()
+        self._bodies = OrderedDict()  # (path, query, version) -> (etag, last_modified, body)
+        self._seen = {}  # version key -> Last-Modified (whole seconds)
+        self._last = {}  # route (version key minus the version) -> newest Last-Modified issued
+
+    def _meta(self, mid):
+        return self.db.active_matches().get(mid) or self.db.load_matches().get(mid)
+
+    def _version(self, parts):
+        # Change token for a route, without loading any state
+        if len(parts) == 1: return ("list", json.dumps(self.db.active_matches(), sort_keys=True, default=str))
+        return ("match", parts[1], self.db.match_version(parts[1]))
+
+    def _render(self, parts, since, fixes):
+        if len(parts) == 1:
+            return [{"mid": m, "title": v.get("title", ""), "venue": v.get("venue", ""),
+                     "status": v.get("status", ""), "url": f"/matches/{m}"}
+                    for m, v in reversed(list(self.db.active_matches().items()))]
+        mid = parts[1]; meta = self._meta(mid)
+        s = self.states.get(mid, meta) if meta else None
+        if not s: return None
+        if len(parts) == 2: return summary(mid, meta, s)
+        if parts[2] == "scorecard": return scorecard(mid, meta, s)
+        return balls_since(s, since, fixes, lambda start: storage.history(self.db, mid, s, "balls", start))
+
+    def get(self, path, headers):
+        # -> (status, extra headers, body bytes)
+        url = urlsplit(path)
+        parts = [p for p in url.path.split("/") if p]
+        if not parts or parts[0] != "matches" or len(parts) > 3 or (len(parts) == 3 and parts[2] not in ("scorecard", "balls")):
+            return 404, {}, b'{"error":"not found"}'
+        query = parse_qs(url.query)
+        try:
+            since = int(query.get("since", ["0"])[0] or 0)
+            fixes = int(query["corrections"][0]) if query.get("corrections", [""])[0] else None
+        except ValueError:
+            return 400, {}, b'{"error":"since and corrections must be integers"}'
+        ver = self._version(parts)
+        key = (url.path, url.query, ver)
+        with self._lock:
+            hit = self._bodies.get(key)
+            if hit: self._bodies.move_to_end(key)
+        if hit is None:
+            with metrics.span("api_render"): data = self._render(parts, since, fixes)
+            if data is None: return 404, {}, b'{"error":"no such match"}'
+            body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            etag = '"' + hashlib.sha1(repr(ver).encode() + body).hexdigest()[:20] + '"'
+            with self._lock:
+                last = self._seen.get(ver)
+                if last is None:
+                    # First time this version is served. Strictly later than the route's
+                    # previous version, even within one second, so If-Modified-Since never
+                    # mistakes a new version for the old one.
+                    route = ver[:-1]
+                    last = self._last[route] = max(int(time.time()), self._last.get(route, 0) + 1)
+                    if len(self._seen) > CACHE_SIZE * 4: self._seen.clear()
+                    self._seen[ver] = last
+                hit = self._bodies[key] = (etag, formatdate(last, usegmt=True), body)
+                while len(self._bodies) > CACHE_SIZE: self._bodies.popitem(last=False)
+        etag, last_modified, body = hit
+        out = {"ETag": etag, "Last-Modified": last_modified}
+        inm, ims = headers.get("If-None-Match"), headers.get("If-Modified-Since")
+        if inm is not None:
+            fresh = inm.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in inm.split(",")]
+        elif ims is not None:
+            try: fresh = parsedate_to_datetime(ims) >= parsedate_to_datetime(last_modified)
+            except (TypeError, ValueError): fresh = False
+        else: fresh = False
+        return (304, out, b"") if fresh else (200, out, body)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive for pollers that reuse a connection
+    api = None
+
+    def do_GET(self, head=False):
+        t0 = time.perf_counter()
+        try: status, extra, body = self.api.get(self.path, self.headers)
+        except Exception as e:  # one bad request must not take the server down
+            print(f"api error on {self.path}: {e!r}", file=sys.stderr)
+            status, extra, body = 500, {}, b'{"error":"internal error"}'
+        self.send_response(status)
+        for k, v in extra.items(): self.send_header(k, v)
+        self.send_header("Cache-Control", "no-cache")  # always revalidate; 304s are cheap
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304 and not head: self.wfile.write(body)
+        metrics.incr(f"api:{status}")
+        if metrics.enabled(): metrics.observe("api_request", time.perf_counter() - t0)
+
+    def do_HEAD(self): self.do_GET(head=True)
+
+    def log_message(self, fmt, *args): pass  # thousands of polls a minute: keep stderr quiet
+
+
+def serve(host="0.0.0.0", port=PORT, api=None):
+    Handler.api = api or LiveAPI()
+    ThreadingHTTPServer.request_queue_size = 1024  # bursts of pollers connecting at once
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    return httpd
+
+
+# -------------------- Load test --------------------
+def _cpu_secs(pid):
+    # utime + stime of a process from /proc (Linux); None elsewhere
+    try:
+        with open(f"/proc/{pid}/stat") as f: fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+async def _poller(host, port, path, conditional, stop, interval, stats, rnd):
+    # One client on one keep-alive connection (reconnects if the server closes it)
+    import asyncio
+    etag = reader = writer = None
+    await asyncio.sleep(rnd.uniform(0, interval))
+    while time.perf_counter() < stop:
+        t0 = time.perf_counter()
+        try:
+            if writer is None: reader, writer = await asyncio.open_connection(host, port)
+            cond = f"If-None-Match: {etag}\r\n" if conditional and etag else ""
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{cond}\r\n".encode())
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+            fields = {h.split(":", 1)[0].lower(): h.split(":", 1)[1].strip() for h in head[1:] if ":" in h}
+            body = await reader.readexactly(int(fields.get("content-length", 0)))
+            status = int(head[0].split()[1]); etag = fields.get("etag", etag)
+            stats["lat"].append(time.perf_counter() - t0); stats[status] = stats.get(status, 0) + 1
+            stats["bytes"] += len(body) + sum(map(len, head)) + 2 * len(head)
+        except (OSError, EOFError, asyncio.IncompleteReadError, IndexError, ValueError):
+            stats["errors"] += 1
+            if writer: writer.close()
+            reader = writer = None
+        await asyncio.sleep(max(interval - (time.perf_counter() - t0), 0))
+    if writer: writer.close()
+
+
+def load_test(pollers=2000, secs=30, interval=5.0, ball_every=15.0, port=8599):
+    # `pollers` clients each GET one match summary every `interval` seconds while a
+    # scorer records a ball every `ball_every` seconds; once with plain GETs, once with
+    # If-None-Match. The server runs in its own process so its CPU time can be read.
+    import asyncio, random, shutil, subprocess, tempfile
+    here = os.path.dirname(os.path.abspath(__file__))
+    work = tempfile.mkdtemp(); cwd = os.getcwd()
+    os.chdir(work); os.makedirs("data", exist_ok=True)  # storage paths are relative to "data"
+    server = None
+    try:
+        db = storage.FileStore()
+        meta = {"title": "Load test XI vs XI", "overs": 50, "storage": "eventlog", "created_at": "2025-01-01T00:00:00"}
+        db.save_match("load", meta)
+        s = storage._scorer("load", meta, 40, None)  # a match under way
+        server = subprocess.Popen([sys.executable, os.path.join(here, "api.py"), "--host", "127.0.0.1",
+                                   "--port", str(port)], cwd=work)
+        time.sleep(1.0)
+
+        def score(stop):
+            while time.perf_counter() < stop:
+                time.sleep(ball_every)
+                if not s["over_in_progress"]:
+                    db.record_event("load", meta, s, {"t": "players", "striker": s["batting"]["striker"] or "A0",
+                                                      "non_striker": s["batting"]["non_striker"] or "A1",
+                                                      "bowler": "B6" if s["bowling"]["last_over_bowler"] != "B6" else "B7"})
+                db.record_event("load", meta, s, {"t": "ball", "outcome": "1", "runs": 0})
+
+        async def run(conditional):
+            stats = {"lat": [], "errors": 0, "bytes": 0}
+            stop = time.perf_counter() + secs; rnd = random.Random(1)
+            scorer = asyncio.get_running_loop().run_in_executor(None, score, stop)
+            await asyncio.gather(*(_poller("127.0.0.1", port, "/matches/load", conditional, stop, interval, stats, rnd)
+                                   for _ in range(pollers)))
+            await scorer
+            return stats
+
+        for conditional in (False, True):
+            cpu0 = _cpu_secs(server.pid); t0 = time.perf_counter()
+            st = asyncio.run(run(conditional))
+            wall = time.perf_counter() - t0; cpu1 = _cpu_secs(server.pid)
+            lat = sorted(st["lat"]); n = len(lat)
+            p = lambda q: lat[min(int(q * n), n - 1)] * 1e3 if n else float("nan")
+            cpu = f", server CPU {(cpu1 - cpu0) / n * 1e6:.0f} us/request" if cpu0 is not None and n else ""
+            print(f"{'If-None-Match' if conditional else 'plain GET':13}: {pollers} pollers, {n} requests in {wall:.1f}s "
+                  f"({n / wall:.0f}/s), 200 x{st.get(200, 0)}, 304 x{st.get(304, 0)}, errors {st['errors']}; "
+                  f"latency p50 {p(.5):.1f} ms, p95 {p(.95):.1f} ms, p99 {p(.99):.1f} ms; "
+                  f"{st['bytes'] / max(n, 1):.0f} B/request{cpu}")
+    finally:
+        if server: server.terminate(); server.wait()
+        os.chdir(cwd); shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Read-only JSON live-score API")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--load-test", type=int, metavar="POLLERS")
+    ap.add_argument("--secs", type=float, default=30)
+    ap.add_argument("--interval", type=float, default=5.0, help="seconds between polls per client")
+    ap.add_argument("--ball-every", type=float, default=15.0, help="seconds between balls")
+    a = ap.parse_args()
+    if a.load_test:
+        load_test(a.load_test, a.secs, a.interval, a.ball_every); sys.exit(0)
+    httpd = serve(a.host, a.port)
+    print(f"live-score API on http://{a.host}:{a.port}/matches")
+    try: httpd.serve_forever()
+    except KeyboardInterrupt: pass
@@ -0,0 +1,122 @@
+# archive.py — columnar (Parquet) archive of completed matches
+# Each completed match is exported once into three hive-partitioned datasets:
+#   data/archive/balls/season=YYYY/mid=<mid>/part.parquet    one row per delivery
+#   data/archive/players/season=YYYY/mid=<mid>/part.parquet  per-player match figures
+#   data/archive/scores/season=YYYY/mid=<mid>/part.parquet   one row per innings
+# Files are zstd-compressed and read back memory-mapped, optionally only for one
+# season, so season views never parse the per-match JSON files. Every file is written
+# with the fixed COLUMNS schema and scans read with it, so one odd match (no deliveries,
+# an older null-typed file) cannot break the whole dataset.
+# Needs pyarrow (installed with Streamlit); without it HAVE_ARROW is False and stats.py
+# keeps using its pickle ball table.
+
+import os, time
+import pandas as pd
+import storage
+from scoring import ensure_state_defaults
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+ARCHIVE_DIR = os.path.join(storage.DATA_DIR, "archive")
+VERSION_FILE = os.path.join(ARCHIVE_DIR, "_version")
+
+# Column types per dataset (season / mid come from the partition path). Fixed, so an
+# empty or all-null frame can never give a file a null-typed column that the dataset
+# scan then fails to unify with the other files.
+_INT, _STR = ("int64", "string")
+COLUMNS = {
+    "balls": {"innings": _INT, "team": _STR, "batter": _STR, "bowler": _STR, "bat_runs": _INT, "bat_balls": _INT,
+              "fours": _INT, "sixes": _INT, "out": _INT, "bowl_balls": _INT, "bowl_runs": _INT, "wkts": _INT,
+              "extras": _INT},
+    "players": {"player": _STR, "team": _STR, "runs": _INT, "balls": _INT, "fours": _INT, "sixes": _INT,
+                "bowl_balls": _INT, "conceded": _INT, "wickets": _INT},
+    "scores": {"team": _STR, "runs": _INT, "wkts": _INT, "balls": _INT, "title": _STR, "venue": _STR,
+               "status": _STR},
+}
+
+
+def _part_path(table, season, mid):
+    return os.path.join(ARCHIVE_DIR, table, f"season={season}", f"mid={mid}", "part.parquet")
+
+
+def _schema(table, partitions=False):
+    fields = [pa.field(c, t) for c, t in COLUMNS[table].items()]
+    if partitions: fields += [pa.field("season", "int32"), pa.field("mid", "string")]
+    return pa.schema(fields)
+
+
+def _write(df, table, season, mid):
+    # Empty frames (e.g. a match completed with no deliveries) write no file
+    path = _part_path(table, season, mid)
+    if df.empty:
+        if os.path.exists(path): os.remove(path)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df = df[list(COLUMNS[table])].astype({c: t for c, t in COLUMNS[table].items() if t == _INT})
+    data = pa.Table.from_pandas(df, schema=_schema(table), preserve_index=False)
+    tmp = os.path.join(os.path.dirname(path), ".part.parquet.tmp")  # dot prefix: not picked up by a scan
+    pq.write_table(data, tmp, compression="zstd")
+    os.replace(tmp, path)
+
+
+def player_rows(state):
+    # Per-player figures for one match, from the folded state
+    team_of = {p: t for t, ps in state["teams"].items() for p in ps}
+    names = list(dict.fromkeys(list(state["batsman_stats"]) + list(state["bowler_stats"])))
+    zero_bat, zero_bowl = {"R": 0, "B": 0, "4": 0, "6": 0}, {"B": 0, "R": 0, "W": 0}
+    rows = []
+    for p in names:
+        b = state["batsman_stats"].get(p, zero_bat); w = state["bowler_stats"].get(p, zero_bowl)
+        rows.append({"player": p, "team": team_of.get(p, ""), "runs": b["R"], "balls": b["B"], "fours": b["4"],
+                     "sixes": b["6"], "bowl_balls": w["B"], "conceded": w["R"], "wickets": w["W"]})
+    return pd.DataFrame(rows, columns=["player", "team", "runs", "balls", "fours", "sixes",
+                                       "bowl_balls", "conceded", "wickets"])
+
+
+def score_rows(state, meta):
+    rows = [{"team": t, "runs": sc["runs"], "wkts": sc["wkts"], "balls": sc["balls"], "title": meta.get("title", ""),
+             "venue": meta.get("venue", ""), "status": state.get("status", "")}
+            for t, sc in state["score"].items()]
+    return pd.DataFrame(rows)
+
+
+def export_match(db, mid, meta, balls=None):
+    # balls: the match's stats.match_rows frame, if the caller already built it
+    import stats
+    season = stats.season_of(mid, meta)
+    state = db.load_state(mid, meta); ensure_state_defaults(state, meta)
+    if balls is None: balls = stats._rows_for(db, mid, meta)
+    _write(balls, "balls", season, mid)
+    _write(player_rows(state), "players", season, mid)
+    _write(score_rows(state, meta), "scores", season, mid)
+    storage.save_json(VERSION_FILE, time.time_ns())  # atomic: a reader never sees it half written
+
+
+def archived_mids():
+    # From "scores" (every match has rows there; "balls" has none for a 0-ball match)
+    root = os.path.join(ARCHIVE_DIR, "scores")
+    if not os.path.isdir(root): return set()
+    return {m[4:] for sd in os.listdir(root) if sd.startswith("season=")
+            for m in os.listdir(os.path.join(root, sd)) if m.startswith("mid=")}
+
+
+def scan(table, season=None, columns=None):
+    # Archived rows of one dataset as a DataFrame (memory-mapped Parquet reads)
+    root = os.path.join(ARCHIVE_DIR, table)
+    if not os.path.isdir(root) or not os.listdir(root): return None
+    filters = [("season", "=", int(season))] if season is not None else None
+    df = pq.read_table(root, columns=columns, filters=filters, memory_map=True,
+                       schema=_schema(table, partitions=True), partitioning="hive").to_pandas()
+    for col, typ in (("mid", str), ("season", int)):
+        if col in df: df[col] = df[col].astype(typ)
+    return df
+
+
+def version():
+    # Changes whenever a match is exported (cache key for views)
+    return storage.load_json(VERSION_FILE, None)
@@ -0,0 +1,356 @@
+# bench.py — headless benchmark suite for MPGB Cricket Club
+# Runs without Streamlit (the startup case uses it when installed). Each case prints
+# its numbers; the whole run is appended as one JSON line to bench_results.jsonl (git
+# commit, time, metrics), so per-ball latency and the other paths can be compared
+# between versions. Every metric is a time, lower is better.
+#
+#   python bench.py                    all cases
+#   python bench.py match registry     selected cases (match, edit, paid, registry, cards, stats, projection, startup)
+#   python bench.py --quick --compare  smaller sizes; flag >20% slowdowns vs the last run
+
+import json, os, statistics, subprocess, sys, tempfile, time
+from datetime import datetime
+import pandas as pd
+import storage
+from scoring import fold_event, read_events
+
+RESULTS = "bench_results.jsonl"
+# One wicket in 36 balls, so a 50-over innings is rarely bowled out early
+FULL_OUTCOMES = (["0", "1", "0", "2", "4", "1", "6", "Wide", "0", "1", "1", "Bye"] * 3)[:-1] + ["Wicket"]
+
+
+def _ms(secs): return round(secs * 1e3, 4)
+
+
+def bench_match(quick=False):
+    # Full T20 / 50-over matches through the event-log store: per-ball persist cost
+    # early vs late in the match and pure apply cost. Both should stay flat: the log
+    # append is one line and the every-12th-ball snapshot keeps the same size, since
+    # the growing lists are paged out of it (storage.page_out).
+    out = {}
+    fsync = storage.FSYNC
+    storage.FSYNC = False  # measure our code, not the disk
+    try:
+        for label, overs in (("t20", 20), ("odi", 50)):
+            if quick and overs == 50: continue
+            storage.DATA_DIR = tempfile.mkdtemp()
+            timings = []
+            t0 = time.perf_counter()
+            storage._scorer(label, {"storage": "eventlog"}, None, None, overs=overs, outcomes=FULL_OUTCOMES,
+                            timings=timings)
+            total = time.perf_counter() - t0
+            balls = [dt for t, dt in timings if t == "ball"]
+            tenth = max(len(balls) // 10, 1)
+            events = read_events(storage.match_log_path(label))
+            t0 = time.perf_counter()
+            s = {}
+            for ev in events: fold_event(s, ev)
+            apply = (time.perf_counter() - t0) / len(events)
+            out.update({f"match.{label}.total_ms": _ms(total),
+                        f"match.{label}.ball_p50_ms": _ms(statistics.median(balls)),
+                        f"match.{label}.ball_first10pct_ms": _ms(statistics.mean(balls[:tenth])),
+                        f"match.{label}.ball_last10pct_ms": _ms(statistics.mean(balls[-tenth:])),
+                        f"match.{label}.apply_ms": _ms(apply)})
+            print(f"{label}: {len(balls)} balls in {total:.2f}s — record p50 {statistics.median(balls) * 1e3:.3f} ms "
+                  f"(first 10% {statistics.mean(balls[:tenth]) * 1e3:.3f}, last 10% "
+                  f"{statistics.mean(balls[-tenth:]) * 1e3:.3f}), apply {apply * 1e6:.1f} us/event")
+    finally:
+        storage.FSYNC = fsync; storage.DATA_DIR = "data"
+    return out
+
+
+def bench_edit(quick=False):
+    # Undo / edit-ball near the end of a 50-over match (re-fold from a checkpoint)
+    fsync, data = storage.FSYNC, storage.DATA_DIR
+    try: r = storage.edit_bench(overs=20 if quick else 50, reps=3 if quick else 5)
+    finally: storage.FSYNC, storage.DATA_DIR = fsync, data
+    out = {"edit.full_refold_ms": _ms(r["full"])}
+    for k in (1, 36, 120, "undo"):
+        name = "undo" if k == "undo" else f"back{k}"
+        out[f"edit.{name}_ms"], out[f"edit.{name}_rebuild_ms"] = _ms(r[k][0]), _ms(r[k][1])
+    return out
+
+
+def bench_paid(quick=False):
+    # Cache-miss cost of the paid list (what _load_paid_members does per file change)
+    # and the cached membership check
+    from registry import norm_mobiles
+    n = 5000 if quick else 50000
+    path = os.path.join(tempfile.mkdtemp(), "Members_Paid.xlsx")
+    pd.DataFrame({"Mobile_No": [f"+91-9{i:09d}" for i in range(n)]}).to_excel(path, index=False)
+    t0 = time.perf_counter()
+    df = pd.read_excel(path, dtype={"Mobile_No": str})
+    mobiles = frozenset(m for m in norm_mobiles(df["Mobile_No"].dropna()) if m)
+    load = time.perf_counter() - t0
+    probes = [f"9{i:09d}" for i in range(0, 2 * n, 7)]
+    t0 = time.perf_counter()
+    for m in probes: m in mobiles
+    lookup = (time.perf_counter() - t0) / len(probes)
+    print(f"paid list: {n} rows parsed in {load:.2f}s, cached lookup {lookup * 1e9:.0f} ns")
+    return {f"paid.load_{n}_ms": _ms(load), "paid.lookup_ms": _ms(lookup)}
+
+
+def bench_registry(quick=False):
+    # Single appends into a registry that already holds 10k members, and one bulk import
+    from registry import register_many, register_member
+    path = os.path.join(tempfile.mkdtemp(), "Registered_Members.csv")
+    register_many(path, [(f"Player {i}", f"9{i:09d}", "BR001", "Batsman") for i in range(10000)])
+    k = 50 if quick else 200
+    t0 = time.perf_counter()
+    for i in range(k): register_member(path, f"New {i}", f"8{i:09d}", "BR002", "Bowler")
+    one = (time.perf_counter() - t0) / k
+    t0 = time.perf_counter()
+    register_many(path, [(f"Bulk {i}", f"7{i:09d}", "BR003", "Batsman") for i in range(500)])
+    bulk = time.perf_counter() - t0
+    print(f"registry @10k: {one * 1e3:.3f} ms per registration, 500-row import {bulk * 1e3:.1f} ms")
+    return {"registry.append_10k_ms": _ms(one), "registry.import_500_ms": _ms(bulk)}
+
+
+def bench_cards(quick=False):
+    import cards
+    n = 40 if quick else 200
+    members = [{"Reg_No": f"MPGBCC-2025-{i:04d}", "Name": f"Player {i}", "Mobile": f"9{i:09d}",
+                "Branch": f"BR{i % 40:03d}", "Role": "Batsman"} for i in range(n)]
+    cards.card_png(members[0])  # warm the background cache
+    t0 = time.perf_counter()
+    for m in members[:20]: cards.card_png(m)
+    one = (time.perf_counter() - t0) / 20
+    t0 = time.perf_counter()
+    cards.render_bulk(members, "zip")
+    bulk = (time.perf_counter() - t0) / n
+    print(f"cards: {one * 1e3:.1f} ms per card, bulk ZIP {bulk * 1e3:.1f} ms per card ({1 / bulk:.0f}/s)")
+    return {"cards.png_ms": _ms(one), "cards.bulk_zip_ms": _ms(bulk)}
+
+
+def _synthetic_matches(n, overs=20, seed=7):
+    # n completed matches in ./data over three seasons: two of 12 branch sides (132
+    # players) each, random outcomes; written as event log + snapshot, no per-ball I/O
+    import random
+    from scoring import new_match_state
+    rnd = random.Random(seed)
+    sides = [[f"BR{b:02d} P{p}" for p in range(11)] for b in range(12)]
+    outcomes = ["0", "0", "1", "1", "1", "2", "4", "6", "Wide", "Bye", "Wicket"]
+    matches = {}
+    for k in range(n):
+        mid = f"{2023 + k % 3}0{1 + k % 9}{10 + k % 18}-S{k:04d}"
+        a, b = rnd.sample(sides, 2); teams = {"Team A": a, "Team B": b}
+        events = [{"t": "start", "overs": overs, "bat_team": "Team A", "teams": teams, "ts": "start"}]
+        s = new_match_state(overs, "Team A", a, b)
+        while s["status"] != "COMPLETED":
+            bat = s["batting"]; sc = s["score"][s["bat_team"]]
+            if sc["balls"] >= overs * 6 or sc["wkts"] >= 10: ev = {"t": "end_innings"}
+            elif not s["over_in_progress"]:
+                bowlers = [p for p in teams[s["bowl_team"]][5:] if p != s["bowling"]["last_over_bowler"]]
+                ev = {"t": "players", "striker": bat["striker"] or bat["order"][0],
+                      "non_striker": bat["non_striker"] or bat["order"][1], "bowler": rnd.choice(bowlers)}
+            else: ev = {"t": "ball", "outcome": rnd.choice(outcomes), "runs": 1}
+            ev["ts"] = "00:00:00"; events.append(ev); fold_event(s, ev)
+        with open(storage.match_log_path(mid), "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(ev, separators=(",", ":")) + "\n" for ev in events)
+        s["_seq"] = len(events); s["_log_pos"] = os.path.getsize(storage.match_log_path(mid))
+        storage.save_snapshot(mid, s)
+        matches[mid] = {"title": f"Match {k}", "overs": overs, "storage": "eventlog", "status": "COMPLETED",
+                        "created_at": f"{mid[:4]}-{mid[4:6]}-{mid[6:8]}T10:00:00"}
+    storage.save_json(storage.MATCH_INDEX, matches)
+    return matches
+
+
+def bench_stats(quick=False):
+    # Player Stats over a few hundred matches: building the ball table from scratch,
+    # adding one completed match, and the career + season tables the page shows
+    import stats
+    n = 60 if quick else 300
+    cwd, data_dir, fsync = os.getcwd(), storage.DATA_DIR, storage.FSYNC
+    os.chdir(tempfile.mkdtemp()); os.makedirs("data"); storage.DATA_DIR = "data"; storage.FSYNC = False
+    try:
+        matches = _synthetic_matches(n + 1)
+        last = max(matches); db = storage.FileStore()
+        t0 = time.perf_counter(); stats.refresh(db, {m: v for m, v in matches.items() if m != last})
+        build = time.perf_counter() - t0
+        t0 = time.perf_counter(); stats.add_match(db, last, matches[last]); add = time.perf_counter() - t0
+        loads, groups = [], []
+        for _ in range(3 if quick else 5):
+            t0 = time.perf_counter(); balls = stats.load_ball_table(); t1 = time.perf_counter()
+            career = stats.career_table(balls); stats.season_table(balls)
+            loads.append(t1 - t0); groups.append(time.perf_counter() - t1)
+        load, group = statistics.median(loads), statistics.median(groups)
+    finally:
+        os.chdir(cwd); storage.DATA_DIR, storage.FSYNC = data_dir, fsync
+    print(f"stats: {n} matches ({len(balls)} ball rows, {len(career)} players) built in {build:.2f}s, "
+          f"+1 match {add * 1e3:.0f} ms; Player Stats page {(load + group) * 1e3:.0f} ms "
+          f"(load {load * 1e3:.0f}, career + season group-bys {group * 1e3:.0f})")
+    return {f"stats.build_{n}_ms": _ms(build), "stats.add_match_ms": _ms(add),
+            f"stats.load_{n}_ms": _ms(load), f"stats.tables_{n}_ms": _ms(group)}
+
+
+def bench_projection(quick=False):
+    # Time to a fresh projection (cache miss) at the start and middle of each innings
+    import projection
+    m = projection.ball_table(projection.model_probs(projection.PRIOR))  # prior only, no ball table needed
+    teams = {"Team A": [f"A{i}" for i in range(11)], "Team B": [f"B{i}" for i in range(11)]}
+    out = {}
+    for overs in ((20,) if quick else (20, 50)):
+        for inn, balls in ((1, 0), (1, overs * 3), (2, 0), (2, overs * 3)):
+            s = {"status": f"INNINGS{inn}", "innings": inn, "overs_limit": overs, "teams": teams,
+                 "bat_team": "Team A" if inn == 1 else "Team B", "bowl_team": "Team B" if inn == 1 else "Team A",
+                 "score": {"Team A": {"runs": balls if inn == 1 else overs * 8, "wkts": 2, "balls": balls},
+                           "Team B": {"runs": balls if inn == 2 else 0, "wkts": 2 if inn == 2 else 0,
+                                      "balls": balls if inn == 2 else 0}}}
+            runs = []
+            for i in range(5 if quick else 20):
+                t0 = time.perf_counter(); projection.project(f"bench-{overs}-{inn}-{balls}-{i}", s, m=m); runs.append(time.perf_counter() - t0)
+            key = f"projection.o{overs}_inn{inn}_{'start' if balls == 0 else 'mid'}_ms"
+            out[key] = _ms(statistics.median(runs))
+            print(f"projection {overs} overs, innings {inn} after {balls} balls: {statistics.median(runs) * 1e3:.1f} ms "
+                  f"(max {max(runs) * 1e3:.1f})")
+    return out
+
+
+def _top_imports(path):
+    # Modules a file imports at top level (what opening it costs)
+    import ast
+    with open(path, "r", encoding="utf-8") as f: tree = ast.parse(f.read())
+    mods = []
+    for node in tree.body:
+        if isinstance(node, ast.Import): mods += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module: mods.append(node.module)
+    return mods
+
+
+HEAVY = ("numpy", "pandas", "pyarrow", "openpyxl", "PIL")
+
+# Run in a fresh interpreter from a work dir with one live match: the page module's
+# import and whole first render() through Streamlit's AppTest, timed inside the script
+# run (AppTest's own start-up left out), so imports made while rendering count too.
+_RENDER = """
+import json, sys
+sys.path.insert(0, {repo!r})
+from streamlit.testing.v1 import AppTest
+
+def script(page):
+    import importlib, time, streamlit as st
+    st.session_state.is_admin = True
+    t = time.perf_counter()
+    try: importlib.import_module(page).render("Member")
+    finally:  # also when the page calls st.stop()
+        with open("render_secs", "w") as f: f.write(str(time.perf_counter() - t))
+
+at = AppTest.from_function(script, args=({page!r},), default_timeout=60)
+at.run()
+print(json.dumps({{"secs": float(open("render_secs").read()), "heavy": [m for m in {heavy!r} if m in sys.modules],
+                  "error": at.exception[0].message if at.exception else None}}))
+"""
+
+
+def _seed_live_match(work):
+    # One match under way in work/data (storage paths are relative to the cwd)
+    cwd = os.getcwd(); data_dir = storage.DATA_DIR
+    os.chdir(work); os.makedirs("data", exist_ok=True); storage.DATA_DIR = "data"
+    try:
+        meta = {"title": "Bench XI vs XI", "overs": 20, "storage": "eventlog", "created_at": "2025-01-01T00:00:00"}
+        db = storage.FileStore(); db.save_match("bench", meta)
+        storage._scorer("bench", meta, 60, None, overs=20, outcomes=FULL_OUTCOMES)
+    finally:
+        os.chdir(cwd); storage.DATA_DIR = data_dir
+
+
+def bench_startup(quick=False):
+    # Cold first render of each page in a fresh interpreter: imports (top level and
+    # render time) plus the render itself, with Streamlit already imported (every page
+    # pays for it). Needs Streamlit; without it only top-level imports are timed.
+    pages = sorted(f[:-3] for f in os.listdir(".") if f.startswith("page_") and f.endswith(".py"))
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError:
+        print("streamlit not installed: timing top-level imports only (render-time imports not counted)")
+        return _bench_imports(pages, quick)
+    repo = os.path.dirname(os.path.abspath(__file__)); work = tempfile.mkdtemp()
+    _seed_live_match(work)
+
+    def render(page):
+        script = os.path.join(work, f"render_{page}.py")  # AppTest needs the function's source file
+        with open(script, "w", encoding="utf-8") as f: f.write(_RENDER.format(repo=repo, page=page, heavy=HEAVY))
+        runs = [json.loads(subprocess.run([sys.executable, script], capture_output=True, text=True, check=True,
+                                          cwd=work).stdout.strip().splitlines()[-1])
+                for _ in range(1 if quick else 3)]
+        return min(runs, key=lambda r: r["secs"])
+
+    out = {}
+    for page in pages:
+        r = render(page)
+        out[f"startup.{page}_render_ms"] = _ms(r["secs"])
+        print(f"{page:18}: {r['secs'] * 1e3:6.0f} ms first render, loads {', '.join(r['heavy']) or 'no heavy libs'}"
+              + (f"  [page error: {r['error']}]" if r["error"] else ""))
+    return out
+
+
+def _bench_imports(pages, quick):
+    shared = [m for m in _top_imports("ui.py") if m != "streamlit"]
+    out = {}
+    for page in pages:
+        mods = list(dict.fromkeys(shared + [m for m in _top_imports(page + ".py") if m not in ("streamlit", "ui")]))
+        code = f"import time; t = time.perf_counter(); {'; '.join(f'import {m}' for m in mods)}; " \
+               "print(time.perf_counter() - t)"
+        runs = [float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+                for _ in range(1 if quick else 3)]
+        out[f"startup.{page}_ms"] = _ms(min(runs))
+        print(f"{page:18}: {min(runs) * 1e3:6.0f} ms cold imports ({', '.join(mods)})")
+    return out
+
+
+CASES = {"match": bench_match, "edit": bench_edit, "paid": bench_paid, "registry": bench_registry, "cards": bench_cards,
+         "stats": bench_stats, "projection": bench_projection, "startup": bench_startup}
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def last_run(quick=False):
+    # Latest stored run of the same size (quick runs only compare with quick runs)
+    if not os.path.exists(RESULTS): return None
+    with open(RESULTS, "r", encoding="utf-8") as f:
+        runs = [r for r in map(json.loads, filter(str.strip, f)) if r.get("quick", False) == quick]
+    return runs[-1] if runs else None
+
+
+def compare(prev, cur, threshold=0.2):
+    # Metrics more than `threshold` slower than the previous run; returns their names
+    slower = []
+    for k, v in cur.items():
+        old = prev.get(k)
+        if old and v > old * (1 + threshold):
+            slower.append(k); print(f"SLOWER  {k}: {old} -> {v} ms (+{(v / old - 1) * 100:.0f}%)")
+    if not slower: print("no regressions vs previous run")
+    return slower
+
+
+def run(names=None, quick=False, check=False, threshold=0.2, save=True):
+    results = {}
+    for name in names or CASES: results.update(CASES[name](quick))
+    prev = last_run(quick)
+    slower = compare(prev["results"], results, threshold) if check and prev else []
+    if save:
+        entry = {"commit": _commit(), "time": datetime.now().isoformat(timespec="seconds"), "quick": quick,
+                 "python": sys.version.split()[0], "results": results}
+        with open(RESULTS, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    return not slower
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="MPGB benchmark suite")
+    ap.add_argument("cases", nargs="*", help=f"cases to run: {', '.join(CASES)} (default: all)")
+    ap.add_argument("--quick", action="store_true", help="smaller sizes, T20 only")
+    ap.add_argument("--compare", action="store_true", help="flag slowdowns vs the last stored run")
+    ap.add_argument("--threshold", type=float, default=0.2)
+    ap.add_argument("--no-save", action="store_true")
+    a = ap.parse_args()
+    if set(a.cases) - set(CASES): ap.error(f"unknown case(s): {', '.join(sorted(set(a.cases) - set(CASES)))}")
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    sys.exit(0 if run(a.cases, a.quick, a.compare, a.threshold, not a.no_save) else 1)
@@ -0,0 +1,150 @@
+# cards.py — membership ID card rendering for MPGB Cricket Club
+# The static part of the card (header bar, title, logo, footer) is drawn once per
+# process and cached; a card is a copy of it plus the member's stored photo
+# (photos.py) and text. Bulk mode renders every registered member in a thread or
+# process pool into a ZIP of PNGs or one multi-page PDF. PDF pages are JPEG-encoded
+# by the workers and streamed into the file as they arrive (_write_pdf), so no
+# full-size page bitmap (~0.9 MB) outlives its worker call.
+#
+# Benchmark:  python cards.py --bench 500 [--threads] [--pdf]
+
+import io, os, sys, time, zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from PIL import Image, ImageDraw
+import photos
+
+LOGO_PATH = "RRB_LOGO_new.png"
+W, H = 700, 430
+PHOTO_SIZE = (240, 240)
+PHOTO_POS = (24, 120)
+
+
+@lru_cache(maxsize=1)
+def _background(logo_sig):
+    card = Image.new("RGB", (W, H), "white")
+    draw = ImageDraw.Draw(card)
+    draw.rectangle([0, 0, W, 86], fill=(11, 132, 87))  # header bar
+    draw.text((24, 24), "MPGB CRICKET CLUB - SAGAR", fill=(234, 248, 240))
+    if logo_sig:
+        logo = Image.open(LOGO_PATH).convert("RGB").resize((70, 84))
+        card.paste(logo, (W - 70 - 18, 2))
+    draw.text((24, 380), "Valid for: MPGB Cricket Club events", fill=(71, 85, 105))
+    return card
+
+
+def background():
+    # Rebuilt only when the logo file changes
+    try:
+        fs = os.stat(LOGO_PATH); sig = (fs.st_mtime_ns, fs.st_size)
+    except OSError:
+        sig = None
+    return _background(sig)
+
+
+def render_card(member, photo=None):
+    # member: a registry row (Reg_No, Name, Mobile, Branch, Role, optional Photo key);
+    # photo: PIL image, else the stored photo for member["Photo"]
+    card = background().copy()
+    draw = ImageDraw.Draw(card)
+    if photo is None and member.get("Photo"): photo = photos.load_photo(member["Photo"])
+    if photo is not None:
+        card.paste(photo.convert("RGB").resize(PHOTO_SIZE), PHOTO_POS)
+    else:
+        x, y = PHOTO_POS
+        draw.rectangle([x, y, x + PHOTO_SIZE[0], y + PHOTO_SIZE[1]], fill=(226, 232, 240))
+        draw.text((x + 96, y + 112), "No photo", fill=(100, 116, 139))
+    mobile = str(member.get("Mobile", ""))
+    x0, y0 = 290, 120
+    draw.text((x0, y0),       f"Name: {member.get('Name', '')}", fill=(15, 23, 42))
+    draw.text((x0, y0 + 26),  f"Mobile: {'—' if mobile in ('', '*admin*') else mobile}", fill=(30, 41, 59))
+    draw.text((x0, y0 + 52),  f"Branch: {member.get('Branch', '')}", fill=(30, 41, 59))
+    draw.text((x0, y0 + 78),  f"Role: {member.get('Role', '')}", fill=(30, 41, 59))
+    draw.text((x0, y0 + 104), f"Reg. No: {member.get('Reg_No', '')}", fill=(200, 30, 30))
+    return card
+
+
+def card_png(member, photo=None):
+    buf = io.BytesIO()
+    render_card(member, photo).save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+def _render_jpeg(member):
+    # Pool worker for PDFs: the page as it goes into the PDF (DCTDecode, as Pillow's
+    # own PDF writer stores RGB images)
+    buf = io.BytesIO()
+    render_card(member).save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+def _write_pdf(f, jpegs, size=(W, H), dpi=150):
+    # Minimal PDF, one image page per JPEG, written as they arrive; the page tree and
+    # xref table go at the end. Objects 1 and 2 (catalog, page tree) are written last.
+    offsets = {}
+    def put(n, body):
+        offsets[n] = f.tell(); f.write(b"%d 0 obj\n" % n + body + b"\nendobj\n")
+    f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    w, h = size[0] * 72 / dpi, size[1] * 72 / dpi
+    draw = b"q %.2f 0 0 %.2f 0 0 cm /Im Do Q" % (w, h)
+    n, kids = 2, []
+    for jpg in jpegs:
+        put(n + 1, b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+                   b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n" % (size[0], size[1], len(jpg))
+                   + jpg + b"\nendstream")
+        put(n + 2, b"<< /Length %d >>\nstream\n%s\nendstream" % (len(draw), draw))
+        put(n + 3, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources << /XObject << /Im %d 0 R >> >> "
+                   b"/Contents %d 0 R >>" % (w, h, n + 1, n + 2))
+        kids.append(n + 3); n += 3
+    put(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids)))
+    put(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    xref = f.tell()
+    f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (n + 1))
+    f.write(b"".join(b"%010d 00000 n \n" % offsets[i] for i in range(1, n + 1)))
+    f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (n + 1, xref))
+
+
+def render_bulk(members, fmt="zip", workers=4, processes=False):
+    # All cards as one ZIP of PNGs or one multi-page PDF; returns the file bytes.
+    # Threads by default (safe inside Streamlit); the CLI benchmark also tries processes.
+    members = list(members)
+    if not members: return b""
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    chunk = max(1, len(members) // (workers * 4))
+    buf = io.BytesIO()
+    with pool(max_workers=workers) as ex:
+        if fmt == "pdf":
+            _write_pdf(buf, ex.map(_render_jpeg, members, chunksize=chunk))
+        else:
+            with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:  # PNGs are already compressed
+                for m, png in zip(members, ex.map(card_png, members, chunksize=chunk)):
+                    zf.writestr(f"{m.get('Reg_No') or m.get('Name')}.png", png)
+    return buf.getvalue()
+
+
+# -------------------- Benchmark --------------------
+def bench(n=500, workers=4, processes=True, fmt="zip"):
+    members = [{"Reg_No": f"MPGBCC-2025-{i:04d}", "Name": f"Player {i}", "Mobile": f"9{i:09d}",
+                "Branch": f"BR{i % 40:03d}", "Role": "Batsman"} for i in range(n)]
+    t0 = time.perf_counter()
+    for m in members[:50]: card_png(m)
+    serial = (time.perf_counter() - t0) / 50
+    t0 = time.perf_counter()
+    out = render_bulk(members, fmt, workers, processes)
+    dt = time.perf_counter() - t0
+    print(f"serial: {serial * 1000:.1f} ms/card ({1 / serial:.0f} cards/s)")
+    print(f"{n} cards -> {fmt}, {workers} {'processes' if processes else 'threads'}: {dt:.2f}s "
+          f"({n / dt:.0f} cards/s), {len(out) / 1e6:.1f} MB")
+    return n / dt
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="ID card rendering benchmark")
+    ap.add_argument("--bench", type=int, default=500, metavar="N")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    ap.add_argument("--threads", action="store_true", help="use threads instead of processes")
+    ap.add_argument("--pdf", action="store_true", help="one multi-page PDF instead of a ZIP")
+    a = ap.parse_args()
+    bench(a.bench, a.workers, not a.threads, "pdf" if a.pdf else "zip")
+    sys.exit(0)
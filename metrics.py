@@ -0,0 +1,104 @@
+# metrics.py — in-process timing spans and counters for MPGB Cricket Club
+# Off unless MPGB_METRICS=1 or enable() is called (the Admin "Performance" tab has a
+# switch). While off, span() hands back one shared no-op context manager and timed()
+# functions cost a single flag check, so the instrumented hot paths stay as they were.
+# Numbers are process-wide (every Streamlit session feeds the same tables) and keep
+# the last SAMPLES durations per span for p50/p95.
+
+import json, os, threading, time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+SAMPLES = 2048
+_on = os.environ.get("MPGB_METRICS", "0") == "1"
+_lock = threading.Lock()
+_spans = {}     # name -> [count, total secs, deque of recent durations]
+_counters = {}  # name -> int
+_NOOP = nullcontext()
+
+
+def enabled(): return _on
+
+
+def enable(flag=True):
+    global _on
+    _on = bool(flag)
+
+
+def reset():
+    with _lock:
+        _spans.clear(); _counters.clear()
+
+
+def observe(name, secs):
+    with _lock:
+        rec = _spans.get(name)
+        if rec is None: rec = _spans[name] = [0, 0.0, deque(maxlen=SAMPLES)]
+        rec[0] += 1; rec[1] += secs; rec[2].append(secs)
+
+
+def incr(name, n=1):
+    if not _on: return
+    with _lock: _counters[name] = _counters.get(name, 0) + n
+
+
+@contextmanager
+def _span(name):
+    t0 = time.perf_counter()
+    try: yield
+    finally: observe(name, time.perf_counter() - t0)
+
+
+def span(name): return _span(name) if _on else _NOOP
+
+
+def timed(name):
+    # Decorator form of span()
+    def wrap(fn):
+        @wraps(fn)
+        def inner(*a, **k):
+            if not _on: return fn(*a, **k)
+            t0 = time.perf_counter()
+            try: return fn(*a, **k)
+            finally: observe(name, time.perf_counter() - t0)
+        return inner
+    return wrap
+
+
+def _pct(sorted_vals, q): return sorted_vals[min(int(q * len(sorted_vals)), len(sorted_vals) - 1)]
+
+
+def snapshot():
+    # {"spans": {name: {count, total_ms, mean_ms, p50_ms, p95_ms, max_ms}}, "counters": {...}}
+    with _lock:
+        spans = {k: (c, t, sorted(d)) for k, (c, t, d) in _spans.items()}
+        counters = dict(_counters)
+    out = {}
+    for k, (c, t, v) in sorted(spans.items()):
+        out[k] = {"count": c, "total_ms": round(t * 1e3, 3), "mean_ms": round(t * 1e3 / c, 3),
+                  "p50_ms": round(_pct(v, .5) * 1e3, 3), "p95_ms": round(_pct(v, .95) * 1e3, 3),
+                  "max_ms": round(v[-1] * 1e3, 3)}
+    return {"enabled": _on, "spans": out, "counters": dict(sorted(counters.items()))}
+
+
+def to_json(): return json.dumps(snapshot(), indent=2)
+
+
+def to_prometheus():
+    # Text exposition format: one summary per span, one counter per counter
+    snap = snapshot(); lines = []
+    if snap["spans"]:
+        lines += ["# HELP mpgb_span_seconds Time spent in instrumented code paths.",
+                  "# TYPE mpgb_span_seconds summary"]
+    for k, v in snap["spans"].items():
+        for q, key in (("0.5", "p50_ms"), ("0.95", "p95_ms")):
+            lines.append(f'mpgb_span_seconds{{span="{k}",quantile="{q}"}} {v[key] / 1e3:.6f}')
+        lines.append(f'mpgb_span_seconds_sum{{span="{k}"}} {v["total_ms"] / 1e3:.6f}')
+        lines.append(f'mpgb_span_seconds_count{{span="{k}"}} {v["count"]}')
+    if snap["counters"]:
+        lines += ["# HELP mpgb_requests_total Counted events (page views, submits).",
+                  "# TYPE mpgb_requests_total counter"]
+    for k, v in snap["counters"].items():
+        lines.append(f'mpgb_requests_total{{name="{k}"}} {v}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,128 @@
+# page_admin.py — "Admin (Hidden)": paid list, matches, ID cards, bulk import, performance
+
+import pandas as pd
+import streamlit as st
+import cards, metrics, photos, stats, storage
+from registry import norm_mobiles, validate_import
+from scoring import ensure_state_defaults, check_snapshot
+from ui import (_paid_members, _player_tables, db, match_picker, norm_mobile, read_paid_members, read_registered,
+                record_event, seen_seq, shared_states, write_paid_members)
+
+
+def render(role):
+    if not st.session_state.is_admin:
+        st.stop()
+    st.subheader("Admin Tools — Private")
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Paid Members List", "Matches & States", "ID Cards", "Bulk Import",
+                                            "Performance"])
+
+    with tab1:
+        st.markdown("Manage the paid members list here. Visible only to admin.")
+        paid = read_paid_members()
+        st.dataframe(paid, use_container_width=True)
+        st.markdown("#### Add / Remove Members")
+        with st.form("add_paid"):
+            new_mobile = st.text_input("Mobile number to add")
+            remove_mobile = st.text_input("Mobile number to remove")
+            sbtn = st.form_submit_button("Apply Changes")
+        if sbtn:
+            df = read_paid_members()
+            if new_mobile.strip():
+                df = pd.concat([df, pd.DataFrame({"Mobile_No":[str(new_mobile).strip()]})], ignore_index=True)
+                df.drop_duplicates(subset=["Mobile_No"], keep="last", inplace=True)
+            if remove_mobile.strip():
+                df = df[df["Mobile_No"].map(norm_mobile) != norm_mobile(remove_mobile)]
+            write_paid_members(df)
+            st.success("Paid list updated (CSV). If an Excel exists, CSV is still used for verification.")
+
+    with tab2:
+        if st.button("Archive completed matches & rebuild player stats"):
+            n = stats.refresh(db, db.load_matches()); _player_tables.clear()
+            st.success(f"{n} match(es) added to the stats archive.")
+        sel_mid, sel_meta = match_picker("admin")
+        if sel_mid:
+            s = db.load_state(sel_mid, sel_meta)
+            ensure_state_defaults(s, sel_meta)
+            st.write("Status:", s.get("status"))
+            cs = shared_states.stats()
+            st.caption(f"Shared state cache: {cs['hits']} hits / {cs['misses']} misses "
+                       f"(hit rate {cs['hit_rate']:.0%}), {cs['entries']} matches cached")
+            if storage.WRITE_BEHIND:
+                w = storage.snapshot_writer()
+                st.caption(f"Write-behind snapshots: {w.written} written, {w.coalesced} coalesced, {w.pending()} pending")
+            if sel_meta.get("storage") == "eventlog":
+                if st.button("Verify snapshot vs replay"):
+                    snap = db.load_snapshot(sel_mid)
+                    if check_snapshot(snap, db.read_events(sel_mid)):
+                        st.success(f"Snapshot matches a replay of its first {snap.get('_seq', 0)} events.")
+                    else:
+                        st.error("Snapshot differs from the replayed event log.")
+            drawn = seen_seq("admin", sel_mid, s)  # a click applies only to the state it was shown
+            colA, colB = st.columns(2)
+            for col, label, t, done in ((colA, "Force End Over", "end_over", "Over forced ended."),
+                                        (colB, "End Innings / Complete Match", "end_innings", "Innings/Match advanced.")):
+                with col:
+                    if st.button(label):
+                        try: record_event(sel_mid, sel_meta, s, {"t": t}, expect=drawn); st.success(done)
+                        except storage.StaleState: st.warning("⚠️ The match changed since this page was drawn; "
+                                                              "nothing was done. Check the status and try again.")
+            if s.get("status") == "COMPLETED" and st.button("Export match to archive"):
+                stats.add_match(db, sel_mid, sel_meta); _player_tables.clear()
+                st.success("Match exported (balls, players, scores).")
+            if st.button("Delete Match (danger)"):
+                db.delete_match(sel_mid)
+                st.success("Match deleted.")
+
+    with tab3:
+        members = read_registered()
+        st.write(f"{len(members)} registered member(s).")
+        fmt = st.radio("Format", ["ZIP of PNGs", "Multi-page PDF"], horizontal=True)
+        if len(members) and st.button("Generate all ID cards"):
+            pdf = fmt.endswith("PDF")
+            with st.spinner("Rendering cards..."):
+                members["Photo"] = members["Reg_No"].map(photos.member_photos()).fillna("")
+                data = cards.render_bulk(members.to_dict("records"), "pdf" if pdf else "zip")
+            st.download_button("⬇️ Download ID cards", data, file_name="MPGB_ID_Cards." + ("pdf" if pdf else "zip"),
+                               mime="application/pdf" if pdf else "application/zip")
+
+    with tab4:
+        st.markdown("Register a whole branch list at once. Columns: `Name`, `Mobile`, `Branch`, `Role` "
+                    "(Role optional). Only paid, not-yet-registered mobiles are accepted.")
+        up = st.file_uploader("Excel or CSV file", type=["xlsx", "xls", "csv"], key="bulk_import")
+        if up is not None:
+            try:
+                sheet = pd.read_csv(up, dtype=str) if up.name.lower().endswith(".csv") else pd.read_excel(up, dtype=str)
+            except Exception as e:
+                st.error(f"Could not read file: {e}"); st.stop()
+            registered = set(norm_mobiles(read_registered()["Mobile"]))
+            ok, bad = validate_import(sheet, _paid_members()[1], registered)
+            st.write(f"{len(ok)} row(s) ready, {len(bad)} rejected.")
+            if len(bad):
+                st.dataframe(bad, use_container_width=True, hide_index=True)
+                st.download_button("⬇️ Rejected rows (CSV)", bad.to_csv(index=False).encode("utf-8"),
+                                   file_name="import_rejected.csv", mime="text/csv")
+            if len(ok) and st.button(f"Register {len(ok)} member(s)"):
+                reg_nos = db.register_many(ok.itertuples(index=False, name=None))
+                st.success(f"Registered {len(reg_nos)} member(s): {reg_nos[0]} … {reg_nos[-1]}")
+
+    with tab5:
+        on = st.toggle("Collect timings", value=metrics.enabled(),
+                       help="Process-wide; near-zero cost while off. Also MPGB_METRICS=1.")
+        if on != metrics.enabled(): metrics.enable(on)
+        snap = metrics.snapshot()
+        add = snap["spans"].get("add_ball")
+        if add:
+            st.metric("Add Ball submit → saved (p50 / p95)", f"{add['p50_ms']:.1f} / {add['p95_ms']:.1f} ms",
+                      help=f"{add['count']} balls")
+        if snap["spans"]:
+            st.dataframe(pd.DataFrame.from_dict(snap["spans"], orient="index").rename_axis("span"),
+                         use_container_width=True)
+        else:
+            st.info("No timings yet. Turn collection on and use the scorer page.")
+        if snap["counters"]:
+            st.dataframe(pd.Series(snap["counters"], name="count").rename_axis("counter"), use_container_width=True)
+        c1, c2, c3 = st.columns(3)
+        c1.download_button("⬇️ JSON", metrics.to_json(), file_name="mpgb_metrics.json", mime="application/json")
+        c2.download_button("⬇️ Prometheus", metrics.to_prometheus(), file_name="mpgb_metrics.prom", mime="text/plain")
+        if c3.button("Reset"): metrics.reset(); st.rerun()
@@ -0,0 +1,83 @@
+# page_public.py — "Live Score (Public View)": read-only live score for spectators.
+# Keep this page light: the projection (numpy, pandas, pyarrow) and the over charts
+# (pandas) are opt-in toggles, so the default first render imports none of them.
+
+import streamlit as st
+import storage
+from scoring import overs_str, rr, latest_commentary
+from ui import LIVE_FRAGMENT, LIVE_REFRESH_SECS, db, match_picker, projection_strip, shared_states
+
+HIGHLIGHTS = 30   # newest commentary lines in the live panel
+OLDER_PAGE = 50   # lines per page of "Older commentary"
+
+
+def render(role):
+    st.subheader("Live Score & Highlights (Read-Only)")
+    mid, meta = match_picker("public")
+    if not mid: st.stop()
+    live = LIVE_FRAGMENT is not None and st.toggle("Live updates", value=True,
+                                                   help=f"Checks for a new ball every {LIVE_REFRESH_SECS}s")
+    o1, o2 = st.columns(2)
+    show_projection = o1.toggle("Projection & win probability", key="public_projection")
+    show_charts = o2.toggle("Over-by-over charts", key="public_charts")
+
+    def live_panel():
+        # Shared across all viewers; reloaded only when the match version changes
+        # (i.e. when a new ball lands). Read-only — never mutate `state` here.
+        state = shared_states.get(mid, meta)
+        if not state: st.warning("State not found for this match yet."); return
+
+        bat = state["bat_team"]; sc = state["score"][bat]
+
+        c1, c2 = st.columns([2,1])
+        with c1:
+            st.markdown(f"### **{meta['title']}**")
+            st.write(f"**Venue:** {meta.get('venue','')} • **Overs:** {state['overs_limit']}")
+            st.markdown(
+                f"<div class='score-strip'><b>{bat}</b> {sc['runs']}/{sc['wkts']} — Overs {overs_str(sc['balls'])} • RR {rr(sc['runs'], sc['balls'])}</div>",
+                unsafe_allow_html=True)
+            if show_projection: projection_strip(mid, state, meta.get("team_names"))
+        with c2:
+            st.markdown("### Current")
+            st.write(f"**Striker:** {state['batting'].get('striker','')}")
+            st.write(f"**Non-Striker:** {state['batting'].get('non_striker','')}")
+            st.write(f"**Bowler:** {state['bowling'].get('current_bowler','')}")
+
+        st.markdown("### Recent Balls")
+        chips_html = "".join([f"<span class='ball-chip {b['tag']}'>{b['txt']}</span>" for b in state.get("balls_log", [])[-30:][::-1]])
+        st.markdown(f"<div class='ball-feed'>{chips_html}</div>", unsafe_allow_html=True)
+
+        if state.get("overs_index") and show_charts:
+            overs_index = {team: storage.history(db, mid, state, f"overs-{team}") for team in state["overs_index"]}
+            import pandas as pd
+            st.markdown("### Over by Over")
+            series = lambda key: pd.DataFrame({team: pd.Series([key(o) for o in ovs], index=[o["over"] for o in ovs])
+                                               for team, ovs in overs_index.items()})
+            t1, t2, t3 = st.tabs(["Manhattan", "Worm", "Run Rate"])
+            with t1: st.bar_chart(series(lambda o: o["runs"]))
+            with t2: st.line_chart(series(lambda o: o["total"]))
+            with t3: st.line_chart(series(lambda o: rr(o["total"], (o["over"] - 1) * 6 + o["balls"])))
+
+        st.markdown("### Highlights")
+        st.write("\n".join(latest_commentary(state, HIGHLIGHTS)))
+
+    def older_commentary():
+        # Lines before the Highlights, from the archived commentary pages, newest first.
+        # Outside the live panel, so pages are read on a viewer's click, not every tick.
+        state = shared_states.get(mid, meta)
+        older = (state.get("commentary_paged", 0) + len(state.get("commentary", []))) - HIGHLIGHTS if state else 0
+        if older <= 0: return
+        with st.expander(f"Older commentary ({older} lines)"):
+            pages = (older - 1) // OLDER_PAGE + 1
+            if st.session_state.get("public_older", 1) > pages: st.session_state["public_older"] = pages  # after an undo
+            p = st.number_input(f"Page (of {pages}, 1 = most recent)", 1, pages, key="public_older") if pages > 1 else 1
+            end = older - (p - 1) * OLDER_PAGE; start = max(end - OLDER_PAGE, 0)
+            st.write("\n".join(storage.history(db, mid, state, "commentary", start)[:end - start][::-1]))
+
+    if live:
+        LIVE_FRAGMENT(run_every=LIVE_REFRESH_SECS)(live_panel)()
+        st.caption("Live: score updates automatically when a new ball is recorded.")
+    else:
+        live_panel()
+        st.caption("Tip: Pull to refresh (mobile) or use browser refresh for latest ball.")
+    older_commentary()
@@ -0,0 +1,59 @@
+# page_registration.py — "Registration & ID Card": paid-mobile check, member form, ID card
+
+import streamlit as st
+import cards, photos
+from ui import db, is_paid_mobile, norm_mobile
+
+
+def render(role):
+    st.subheader("Membership Registration (Mobile verification)")
+    if role == "Guest":
+        st.info("👀 Guest mode: Sirf dekh sakte ho, registration nahi kar sakte.")
+        st.stop()
+
+    if "verified_mobile" not in st.session_state:
+        st.session_state.verified_mobile = ""
+
+    # Step 1: Verify (unless admin toggles bypass)
+    bypass = st.checkbox("Admin bypass (skip paid verification)", value=False) if st.session_state.is_admin else False
+
+    if not st.session_state.verified_mobile and not bypass:
+        mobile = st.text_input("📱 Enter Mobile Number")
+        if st.button("Verify"):
+            if is_paid_mobile(mobile):
+                st.session_state.verified_mobile = norm_mobile(mobile)
+                st.success("✅ Membership Verified! Please complete your registration.")
+            else:
+                st.error("❌ Number not found in Members_Paid list.")
+        st.stop()  # until verified we stop page here
+
+    # Step 2: Form (stable while typing)
+    verified_note = st.session_state.verified_mobile if not bypass else "(Admin bypass)"
+    st.info(f"✅ Verified Mobile: {verified_note}")
+    with st.form("reg_form"):
+        name   = st.text_input("📝 Full Name")
+        branch = st.text_input("🏦 Branch Code")
+        role_play = st.selectbox("🎯 Playing Role", ["Batsman","Bowler","All-Rounder","Wicketkeeper"])
+        photo  = st.file_uploader("📸 Upload Your Photo", type=["jpg","jpeg","png"])
+        submitted = st.form_submit_button("Generate ID")
+
+    if submitted:
+        if not name or not branch or not photo:
+            st.error("⚠️ Please fill all fields and upload photo.")
+        else:
+            try:
+                photo_key = photos.save_photo(photo)  # small thumbnail, kept for card reprints
+            except (OSError, ValueError):
+                st.error("⚠️ Could not read the photo. Please upload a JPG or PNG image."); st.stop()
+            reg_no = db.register_member(name, st.session_state.verified_mobile if not bypass else "*admin*",
+                                        branch, role_play)
+            photos.set_member_photo(reg_no, photo_key)
+
+            # Professional ID Card (simple, clean) — cached background + member details
+            member = {"Reg_No": reg_no, "Name": name, "Branch": branch, "Role": role_play, "Photo": photo_key,
+                      "Mobile": st.session_state.verified_mobile if not bypass else ""}
+            png = cards.card_png(member)
+            st.image(png, caption="Your Membership ID Card")
+            st.download_button("⬇️ Download ID Card", png, file_name=f"{name}_ID.png", mime="image/png")
+
+    st.caption("Paid list file: `Members_Paid.xlsx` or `Members_Paid.csv` with single column `Mobile_No`.")
@@ -0,0 +1,231 @@
+# page_scorer.py — "Live Scoring (Scorer)": ball-by-ball entry (Member + PIN)
+
+import time, uuid
+import streamlit as st
+import metrics, storage
+from scoring import ball_list, overs_str, rr, ensure_state_defaults, latest_commentary, undo_edits
+from ui import db, match_picker, projection_strip, record_event, seen_seq
+
+
+OUTCOMES = ["0","1","2","3","4","6","Wicket","Wide","No-Ball","Leg Bye","Bye"]
+RUN_OUTCOMES = ("Wide", "No-Ball", "Leg Bye", "Bye")  # outcomes that carry extra runs
+
+
+def ball_text(b):
+    seq, innings, label, ev = b
+    runs = f" +{ev.get('runs', 0)}" if ev["outcome"] in RUN_OUTCOMES else ""
+    return f"Inn {innings} • {label} — {ev['outcome']}{runs} {ev.get('info', '')}".rstrip()
+
+
+def correct(mid, meta, state, expect, edits, note):
+    # Undo / edit through an "amend" event; re-folds from the nearest checkpoint.
+    # `expect` is the _seq the corrections panel was drawn from.
+    try:
+        if expect != state.get("_seq", 0): raise storage.StaleState(state.get("_seq", 0))
+        record_event(mid, meta, state, {"t": "amend", "edits": edits, "note": note}, expect=expect)
+    except storage.StaleState:
+        st.session_state.ball_flash = ("warning", "⚠️ The match changed while you were correcting it; "
+                                       "nothing was changed. Check the latest balls and try again.")
+    except ValueError as e:
+        st.session_state.ball_flash = ("error", f"⚠️ Correction not possible: {e}.")
+    else:
+        st.session_state.ball_flash = ("success", note)
+    st.rerun()
+
+
+def render(role):
+    st.subheader("Ball-by-Ball Scoring (Cricbuzz style)")
+    if role == "Guest":
+        st.info("👀 Guest mode: Scoring allowed nahi hai.")
+        st.stop()
+
+    # Require Admin/Scorer PIN
+    if not st.session_state.is_admin:
+        st.warning("Valid Admin/Scorer PIN required (see sidebar).")
+        st.stop()
+
+    mid, meta = match_picker("scorer")
+    if not mid: st.stop()
+
+    with metrics.span("load_state"): state = db.load_state(mid, meta)
+    if not state: st.error("Match state missing. Recreate the match."); st.stop()
+    ensure_state_defaults(state, meta)
+
+    bat = state["bat_team"]; bowl = state["bowl_team"]; sc = state["score"][bat]
+
+    # OVER LIMIT GUARD — block if innings complete
+    if state["status"] == "COMPLETED":
+        st.success("🏁 Match completed. Use Public View for final scorecard.")
+    # Control events carry the _seq they were decided on as `expect`, so two scorers
+    # open on the last ball close innings 1 once, not innings 1 and then the match.
+    if sc["balls"] >= state["overs_limit"]*6 and state["status"] != "COMPLETED":
+        try:
+            record_event(mid, meta, state, {"t": "end_innings"}, expect=state.get("_seq", 0))
+        except storage.StaleState:
+            st.rerun()  # someone else moved the match on: redraw from the latest state
+        sc = state["score"][state["bat_team"]]  # update after switch
+
+    # Top strip
+    st.markdown(
+        f"<div class='score-strip'>Innings {state['innings']}/2 • Overs {overs_str(sc['balls'])}/{state['overs_limit']} • RR {rr(sc['runs'], sc['balls'])}</div>",
+        unsafe_allow_html=True
+    )
+    if st.toggle("Projection", key="scorer_projection"): projection_strip(mid, state, meta.get("team_names"))
+
+    c1,c2,c3 = st.columns([2,1,1])
+    with c1:
+        st.markdown("### ")
+        st.markdown(
+            f"<div class='score-card'><div class='metric-inline'>"
+            f"<div class='pill'><b>{bat}</b> {sc['runs']}/{sc['wkts']}</div>"
+            f"<div class='pill'>Bowling: <b>{state['bowling'].get('current_bowler','') or '—'}</b></div>"
+            f"<div class='pill'>Status: <b>{state['status']}</b></div>"
+            f"</div></div>", unsafe_allow_html=True)
+    with c2:
+        st.metric("Overs", overs_str(sc["balls"]))
+    with c3:
+        st.metric("Run Rate", rr(sc["runs"], sc["balls"]))
+
+    # Select players for this over
+    st.markdown("#### Select Batsmen & Bowler")
+    bat_players = state["teams"][bat]; bowl_players = state["teams"][bowl]
+
+    # Force NEW bowler after over completion
+    last_b = state["bowling"].get("last_over_bowler", "")
+    must_pick_new = (not state.get("over_in_progress", False))
+    bowler_list = [p for p in bowl_players if (not must_pick_new) or (p != last_b)]
+    bowler_label = "Bowler (new over: pick different from last over)" if must_pick_new and last_b else "Bowler"
+
+    players_seen = seen_seq("players", mid, state)
+    with st.form("set_players"):
+        striker = st.selectbox("Striker", [""]+bat_players,
+                               index=( [""]+bat_players ).index(state["batting"].get("striker", ""))
+                                     if state["batting"].get("striker", "") in ([""]+bat_players) else 0)
+        non_striker = st.selectbox("Non-Striker", [""]+bat_players,
+                                   index=( [""]+bat_players ).index(state["batting"].get("non_striker", ""))
+                                         if state["batting"].get("non_striker", "") in ([""]+bat_players) else 0)
+        bowler = st.selectbox(bowler_label, [""]+bowler_list,
+                              index=( [""]+bowler_list ).index(state["bowling"].get("current_bowler", ""))
+                                    if state["bowling"].get("current_bowler", "") in ([""]+bowler_list) else 0)
+        set_btn = st.form_submit_button("Set/Update")
+
+    if set_btn:
+        if not striker or not non_striker or not bowler or striker==non_striker:
+            st.error("Select valid striker, non-striker, bowler.")
+        else:
+            # Enforce different bowler at start of new over
+            if must_pick_new and last_b and bowler == last_b:
+                st.error("New over must start with a DIFFERENT bowler.")
+            else:
+                try:
+                    record_event(mid, meta, state, {"t": "players", "striker": striker, "non_striker": non_striker,
+                                                    "bowler": bowler}, expect=players_seen)
+                except storage.StaleState:
+                    st.warning("⚠️ The match changed since this form was drawn; players were NOT updated. "
+                               "Check the latest state and set them again.")
+                else:
+                    st.success("Updated.")
+
+    if must_pick_new and last_b and not state["bowling"].get("current_bowler"):
+        st.warning(f"🟢 New over: choose a bowler (not {last_b}).")
+
+    # ---------------- Ball input ----------------
+    st.markdown("#### Record a Ball")
+
+    disabled_scoring = state["status"] == "COMPLETED"
+
+    # One id per rendered ball form: a double-click or retried submit carries the same
+    # id and is recorded once. ball_seen is the state version this form was drawn from.
+    if "ball_id" not in st.session_state: st.session_state.ball_id = uuid.uuid4().hex
+    ball_id = st.session_state.ball_id
+    seen = st.session_state.get("ball_seen")
+    flash = st.session_state.pop("ball_flash", None)
+    if flash: getattr(st, flash[0])(flash[1])
+    with st.form(f"ball_{ball_id}", clear_on_submit=True):
+        outcome = st.radio("Outcome", OUTCOMES, horizontal=True, disabled=disabled_scoring)
+        runs_off_bat_nb = st.number_input("Runs off bat on No-Ball (0–6)", 0, 6, 0, disabled=(outcome!="No-Ball" or disabled_scoring))
+        wide_runs = st.number_input("Extra runs on Wide (besides +1)", 0, 6, 0, disabled=(outcome!="Wide" or disabled_scoring))
+        lb_runs = st.number_input("Leg Bye runs (0–6)", 0, 6, 1, disabled=(outcome!="Leg Bye" or disabled_scoring))
+        bye_runs = st.number_input("Bye runs (0–6)", 0, 6, 1, disabled=(outcome!="Bye" or disabled_scoring))
+        wicket_info = st.text_input("Dismissal (e.g., Bowled, Caught by X)", disabled=(outcome!="Wicket" or disabled_scoring))
+        submit = st.form_submit_button("Add Ball", disabled=disabled_scoring)
+    st.session_state.ball_seen = (mid, ball_id, state.get("_seq", 0))
+
+    if submit:
+        t_submit = time.perf_counter(); metrics.incr("add_ball")
+        s = state
+        # Guards
+        if s["status"] == "COMPLETED":
+            st.info("Match completed.")
+            st.stop()
+        if not s["batting"]["striker"] or not s["bowling"].get("current_bowler"):
+            st.error("Set striker & bowler above first."); st.stop()
+        if not s.get("over_in_progress", False):
+            st.error("Start the over by choosing a new bowler."); st.stop()
+
+        sc = s["score"][s["bat_team"]]
+
+        # Prevent further legal balls if overs finished for this innings
+        if sc["balls"] >= s["overs_limit"]*6:
+            try: record_event(mid, meta, s, {"t": "end_innings"}, expect=s.get("_seq", 0))
+            except storage.StaleState: pass  # already closed by another scorer
+            st.warning("Innings closed. Switch to next innings or end match.")
+            st.stop()
+
+        extra = {"No-Ball": runs_off_bat_nb, "Wide": wide_runs, "Leg Bye": lb_runs, "Bye": bye_runs}.get(outcome, 0)
+        ev = {"t": "ball", "outcome": outcome, "runs": int(extra), "id": ball_id}
+        if outcome == "Wicket": ev["info"] = wicket_info
+        try:
+            done = record_event(mid, meta, s, ev, expect=seen[2] if seen and seen[:2] == (mid, ball_id) else None)
+        except storage.StaleState:
+            st.session_state.ball_flash = ("warning", "⚠️ Another scorer updated this match after you opened it, "
+                                           "so this ball was NOT recorded. Check the latest score and submit again "
+                                           "if it is still missing.")
+        else:
+            if metrics.enabled(): metrics.observe("add_ball", time.perf_counter() - t_submit)
+            st.session_state.ball_flash = (("success", "Ball recorded.") if done else
+                                           ("info", "This ball was already recorded (duplicate submit ignored)."))
+        # Fresh form (new ball id) drawn from the state as it is now
+        st.session_state.ball_id = uuid.uuid4().hex
+        st.rerun()
+
+    # ---------------- Corrections ----------------
+    st.markdown("#### Corrections")
+    if disabled_scoring:
+        st.caption("Match completed — corrections are closed.")
+    elif st.toggle("Undo / edit a ball", key="corrections"):
+        # Widgets are keyed on the _seq the panel was drawn from, and that _seq is the
+        # correction's `expect`: if a ball landed since, the click is refused, never
+        # applied to a different "last ball" or a re-ordered list.
+        drawn = seen_seq("corrections", mid, state)
+        events = db.read_events(mid)
+        balls = ball_list(events)[::-1]  # newest first
+        if events and events[0]["t"] != "start":
+            st.info("This match was scored before the event log; its balls cannot be corrected.")
+        elif not balls:
+            st.info("No balls recorded yet.")
+        else:
+            if st.button(f"↩️ Undo last ball ({ball_text(balls[0])})", key=f"undo_{drawn}"):
+                correct(mid, meta, state, drawn, undo_edits(events),
+                        f"Scorer correction: {ball_text(balls[0])} undone.")
+            with st.form(f"edit_ball_{drawn}"):
+                pick = st.selectbox("Ball to edit", balls[:120], format_func=ball_text, key=f"edit_pick_{drawn}")
+                new_outcome = st.radio("Correct outcome", OUTCOMES, horizontal=True)
+                new_runs = st.number_input("Extra runs (Wide / Bye / Leg Bye) or off the bat on a No-Ball", 0, 6, 0)
+                new_info = st.text_input("Dismissal (if Wicket)")
+                if st.form_submit_button("Save correction"):
+                    ev = dict(pick[3], outcome=new_outcome, runs=int(new_runs) if new_outcome in RUN_OUTCOMES else 0)
+                    if new_outcome == "Wicket": ev["info"] = new_info
+                    else: ev.pop("info", None)
+                    correct(mid, meta, state, drawn, {str(pick[0]): ev},
+                            f"Scorer correction: {ball_text(pick)} changed to {ball_text((0, pick[1], pick[2], ev))}.")
+            st.caption("Later balls are re-applied from the nearest checkpoint; strike, stats and overs follow.")
+
+    # Ball chips / commentary
+    st.markdown("### Recent Balls")
+    with metrics.span("chips_html"):
+        chips_html = "".join([f"<span class='ball-chip {b['tag']}'>{b['txt']}</span>" for b in state.get("balls_log", [])[-24:][::-1]])
+    st.markdown(f"<div class='ball-feed'>{chips_html}</div>", unsafe_allow_html=True)
+
+    st.markdown("### Commentary (latest first)")
+    st.write("\n".join(latest_commentary(state, 30)))
@@ -0,0 +1,63 @@
+# page_setup.py — "Match Setup": create matches, browse the catalog
+
+import uuid
+from datetime import datetime
+import streamlit as st
+import tournaments
+from ui import browse_matches, db, record_event
+
+
+def render(role):
+    st.subheader("Create / Manage Matches")
+    if role == "Guest":
+        st.info("👀 Guest mode: Match create/edit allowed nahi hai.")
+        st.stop()
+
+    # Open tournament fixtures; picking one names the sides and links the match
+    fixtures = {f"{t['name']} — R{f['round']}: {f['home']} vs {f['away']}": (tid, f)
+                for tid, t in tournaments.load().items() for f in tournaments.open_fixtures(t)}
+
+    with st.form("new_match", clear_on_submit=True):
+        fixture = st.selectbox("Tournament fixture (optional)", ["— None —"] + list(fixtures),
+                               help="Team A is the home side; the title defaults to the fixture.") if fixtures else None
+        title = st.text_input("Match Title (e.g., MPGB A vs MPGB B)")
+        venue = st.text_input("Venue")
+        overs = st.number_input("Overs per innings", 1, 50, 20)
+        toss_winner = st.selectbox("Toss won by", ["Team A","Team B","Decide later"])
+        bat_first   = st.selectbox("Batting first", ["Team A","Team B","Decide later"])
+        teamA = st.text_area("Team A players (one per line)").strip()
+        teamB = st.text_area("Team B players (one per line)").strip()
+        create = st.form_submit_button("Create Match")
+
+    if create:
+        tid, fx = fixtures.get(fixture, (None, None))
+        if fx and not title: title = f"{fx['home']} vs {fx['away']}"
+        if not title or not teamA or not teamB:
+            st.error("Enter match title and both team lists.")
+        else:
+            mid = datetime.now().strftime("%Y%m%d") + "-" + uuid.uuid4().hex[:6].upper()
+            meta = {
+                "title": title, "venue": venue, "overs": int(overs),
+                "toss_winner": toss_winner, "bat_first": bat_first,
+                "teamA": [p.strip() for p in teamA.splitlines() if p.strip()],
+                "teamB": [p.strip() for p in teamB.splitlines() if p.strip()],
+                "created_at": datetime.now().isoformat(),
+                "storage": "eventlog"
+            }
+            if fx: meta.update(tournaments.match_meta(tid, fx))
+            db.save_match(mid, meta)
+            if fx: tournaments.link_match(tid, fx["id"], mid)
+
+            init_bat = "Team A" if bat_first=="Team A" else ("Team B" if bat_first=="Team B" else "Team A")
+            state = {}
+            record_event(mid, meta, state, {"t": "start", "overs": int(overs), "bat_team": init_bat,
+                                            "teams": {"Team A": meta["teamA"], "Team B": meta["teamB"]}})
+            st.success(f"✅ Match created! Match ID: **{mid}**")
+
+    st.markdown("### Existing Matches")
+    rows = browse_matches("setup")
+    if rows:
+        for mid, m in rows:
+            st.write(f"**{m['title']}** — `{mid}` @ {m.get('venue','')}, Overs: {m['overs']}")
+    else:
+        st.info("No matches yet.")
@@ -0,0 +1,21 @@
+# page_stats.py — "Player Stats": career / season tables from the ball table
+
+import streamlit as st
+from ui import player_tables, read_registered
+
+
+def render(role):
+    st.subheader("Player Stats")
+    career, season = player_tables()
+    t1, t2, t3 = st.tabs(["Career", "Season", "Registered Members"])
+    with t1:
+        if career.empty: st.info("Stats appear here once a match is completed.")
+        else: st.dataframe(career, use_container_width=True, hide_index=True)
+    with t2:
+        if not season.empty:
+            yr = st.selectbox("Season", sorted(season["season"].unique(), reverse=True))
+            st.dataframe(season[season["season"] == yr].drop(columns="season"), use_container_width=True, hide_index=True)
+    with t3:
+        df = read_registered()
+        st.dataframe(df, use_container_width=True)
+    st.caption("Built from ball-by-ball data of completed matches.")
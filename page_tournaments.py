@@ -0,0 +1,52 @@
+# page_tournaments.py — "Tournaments": points table, fixtures, create (admin)
+
+import streamlit as st
+import tournaments
+from ui import db
+
+
+def render(role):
+    st.subheader("Tournaments")
+    if st.session_state.get("is_admin"):
+        with st.expander("➕ New tournament", expanded=False):
+            with st.form("new_tournament", clear_on_submit=True):
+                name = st.text_input("Name (e.g., Inter-Branch Cup 2025)")
+                fmt = st.selectbox("Format", tournaments.FORMATS, format_func=lambda f: f.replace("_", " ").title())
+                teams = st.text_area("Teams (one per line, top seed first)")
+                if st.form_submit_button("Create Tournament"):
+                    try:
+                        tid = tournaments.create(name.strip() or "Tournament", fmt, teams.splitlines())
+                        st.success(f"✅ Tournament created: **{tid}**")
+                    except ValueError as e:
+                        st.error(str(e))
+
+    data = tournaments.load()
+    if not data:
+        st.info("No tournaments yet.")
+        return
+    tid = st.selectbox("Tournament", sorted(data, key=lambda k: data[k]["created_at"], reverse=True),
+                       format_func=lambda k: f"{data[k]['name']} ({k})")
+    t = data[tid]
+    t1, t2 = st.tabs(["Points Table", "Fixtures"])
+    with t1:
+        st.dataframe(tournaments.standings(t), use_container_width=True, hide_index=True)
+        st.caption(f"Win {tournaments.WIN_PTS} pts, tie / no result {tournaments.TIE_PTS}. "
+                   "NRR counts the full quota of overs for a side bowled out.")
+    with t2:
+        rows = [{"Round": f["round"], "Home": f["home"] or "TBD", "Away": f["away"] or ("bye" if f["round"] == 1 else "TBD"),
+                 "Match": f["mid"] or "",
+                 "Winner": f["winner"] if f["winner"] is not None else ("tied — pick winner" if f.get("pending") else "")}
+                for f in t["fixtures"]]
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+        st.caption("Schedule a fixture from Match Setup; the table updates when its match completes.")
+        pending = [f for f in t["fixtures"] if f.get("pending") and f["winner"] is None]
+        if pending and st.session_state.get("is_admin"):
+            st.markdown("#### Tied knockout games")
+            for f in pending:
+                c1, c2 = st.columns([3, 1])
+                pick = c1.radio(f"Round {f['round']}: {f['home']} vs {f['away']} — super over / toss winner",
+                                [f["home"], f["away"]], horizontal=True, key=f"tiebreak_{tid}_{f['id']}")
+                if c2.button("Confirm", key=f"tiebreak_ok_{tid}_{f['id']}"):
+                    meta = db.load_matches().get(f["mid"], {})
+                    tournaments.record_result(f["mid"], meta, db.load_state(f["mid"], meta), tiebreak=pick)
+                    st.rerun()
@@ -0,0 +1,115 @@
+# photos.py — member photo store for MPGB Cricket Club
+# Uploads are normalized once into a small JPEG thumbnail and kept under
+# data/photos/<sha256 of the upload>.jpg, so an identical upload is never decoded
+# twice and ID cards can be regenerated at any time. Big JPEGs are decoded in draft
+# mode (the decoder scales by 1/2..1/8 while reading), so a 12 MP phone photo never
+# gets a full-size bitmap; other formats are shrunk with reduce() before resampling.
+# normalize() raises OSError / ValueError for files Pillow cannot read.
+# data/photos/members.json maps Reg_No -> photo key.
+#
+# Memory check:  python photos.py --mem-test [--mp 12]
+
+import hashlib, os, sys, tempfile
+from PIL import Image, ImageOps
+import storage
+from registry import registry_lock
+
+PHOTO_DIR = os.path.join(storage.DATA_DIR, "photos")
+MEMBER_PHOTOS = os.path.join(PHOTO_DIR, "members.json")
+THUMB = (240, 240)
+
+
+def normalize(fp):
+    # Upload (path or file object) -> THUMB-sized RGB image, upright per its EXIF tag
+    img = Image.open(fp)
+    if img.format == "JPEG":
+        img.draft("RGB", (THUMB[0] * 2, THUMB[1] * 2))  # keep 2x headroom for a clean downsample
+    else:
+        # reduce() only takes 8-bit L / RGB(A); palette, 1-bit and 16-bit PNGs are converted first
+        if img.mode not in ("L", "RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.mode or "transparency" in img.info else "RGB")
+        factor = min(img.width // (THUMB[0] * 2), img.height // (THUMB[1] * 2))
+        if factor > 1: img = img.reduce(factor)
+    img = ImageOps.exif_transpose(img)
+    return ImageOps.fit(img.convert("RGB"), THUMB, Image.LANCZOS)
+
+
+def _digest(fp):
+    h = hashlib.sha256()
+    fp.seek(0)
+    for chunk in iter(lambda: fp.read(1 << 16), b""): h.update(chunk)
+    fp.seek(0)
+    return h.hexdigest()[:32]
+
+
+def photo_path(key): return os.path.join(PHOTO_DIR, f"{key}.jpg")
+
+
+def save_photo(fp):
+    # Stores the normalized thumbnail once per distinct upload; returns its key
+    key = _digest(fp)
+    path = photo_path(key)
+    if not os.path.exists(path):
+        os.makedirs(PHOTO_DIR, exist_ok=True)
+        img = normalize(fp)
+        # Own temp file per writer (as storage.save_json): two sessions saving the same
+        # upload at once both rename a complete file into place
+        fd, tmp = tempfile.mkstemp(prefix=key + ".", suffix=".tmp", dir=PHOTO_DIR)
+        try:
+            with os.fdopen(fd, "wb") as f: img.save(f, format="JPEG", quality=88)
+            os.replace(tmp, path)
+        except BaseException:
+            try: os.remove(tmp)
+            except OSError: pass
+            raise
+    return key
+
+
+def load_photo(key):
+    try: return Image.open(photo_path(key))
+    except (OSError, TypeError): return None
+
+
+def member_photos(): return storage.load_json(MEMBER_PHOTOS, {})
+
+
+def set_member_photo(reg_no, key):
+    os.makedirs(PHOTO_DIR, exist_ok=True)
+    with registry_lock(MEMBER_PHOTOS):
+        index = member_photos(); index[reg_no] = key
+        storage.save_json(MEMBER_PHOTOS, index)
+
+
+# -------------------- Memory test --------------------
+def _peak_rss(mode, path):
+    # Runs in a fresh process so ru_maxrss only covers this one decode
+    import resource
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if mode == "full": Image.open(path).convert("RGB").resize(THUMB)  # the old upload path
+    else: normalize(path)
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base) / 1024  # KB -> MB (Linux)
+
+
+def mem_test(mp=12):
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    w = int((mp * 1e6 * 4 / 3) ** 0.5); h = w * 3 // 4
+    path = os.path.join(tempfile.mkdtemp(), "phone.jpg")
+    Image.linear_gradient("L").convert("RGB").resize((w, h)).save(path, quality=90)
+    print(f"{w}x{h} JPEG ({os.path.getsize(path) / 1e6:.1f} MB on disk)")
+    for mode in ("full", "draft"):
+        with ProcessPoolExecutor(max_workers=1) as ex:
+            peak = ex.submit(_peak_rss, mode, path).result()
+        t0 = time.perf_counter()
+        (Image.open(path).convert("RGB").resize(THUMB) if mode == "full" else normalize(path))
+        print(f"{mode:>5}: peak +{peak:.0f} MB, {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Photo normalization memory check")
+    ap.add_argument("--mem-test", action="store_true")
+    ap.add_argument("--mp", type=float, default=12, help="megapixels of the synthetic photo")
+    a = ap.parse_args()
+    if a.mem_test: mem_test(a.mp)
+    sys.exit(0)
@@ -0,0 +1,136 @@
+# projection.py — projected score and win probability for a live match
+# Simulates SIMS completions of the match at once with NumPy. Outcomes come from this
+# club's own per-delivery mix (the ball table of completed matches, see stats.py),
+# blended with a generic prior so a young club still gets sensible numbers. Wides and
+# no-balls are folded into the legal ball that follows them, so an innings is exactly
+# one (SIMS, balls left) draw from a lookup table; cumulative-sum masks stop each row
+# at its last wicket or (chasing) the target. No Python loop per ball or simulation.
+#
+# Results are cached per (match, state version, score) in a small process-wide LRU,
+# so every viewer of a match shares one computation per ball, and the RNG is seeded
+# from the same key, so a refresh never makes the numbers jitter.
+#
+# Benchmark: python bench.py projection
+
+import threading, time, zlib
+from collections import OrderedDict
+import numpy as np
+import metrics
+
+SIMS = 2000
+TABLE = 4096  # lookup slots: outcome probabilities are kept to 1/4096
+# (runs, legal, wicket) for each kind of delivery, with prior weights (per 1000 balls)
+KINDS = [(0, 1, 0), (1, 1, 0), (2, 1, 0), (3, 1, 0), (4, 1, 0), (6, 1, 0), (0, 1, 1),
+         (1, 0, 0), (2, 0, 0), (5, 0, 0)]
+PRIOR = np.array([380, 300, 70, 8, 90, 35, 45, 45, 20, 7], dtype=float)
+PRIOR_BALLS = 300  # how much history outweighs the prior: equal after this many deliveries
+
+_lock = threading.Lock()
+_results = OrderedDict()  # (mid, seq, innings, score) -> result
+_model = (object(), None)  # (ball table version, ball_table())
+
+
+# -------------------- Outcome model --------------------
+def outcome_counts(balls):
+    # Deliveries in the ball table per KINDS entry (legacy summary rows are skipped)
+    b = balls[balls["innings"] > 0]
+    if b.empty: return np.zeros(len(KINDS))
+    runs = (b["bat_runs"] + b["extras"]).to_numpy(int)
+    legal = b["bowl_balls"].to_numpy(int) > 0; wkt = b["wkts"].to_numpy(int) > 0
+    counts = np.zeros(len(KINDS))
+    legal_runs = np.minimum(runs, 6); legal_runs[legal_runs == 5] = 4  # 5s are overthrow fours
+    for i, (r, lg, w) in enumerate(KINDS):
+        if w: counts[i] = (legal & wkt).sum()
+        elif lg: counts[i] = (legal & ~wkt & (legal_runs == r)).sum()
+    extras = runs[~legal]
+    counts[7] = (extras <= 1).sum(); counts[8] = ((extras >= 2) & (extras <= 3)).sum(); counts[9] = (extras >= 4).sum()
+    return counts
+
+
+def model_probs(counts):
+    prior = PRIOR / PRIOR.sum() * PRIOR_BALLS
+    p = prior + counts
+    return p / p.sum()
+
+
+def ball_table(probs, max_runs=24, max_extras=6):
+    # Legal-ball outcomes with any wides / no-balls before them folded in: a uint8
+    # lookup table of TABLE slots (a draw is table[random slot]), runs and wicket per entry
+    kinds = np.array(KINDS); legal = kinds[:, 1] == 1
+    q = probs[~legal].sum()
+    one = np.bincount(kinds[~legal, 0], probs[~legal] / q, max_runs)  # runs of one illegal ball
+    pre, cur = np.zeros(max_runs), np.eye(1, max_runs)[0]
+    for j in range(max_extras):  # j illegal deliveries before the legal one
+        pre += q ** j * (1 - q) * cur; cur = np.convolve(cur, one)[:max_runs]
+    runs, wkt, p = [], [], []
+    for pk, (r, _, w) in zip(probs[legal] / probs[legal].sum(), kinds[legal]):
+        for e in np.flatnonzero(pre[:max_runs - r] > 1e-5):
+            runs.append(r + e); wkt.append(w); p.append(pk * pre[e])
+    slots = np.floor(np.array(p) / sum(p) * TABLE).astype(int)
+    slots[np.argmax(slots)] += TABLE - slots.sum()
+    return (np.repeat(np.arange(len(p)), slots).astype(np.uint8),
+            np.array(runs, dtype=np.int16), np.array(wkt, dtype=np.int16))
+
+
+def model():
+    # ball_table() of the club's outcome mix, rebuilt only when the ball table changes
+    global _model
+    import stats
+    ver = stats.table_version()
+    if _model[0] != ver or _model[1] is None:
+        with metrics.span("projection_model"):
+            _model = (ver, ball_table(model_probs(outcome_counts(stats.load_ball_table()))))
+    return _model[1]
+
+
+# -------------------- Simulation --------------------
+def simulate(rng, model, balls_left, wkts_left, need=None, sims=SIMS):
+    # Runs scored in the rest of an innings, one value per simulation. `need` (a number,
+    # or one per simulation) stops a chase as soon as it is reached.
+    if balls_left <= 0 or wkts_left <= 0 or (need is not None and np.all(need <= 0)):
+        return np.zeros(sims, dtype=np.int64)
+    table, runs_of, wkt_of = model
+    k = table[rng.integers(0, TABLE, size=(sims, balls_left), dtype=np.uint16)]
+    runs, wkt = runs_of[k], wkt_of[k]
+    # A ball is bowled while, before it, wickets remain (and the chase is still on)
+    live = np.cumsum(wkt, 1, dtype=np.int16) - wkt < wkts_left
+    if need is not None: live &= np.cumsum(runs, 1, dtype=np.int16) - runs < np.reshape(need, (-1, 1))
+    return (runs * live).sum(1, dtype=np.int64)
+
+
+def _wkts_max(state, side): return max(len(state["teams"].get(side, [])) - 1, 1)
+
+
+def project(mid, state, sims=SIMS, m=None):
+    # {"projected": (p10, p50, p90), "win": {side: prob}, "tie": prob, ...} or None;
+    # `m` overrides the club model (a ball_table())
+    if state.get("status") == "COMPLETED" or not state.get("score"): return None
+    bat, bowl = state["bat_team"], state["bowl_team"]; sc = state["score"][bat]
+    key = (mid, state.get("_seq"), state["innings"], sc["balls"], sc["runs"], sc["wkts"])
+    with _lock:
+        if key in _results:
+            _results.move_to_end(key); return _results[key]
+    t0 = time.perf_counter()
+    with metrics.span("projection"):
+        rng = np.random.default_rng(zlib.crc32(repr(key).encode()))
+        m = m or model(); quota = state["overs_limit"] * 6
+        left = quota - sc["balls"]
+        if state["innings"] == 1:
+            first = sc["runs"] + simulate(rng, m, left, _wkts_max(state, bat) - sc["wkts"], sims=sims)
+            chase = simulate(rng, m, quota, _wkts_max(state, bowl), need=first + 1, sims=sims)
+            total = first; win_bat, tie = (first > chase).mean(), (first == chase).mean()
+            res = {"target": None, "need": None, "rrr": None}
+        else:
+            target = state["score"][bowl]["runs"] + 1; need = target - sc["runs"]
+            total = sc["runs"] + simulate(rng, m, left, _wkts_max(state, bat) - sc["wkts"], need=need, sims=sims)
+            win_bat, tie = (total >= target).mean(), (total == target - 1).mean()
+            res = {"target": target, "need": max(need, 0),
+                   "rrr": round(need * 6 / left, 2) if left > 0 and need > 0 else None}
+        p10, p50, p90 = np.percentile(total, [10, 50, 90]).round().astype(int).tolist()
+        res.update(projected=(p10, p50, p90), balls_left=left, tie=round(float(tie), 3), sims=sims,
+                   win={bat: round(float(win_bat), 3), bowl: round(float(1 - win_bat - tie), 3)},
+                   ms=round((time.perf_counter() - t0) * 1e3, 1))
+    with _lock:
+        _results[key] = res
+        while len(_results) > 64: _results.popitem(last=False)
+    return res
@@ -0,0 +1,159 @@
+# registry.py — append-only member registry for MPGB Cricket Club
+# Reg_No allocation and the CSV append happen under one exclusive file lock, so
+# parallel submits never share a number or lose a row. The running counter lives in
+# a small side file (Registered_Members.csv.seq); an append is O(1) however big the
+# registry gets. Bulk imports validate a whole sheet with pandas column ops and take
+# one block of numbers under a single lock.
+#
+# Load test:  python registry.py --load-test 500 --workers 32
+
+import csv, os, sys, time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+
+    def _lock(f): fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    def _unlock(f): fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock(f): f.seek(0); msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    def _unlock(f): f.seek(0); msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+REG_COLS = ["Reg_No", "Name", "Mobile", "Branch", "Role"]
+
+
+def make_reg_no(n, year=None): return f"MPGBCC-{year or datetime.now().year}-{n:04d}"
+
+
+@contextmanager
+def registry_lock(path):
+    # Held for the whole read-counter / append / bump-counter sequence
+    with open(path + ".lock", "a+b") as f:
+        _lock(f)
+        try: yield
+        finally: _unlock(f)
+
+
+def _last_number(path):
+    seq = path + ".seq"
+    if os.path.exists(seq):
+        with open(seq, "r", encoding="utf-8") as f:
+            txt = f.read().strip()
+        if txt: return int(txt)
+    # First use on an existing registry: count the rows once
+    if not os.path.exists(path): return 0
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+def register_member(path, name, mobile, branch, role):
+    # Returns the new Reg_No
+    with registry_lock(path):
+        n = _last_number(path) + 1
+        # Bump the counter first: a crash in between leaves a gap, never a duplicate
+        with open(path + ".seq", "w", encoding="utf-8") as f:
+            f.write(str(n))
+        reg_no = make_reg_no(n)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            if new_file: w.writerow(REG_COLS)
+            w.writerow([reg_no, name, mobile, branch, role])
+        return reg_no
+
+
+def register_many(path, rows):
+    # rows: (name, mobile, branch, role) tuples. One lock, one counter bump and one
+    # append for the whole batch; returns the Reg_Nos in row order.
+    rows = list(rows)
+    if not rows: return []
+    with registry_lock(path):
+        n = _last_number(path)
+        with open(path + ".seq", "w", encoding="utf-8") as f:
+            f.write(str(n + len(rows)))
+        reg_nos = [make_reg_no(n + i + 1) for i in range(len(rows))]
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            if new_file: w.writerow(REG_COLS)
+            w.writerows([r, *row] for r, row in zip(reg_nos, rows))
+        return reg_nos
+
+
+# -------------------- Bulk import --------------------
+ROLES = ["Batsman", "Bowler", "All-Rounder", "Wicketkeeper"]
+IMPORT_ALIASES = {"name": "Name", "full_name": "Name", "mobile": "Mobile", "mobile_no": "Mobile",
+                  "branch": "Branch", "branch_code": "Branch", "role": "Role", "playing_role": "Role"}
+
+
+def norm_mobiles(col):
+    # Vectorized norm_mobile: "+91-98765 43210" / 9876543210.0 -> "9876543210"
+    digits = col.astype(str).str.strip().str.replace(r"\.0$", "", regex=True).str.replace(r"\D", "", regex=True)
+    return digits.str[-10:]
+
+
+def validate_import(df, paid_mobiles, registered_mobiles):
+    # Returns (accepted rows as Name/Mobile/Branch/Role, rejected rows with a Reason column)
+    import pandas as pd
+    df = df.rename(columns=lambda c: IMPORT_ALIASES.get(str(c).strip().lower().replace(" ", "_"), c))
+    for col in ("Name", "Mobile", "Branch", "Role"):
+        if col not in df: df[col] = ""
+    df = df[["Name", "Mobile", "Branch", "Role"]].fillna("").astype(str)
+    df = df.apply(lambda c: c.str.strip())
+    df["Mobile"] = norm_mobiles(df["Mobile"])
+    roles = {r.lower(): r for r in ROLES}
+    df["Role"] = df["Role"].str.lower().map(roles).fillna(df["Role"])
+    # First matching reason wins; checks run over whole columns
+    checks = [
+        ("missing name", df["Name"] == ""),
+        ("missing branch", df["Branch"] == ""),
+        ("invalid mobile", df["Mobile"].str.len() != 10),
+        ("unknown role", (df["Role"] != "") & ~df["Role"].isin(ROLES)),
+        ("not in paid list", ~df["Mobile"].isin(paid_mobiles)),
+        ("already registered", df["Mobile"].isin(registered_mobiles)),
+        ("duplicate in file", df["Mobile"].duplicated()),
+    ]
+    reason = pd.Series("", index=df.index)
+    for why, bad in checks:
+        reason = reason.mask((reason == "") & bad, why)
+    rejected = df[reason != ""].assign(Reason=reason[reason != ""])
+    rejected.insert(0, "Row", rejected.index + 2)  # spreadsheet row number (after the header)
+    return df[reason == ""].reset_index(drop=True), rejected.reset_index(drop=True)
+
+
+# -------------------- Load test --------------------
+def _worker(args):
+    path, i = args
+    return register_member(path, f"Player {i}", f"9{i:09d}", f"BR{i % 40:03d}", "Batsman")
+
+
+def load_test(n=500, workers=32, processes=True):
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    path = os.path.join(tempfile.mkdtemp(), "Registered_Members.csv")
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    t0 = time.perf_counter()
+    with pool(max_workers=workers) as ex:
+        returned = list(ex.map(_worker, [(path, i) for i in range(n)]))
+    dt = time.perf_counter() - t0
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    stored = [r["Reg_No"] for r in rows]
+    ok = len(rows) == n and len(set(stored)) == n and sorted(stored) == sorted(returned)
+    print(f"{n} registrations, {workers} {'processes' if processes else 'threads'}: "
+          f"{dt:.2f}s ({n / dt:.0f}/s) — rows={len(rows)} unique Reg_No={len(set(stored))} "
+          f"{'OK' if ok else 'FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Parallel registration load test")
+    ap.add_argument("--load-test", type=int, default=500, metavar="N")
+    ap.add_argument("--workers", type=int, default=32)
+    ap.add_argument("--threads", action="store_true", help="use threads instead of processes")
+    a = ap.parse_args()
+    sys.exit(0 if load_test(a.load_test, a.workers, not a.threads) else 1)
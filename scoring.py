@@ -0,0 +1,343 @@
+# scoring.py — match state reducer for MPGB Cricket Club live scoring
+# Pure Python (no Streamlit): APP.py, batch jobs and checks all import it.
+# A match is a list of events, each one JSON line in data/match_{mid}_events.jsonl:
+#   {"t":"start","overs":20,"bat_team":"Team A","teams":{...}}
+#   {"t":"players","striker":..,"non_striker":..,"bowler":..}
+#   {"t":"ball","outcome":"4","runs":0,"info":"","ts":"HH:MM:SS"}
+#   {"t":"end_over"} / {"t":"end_innings"}
+#   {"t":"amend","edits":{"<seq>": event or null},"note":..}   (undo / edit, see below)
+# Events are numbered from 1 in log order (seq == state["_seq"] once folded). The log is
+# never rewritten: a correction is an "amend" event that replaces (or, with null,
+# drops) earlier events; fold_amended() re-folds from a checkpoint with it applied.
+# Commentary timestamps come from the event's "ts", so replays are deterministic.
+
+import copy, json
+import metrics
+
+BALL_IDS_KEPT = 32
+
+
+def overs_str(balls): return f"{balls//6}.{balls%6}"
+
+# Commentary is stored oldest first, so adding a line is an O(1) append. Storage keeps
+# only the newest lines in the state and moves older ones to archive pages
+# (commentary_paged = lines moved out so far); balls_log and each side's overs_index
+# are paged the same way (balls_paged, overs_paged[team]), see paged_lists().
+def add_commentary(state, txt, ts=""): state["commentary"].append(f"{ts} — {txt}")
+
+def latest_commentary(state, n=30): return state.get("commentary", [])[-n:][::-1]
+
+
+def new_match_state(overs, bat_team, teamA, teamB):
+    return {
+        "status":"INNINGS1","innings":1,"overs_limit":int(overs),
+        "bat_team":bat_team,"bowl_team":"Team B" if bat_team=="Team A" else "Team A",
+        "teams":{"Team A":teamA[:],"Team B":teamB[:]},
+        "score":{"Team A":{"runs":0,"wkts":0,"balls":0},"Team B":{"runs":0,"wkts":0,"balls":0}},
+        "batting":{"striker":"","non_striker":"","next_index":0,
+                   "order": teamA[:] if bat_team=="Team A" else teamB[:]},
+        "bowling":{"current_bowler":"","last_over_bowler":""},
+        "batsman_stats":{},"bowler_stats":{},"commentary":[],"commentary_paged":0,
+        "balls_log":[], "balls_paged":0, "overs_index":{}, "overs_paged":{}, "over_in_progress":False
+    }
+
+
+@metrics.timed("ensure_state_defaults")
+def ensure_state_defaults(s, meta):
+    # Backward/forward compatible keys
+    s.setdefault("status", "INNINGS1")
+    s.setdefault("innings", 1)
+    s.setdefault("overs_limit", int(meta.get("overs", 20)))
+    s.setdefault("balls_log", [])  # list of dicts {over, ball, txt, tag}
+    s.setdefault("overs_index", {})  # batting team -> per-over summaries (see _index_ball)
+    s.setdefault("balls_paged", 0)
+    s.setdefault("overs_paged", {})
+    s.setdefault("over_in_progress", False)
+    s.setdefault("batting", {"striker":"","non_striker":"","next_index":0, "order": []})
+    s.setdefault("bowling", {"current_bowler":"","last_over_bowler":""})
+    s.setdefault("batsman_stats", {})
+    s.setdefault("bowler_stats", {})
+    s.setdefault("commentary", [])
+    if "commentary_paged" not in s:  # older states kept commentary newest first
+        s["commentary"].reverse(); s["commentary_paged"] = 0
+    s.setdefault("teams", {"Team A": meta.get("teamA", []), "Team B": meta.get("teamB", [])})
+    s.setdefault("score", {"Team A":{"runs":0,"wkts":0,"balls":0}, "Team B":{"runs":0,"wkts":0,"balls":0}})
+
+
+def rr(runs, balls):
+    if balls == 0: return 0.0
+    return round((runs * 6) / balls, 2)
+
+
+def end_over(s, ts=""):
+    bat = s["bat_team"]
+    sc = s["score"][bat]
+    # Swap strike at the end of a completed over
+    s["batting"]["striker"], s["batting"]["non_striker"] = s["batting"]["non_striker"], s["batting"]["striker"]
+    # Remember who just bowled; force new selection
+    s["bowling"]["last_over_bowler"] = s["bowling"].get("current_bowler", "")
+    s["bowling"]["current_bowler"] = ""
+    s["over_in_progress"] = False
+    overs = s.get("overs_index", {}).get(bat)
+    if overs: overs[-1]["done"] = True
+    add_commentary(s, f"Over complete: {overs_str(sc['balls'])} — {bat} {sc['runs']}/{sc['wkts']}", ts)
+
+
+def end_innings(s, ts=""):
+    # Called when overs finished or all out
+    if s["innings"] == 1:
+        add_commentary(s, "Innings 1 complete.", ts)
+        # Switch teams
+        s["innings"] = 2
+        s["status"] = "INNINGS2"
+        s["bat_team"], s["bowl_team"] = s["bowl_team"], s["bat_team"]
+        # New batting order from that team's list
+        s["batting"] = {"striker":"","non_striker":"","next_index":0, "order": s["teams"][s["bat_team"]][:]}
+        s["bowling"] = {"current_bowler":"", "last_over_bowler":""}
+        s["over_in_progress"] = False
+    else:
+        s["status"] = "COMPLETED"
+        add_commentary(s, "Match completed.", ts)
+
+
+def set_players(s, striker, non_striker, bowler):
+    s["batting"]["striker"]=striker; s["batting"]["non_striker"]=non_striker
+    s["bowling"]["current_bowler"]=bowler
+    s["over_in_progress"] = True
+    for p in [striker, non_striker]:
+        s["batsman_stats"].setdefault(p, {"R":0,"B":0,"4":0,"6":0})
+    s["bowler_stats"].setdefault(bowler, {"B":0,"R":0,"W":0})
+
+
+def _index_ball(s, over_idx, bowler, runs, extras, wkt, legal):
+    # Per-over summary for the batting side, kept up to date ball by ball so over
+    # charts never rescan balls_log: {over, bowler, runs, wkts, extras, balls,
+    # total, total_wkts (cumulative at the last ball), done}
+    overs = s["overs_index"].setdefault(s["bat_team"], [])
+    paged = s.get("overs_paged", {}).get(s["bat_team"], 0)  # older overs moved to pages
+    over_idx -= paged
+    while len(overs) <= over_idx:
+        overs.append({"over": paged + len(overs) + 1, "bowler": "", "runs": 0, "wkts": 0, "extras": 0, "balls": 0,
+                      "total": 0, "total_wkts": 0, "done": False})
+    o = overs[over_idx]
+    sc = s["score"][s["bat_team"]]
+    o["bowler"] = bowler; o["runs"] += runs; o["wkts"] += int(wkt); o["extras"] += extras; o["balls"] += int(legal)
+    o["total"] = sc["runs"]; o["total_wkts"] = sc["wkts"]
+
+
+def _apply_ball(s, ev):
+    # ev: {"outcome": "0".."6"|"Wicket"|"Wide"|"No-Ball"|"Leg Bye"|"Bye", "runs": extra runs, "info": dismissal}
+    outcome = ev["outcome"]; extra = int(ev.get("runs", 0))
+    striker = s["batting"]["striker"]; non_striker = s["batting"]["non_striker"]; bowler = s["bowling"]["current_bowler"]
+    s["batsman_stats"].setdefault(striker, {"R":0,"B":0,"4":0,"6":0})
+    s["batsman_stats"].setdefault(non_striker, {"R":0,"B":0,"4":0,"6":0})
+    s["bowler_stats"].setdefault(bowler, {"B":0,"R":0,"W":0})
+
+    bat_team = s["bat_team"]
+    over_idx = s["score"][bat_team]["balls"] // 6
+    legal_ball=True; add_runs=0; extras=0; chip_tag=""; chip_txt=""; highlight=""
+
+    # ----- Outcomes -----
+    if outcome in ["0","1","2","3","4","6"]:
+        r = int(outcome); add_runs = r
+        s["batsman_stats"][striker]["R"] += r; s["batsman_stats"][striker]["B"] += 1
+        s["bowler_stats"][bowler]["B"] += 1;   s["bowler_stats"][bowler]["R"] += r
+        if r==4: s["batsman_stats"][striker]["4"] += 1
+        if r==6: s["batsman_stats"][striker]["6"] += 1
+        highlight = f"{r} run(s)" if r>0 else "dot ball"
+        chip_tag = "chip-0" if r==0 else ("chip-4" if r==4 else ("chip-6" if r==6 else "chip-1"))
+        chip_txt = str(r)
+        if r % 2 == 1:
+            s["batting"]["striker"], s["batting"]["non_striker"] = non_striker, striker
+
+    elif outcome == "Wicket":
+        s["score"][bat_team]["wkts"] += 1
+        s["batsman_stats"][striker]["B"] += 1
+        s["bowler_stats"][bowler]["B"] += 1; s["bowler_stats"][bowler]["W"] += 1
+        highlight = f"WICKET! {ev.get('info', '')}".strip(); chip_tag = "chip-w"; chip_txt = "W"
+        # bring next batter
+        order = s["batting"]["order"]; nxt = s["batting"]["next_index"]; nxt_p = ""
+        while nxt < len(order):
+            c = order[nxt]; nxt += 1
+            if c not in [striker, non_striker]: nxt_p = c; break
+        s["batting"]["next_index"] = nxt
+        if nxt_p:
+            s["batting"]["striker"] = nxt_p
+            s["batsman_stats"].setdefault(nxt_p, {"R":0,"B":0,"4":0,"6":0})
+
+    elif outcome == "Wide":
+        legal_ball = False
+        add_runs = 1 + extra; extras = add_runs
+        s["bowler_stats"][bowler]["R"] += add_runs
+        highlight = f"Wide (+{1 + extra})"
+        chip_tag = "chip-wide"; chip_txt = "Wd"
+        # Strike changes only if batters ran odd number of runs on the wide
+        if extra % 2 == 1:
+            s["batting"]["striker"], s["batting"]["non_striker"] = non_striker, striker
+
+    elif outcome == "No-Ball":
+        legal_ball = False
+        add_runs = 1 + extra; extras = 1
+        s["bowler_stats"][bowler]["R"] += add_runs
+        if extra:
+            s["batsman_stats"][striker]["R"] += extra
+        highlight = f"No-Ball (+1) + {extra} off bat" if extra else "No-Ball (+1)"
+        chip_tag = "chip-nb"; chip_txt = "NB"
+        if extra % 2 == 1:
+            s["batting"]["striker"], s["batting"]["non_striker"] = non_striker, striker
+
+    elif outcome == "Leg Bye":
+        r = extra
+        add_runs = r; extras = r
+        s["batsman_stats"][striker]["B"] += 1; s["bowler_stats"][bowler]["B"] += 1
+        highlight = f"Leg Bye {r}"
+        chip_tag = "chip-bye"; chip_txt = f"LB{r}"
+        if r % 2 == 1: s["batting"]["striker"], s["batting"]["non_striker"] = non_striker, striker
+
+    elif outcome == "Bye":
+        r = extra
+        add_runs = r; extras = r
+        s["batsman_stats"][striker]["B"] += 1; s["bowler_stats"][bowler]["B"] += 1
+        highlight = f"Bye {r}"
+        chip_tag = "chip-bye"; chip_txt = f"B{r}"
+        if r % 2 == 1: s["batting"]["striker"], s["batting"]["non_striker"] = non_striker, striker
+
+    # Apply runs & balls
+    s["score"][bat_team]["runs"] += add_runs
+    if legal_ball:
+        s["score"][bat_team]["balls"] += 1
+    _index_ball(s, over_idx, bowler, add_runs, extras, outcome == "Wicket", legal_ball)
+    # End of over check
+    if legal_ball and s["score"][bat_team]["balls"] % 6 == 0:
+        end_over(s, ev.get("ts", ""))
+
+    # Log ball for chip feed
+    o = s["score"][bat_team]["balls"]
+    over_num = max(o-1,0)//6 + 1 if o>0 else (o//6 + 1)
+    ball_in_over = (o-1) % 6 + 1 if legal_ball and o>0 else (o % 6)
+    s["balls_log"].append({"over": over_num, "ball": ball_in_over, "txt": chip_txt or outcome, "tag": chip_tag or "chip-1"})
+
+    add_commentary(s, f"{outcome} — {striker} vs {bowler}: {highlight}", ev.get("ts", ""))
+
+
+def fold_event(s, ev):
+    # In-place: used by storage to roll a snapshot forward
+    t = ev["t"]
+    if t == "start": s.clear(); s.update(new_match_state(ev["overs"], ev["bat_team"], ev["teams"]["Team A"], ev["teams"]["Team B"]))
+    elif t == "ball": _apply_ball(s, ev)
+    elif t == "players": set_players(s, ev["striker"], ev["non_striker"], ev["bowler"])
+    elif t == "end_over": end_over(s, ev.get("ts", ""))
+    elif t == "end_innings": end_innings(s, ev.get("ts", ""))
+    elif t == "amend":  # the re-fold itself is done by fold_amended
+        s["corrections"] = s.get("corrections", 0) + 1
+        add_commentary(s, ev.get("note") or "Scorer correction.", ev.get("ts", ""))
+    if "id" in ev:  # recent client ball ids, so a resubmitted ball is recognised
+        ids = s.setdefault("_ids", []); ids.append(ev["id"]); del ids[:-BALL_IDS_KEPT]
+    return s
+
+
+def apply_ball(state, ev):
+    # Pure reducer: returns the state after one delivery, input is left untouched
+    s = copy.deepcopy(state); _apply_ball(s, ev); return s
+
+
+def apply_event(state, ev):
+    return fold_event(copy.deepcopy(state), ev)
+
+
+def replay(events, upto=None, state=None):
+    # Rebuild a match from its events (first `upto` only, if given).
+    # Logs start with a "start" event; pass `state` to replay on top of a known snapshot.
+    s = copy.deepcopy(state) if state else {}
+    return fold_amended(s, list(enumerate(events[:upto], s.get("_seq", 0) + 1)))
+
+
+def amend_floor(ev): return min(int(k) for k in ev["edits"])  # earliest event an amend touches
+
+
+def fold_amended(s, events):
+    # In-place: folds `events` ([(seq, ev)], every seq after s["_seq"] in order) into the
+    # state `s`, with the edits of any "amend" among them applied. `s` must not already
+    # contain an event those amends touch (i.e. s["_seq"] < amend_floor).
+    edits = {}
+    for _, ev in events:
+        if ev["t"] == "amend": edits.update((int(k), v) for k, v in ev["edits"].items())
+    for seq, ev in events:
+        ev = edits.get(seq, ev)
+        if ev is not None: fold_event(s, ev)
+        s["_seq"] = seq
+    return s
+
+
+def effective_events(events):
+    # [(seq, ev)] of a whole log as scored after its corrections (amends left out)
+    edits = {}
+    for ev in events:
+        if ev["t"] == "amend": edits.update((int(k), v) for k, v in ev["edits"].items())
+    out = []
+    for seq, ev in enumerate(events, 1):
+        ev = edits.get(seq, ev)
+        if ev is not None and ev["t"] != "amend": out.append((seq, ev))
+    return out
+
+
+def ball_list(events):
+    # [(seq, innings, "over.ball", ev)] of every delivery after corrections
+    out = []; innings = 1; balls = 0
+    for seq, ev in effective_events(events):
+        if ev["t"] == "end_innings": innings += 1; balls = 0
+        elif ev["t"] == "ball":
+            out.append((seq, innings, f"{balls // 6}.{balls % 6 + 1}", ev))
+            balls += ev["outcome"] not in ("Wide", "No-Ball")
+    return out
+
+
+def undo_edits(events):
+    # Edits for "undo last ball": the last delivery and anything scored after it (new
+    # over's players, end of innings), or None if there is no ball to undo
+    live = effective_events(events)
+    last = next((i for i in range(len(live) - 1, -1, -1) if live[i][1]["t"] == "ball"), None)
+    return None if last is None else {str(seq): None for seq, _ in live[last:]}
+
+
+def read_events(path):
+    # Complete lines of a match_{mid}_events.jsonl log (a torn last line is ignored)
+    events = []
+    with open(path, "rb") as f:
+        for line in f:
+            if line.endswith(b"\n"): events.append(json.loads(line))
+    return events
+
+
+def public_state(s): return {k: v for k, v in s.items() if not k.startswith("_")}
+
+
+def paged_lists(s):
+    # The lists that grow with the match and that storage pages out of snapshots:
+    # {kind: (items still in the state, items moved to pages before them)}
+    out = {"commentary": (s.get("commentary", []), s.get("commentary_paged", 0)),
+           "balls": (s.get("balls_log", []), s.get("balls_paged", 0))}
+    for team, overs in s.get("overs_index", {}).items():
+        out[f"overs-{team}"] = (overs, s.get("overs_paged", {}).get(team, 0))
+    return out
+
+
+PAGED_KEYS = ("commentary", "commentary_paged", "balls_log", "balls_paged", "overs_index", "overs_paged")
+
+
+def same_state(a, b):
+    # Equal apart from how much of each growing list one has paged out
+    pa = {k: v for k, v in public_state(a).items() if k not in PAGED_KEYS}
+    pb = {k: v for k, v in public_state(b).items() if k not in PAGED_KEYS}
+    la, lb = paged_lists(a), paged_lists(b)
+    if pa != pb or la.keys() != lb.keys(): return False
+    for kind, (ia, na) in la.items():
+        ib, nb = lb[kind]
+        n = min(len(ia), len(ib))
+        if na + len(ia) != nb + len(ib) or ia[len(ia) - n:] != ib[len(ib) - n:]: return False
+    return True
+
+
+def check_snapshot(snapshot, events):
+    # True if a stored snapshot equals a replay of the events it claims to cover
+    return same_state(replay(events, snapshot.get("_seq", 0)), snapshot)
@@ -0,0 +1,146 @@
+# stats.py — season / career player statistics for MPGB Cricket Club
+# Every completed match is flattened once into a columnar ball table (one row per
+# delivery, rebuilt from the match's event log). With pyarrow it goes into the Parquet
+# archive (archive.py), otherwise it is appended to data/ball_table.pkl. Career and
+# season tables are plain pandas group-bys over that table, so the Player Stats page
+# never opens individual match files.
+# Matches scored before the event log have no per-ball data; they contribute one
+# summary row per player built from the state's batsman_stats / bowler_stats.
+
+import os
+import pandas as pd
+import archive, storage
+from scoring import effective_events, ensure_state_defaults, fold_event
+
+BALL_TABLE = os.path.join(storage.DATA_DIR, "ball_table.pkl")
+BALL_COLS = ["mid", "season", "innings", "team", "batter", "bowler", "bat_runs", "bat_balls", "fours", "sixes",
+             "out", "bowl_balls", "bowl_runs", "wkts", "extras"]
+
+
+def season_of(mid, meta):
+    # Calendar year the match was created in (match ids start with YYYYMMDD)
+    return int((meta.get("created_at") or mid)[:4])
+
+
+def _ball_row(s, ev):
+    # Figures for one delivery, read off the state *before* it is applied
+    outcome = ev["outcome"]; extra = int(ev.get("runs", 0))
+    r = dict(innings=s["innings"], team=s["bat_team"], batter=s["batting"]["striker"],
+             bowler=s["bowling"]["current_bowler"], bat_runs=0, bat_balls=1, fours=0, sixes=0, out=0,
+             bowl_balls=1, bowl_runs=0, wkts=0, extras=0)
+    if outcome in ("0", "1", "2", "3", "4", "6"):
+        n = int(outcome)
+        r.update(bat_runs=n, bowl_runs=n, fours=int(n == 4), sixes=int(n == 6))
+    elif outcome == "Wicket":
+        r.update(out=1, wkts=1)
+    elif outcome == "Wide":
+        r.update(bat_balls=0, bowl_balls=0, bowl_runs=1 + extra, extras=1 + extra)
+    elif outcome == "No-Ball":
+        r.update(bat_runs=extra, bat_balls=0, bowl_balls=0, bowl_runs=1 + extra, extras=1)
+    else:  # Leg Bye / Bye
+        r.update(extras=extra)
+    return r
+
+
+def match_rows(mid, meta, events=None, state=None):
+    # Ball rows for one match: from its events, else summary rows from its state
+    season = season_of(mid, meta)
+    rows = []
+    if events:
+        s = {}
+        for _, ev in effective_events(events):  # as corrected by any undo / edit
+            if ev["t"] == "ball": rows.append(_ball_row(s, ev))
+            fold_event(s, ev)
+    elif state:
+        ensure_state_defaults(state, meta)
+        team_of = {p: t for t, ps in state["teams"].items() for p in ps}
+        for p, b in state["batsman_stats"].items():
+            rows.append(dict(innings=0, team=team_of.get(p, ""), batter=p, bowler="", bat_runs=b["R"], bat_balls=b["B"],
+                             fours=b["4"], sixes=b["6"], out=0, bowl_balls=0, bowl_runs=0, wkts=0, extras=0))
+        for p, b in state["bowler_stats"].items():
+            rows.append(dict(innings=0, team="", batter="", bowler=p, bat_runs=0, bat_balls=0, fours=0, sixes=0,
+                             out=0, bowl_balls=b["B"], bowl_runs=b["R"], wkts=b["W"], extras=0))
+    df = pd.DataFrame(rows, columns=BALL_COLS[2:])
+    df.insert(0, "season", season); df.insert(0, "mid", mid)
+    return df
+
+
+def load_ball_table(season=None):
+    if archive.HAVE_ARROW:
+        df = archive.scan("balls", season=season)
+        return df[BALL_COLS] if df is not None else pd.DataFrame(columns=BALL_COLS)
+    df = pd.read_pickle(BALL_TABLE) if os.path.exists(BALL_TABLE) else pd.DataFrame(columns=BALL_COLS)
+    return df if season is None else df[df["season"] == season]
+
+
+def table_version():
+    # Cache key for views built on the ball table
+    if archive.HAVE_ARROW: return archive.version()
+    try:
+        fs = os.stat(BALL_TABLE); return (fs.st_mtime_ns, fs.st_size)
+    except OSError:
+        return None
+
+
+def _rows_for(db, mid, meta):
+    events = db.read_events(mid)
+    return match_rows(mid, meta, events=events, state=None if events else db.load_state(mid, meta))
+
+
+def _save(table, new):
+    # One concat + one write for any number of new matches
+    mids = set().union(*(f["mid"].unique() for f in new))
+    if len(table): new = [table[~table["mid"].isin(mids)]] + new
+    table = pd.concat(new, ignore_index=True)
+    table.to_pickle(BALL_TABLE)
+    return table
+
+
+def add_match(db, mid, meta):
+    # Called when a match completes (or on demand): add or replace its rows
+    rows = _rows_for(db, mid, meta)
+    if archive.HAVE_ARROW: archive.export_match(db, mid, meta, balls=rows)
+    else: _save(load_ball_table(), [rows])
+
+
+def refresh(db, matches):
+    # Add completed matches that are not in the ball table yet; returns how many
+    if archive.HAVE_ARROW:
+        done = archive.archived_mids()
+    else:
+        table = load_ball_table()
+        done = set(table["mid"].unique()) if len(table) else set()
+    todo = [(mid, meta) for mid, meta in matches.items()
+            if mid not in done and db.load_state(mid, meta).get("status") == "COMPLETED"]
+    if archive.HAVE_ARROW:
+        for mid, meta in todo: add_match(db, mid, meta)
+    elif todo:
+        _save(table, [_rows_for(db, mid, meta) for mid, meta in todo])
+    return len(todo)
+
+
+def player_table(balls, by=("batter",)):
+    # Batting and bowling figures per player (optionally per season too)
+    keys = [k for k in by if k not in ("batter", "bowler")]
+    bat = (balls[balls["batter"] != ""].groupby(keys + ["batter"])
+           .agg(Matches=("mid", "nunique"), Runs=("bat_runs", "sum"), Balls=("bat_balls", "sum"),
+                Fours=("fours", "sum"), Sixes=("sixes", "sum"), Outs=("out", "sum"))
+           .rename_axis(keys + ["Player"]))
+    bowl = (balls[balls["bowler"] != ""].groupby(keys + ["bowler"])
+            .agg(Bowl_Matches=("mid", "nunique"), Bowl_Balls=("bowl_balls", "sum"),
+                 Conceded=("bowl_runs", "sum"), Wickets=("wkts", "sum"))
+            .rename_axis(keys + ["Player"]))
+    t = bat.join(bowl, how="outer").fillna(0)
+    t["Matches"] = t[["Matches", "Bowl_Matches"]].max(axis=1)
+    t = t.drop(columns="Bowl_Matches").astype(int)
+    t["SR"] = (t["Runs"] * 100 / t["Balls"].where(t["Balls"] > 0)).round(2)
+    t["Avg"] = (t["Runs"] / t["Outs"].where(t["Outs"] > 0)).round(2)
+    t["Overs"] = (t["Bowl_Balls"] // 6).astype(str) + "." + (t["Bowl_Balls"] % 6).astype(str)
+    t["Econ"] = (t["Conceded"] * 6 / t["Bowl_Balls"].where(t["Bowl_Balls"] > 0)).round(2)
+    cols = ["Matches", "Runs", "Balls", "SR", "Avg", "Fours", "Sixes", "Overs", "Conceded", "Wickets", "Econ"]
+    return t[cols].reset_index().sort_values(keys + ["Runs", "Wickets"], ascending=[True] * len(keys) + [False, False])
+
+
+def career_table(balls): return player_table(balls)
+
+def season_table(balls): return player_table(balls, by=("season", "batter"))
@@ -0,0 +1,731 @@
+# storage.py — match persistence for MPGB Cricket Club
+# - JSON files are written crash-safe: temp file in the same folder + fsync + os.replace,
+#   so a reader sees either the old or the new file, never a truncated one.
+# - Event-log matches (meta["storage"] == "eventlog") append each scoring action as one
+#   compact line to data/match_{mid}_events.jsonl; the state JSON is a snapshot of the
+#   folded log written every SNAPSHOT_EVERY balls and on non-ball actions. Loading rolls
+#   the snapshot forward with the log tail, and a missing or unreadable snapshot is
+#   rebuilt from the log alone.
+#   Cost: the append is the same for every ball, and the snapshot stays the same size
+#   too: the lists that grow with the match (commentary, balls_log, overs_index) keep
+#   only their newest items in the state, older ones go to fixed pages
+#   (match_{mid}_{kind}_{page}.json, see page_out) that are written once.
+# - Every CHECKPOINT_EVERY events a copy of the snapshot is also kept as a checkpoint
+#   (match_{mid}_ckpt_{seq}.json). Undo / edit-ball ("amend" events, see scoring.py)
+#   re-fold from the newest checkpoint before the corrected ball, not from the start,
+#   and drop the checkpoints the correction made wrong.
+#
+# - store() returns the active backend: FileStore (the files above, default) or the
+#   SQLite backend in storage_sqlite.py when MPGB_STORAGE=sqlite. APP.py talks only
+#   to store(), so pages don't care where matches and members live.
+# - state_cache() is a process-wide LRU of match states for read-only viewers.
+# - MPGB_WRITE_BEHIND=1 acknowledges a ball once its log line is fsynced and leaves the
+#   snapshot to a background SnapshotWriter.
+#
+# Regression tests:  python -m pytest tests   (crash safety: tests/test_storage.py)
+# Fault injection:  python storage.py --crash-test 100
+# fsync cost:       python storage.py --bench 300
+# Public View poll:  python storage.py --bench-poll 300
+# Write-behind ack:  python storage.py --bench-ack 300
+# Undo / edit cost:  python storage.py --bench-edit
+
+import atexit, copy, csv, glob, json, os, statistics, sys, tempfile, threading, time
+from collections import OrderedDict
+from datetime import datetime
+import metrics
+from registry import REG_COLS, register_member, register_many, registry_lock
+from scoring import amend_floor, ensure_state_defaults, fold_amended, fold_event, paged_lists, read_events, same_state
+
+DATA_DIR = "data"
+MATCH_INDEX = os.path.join(DATA_DIR, "matches.json")
+ACTIVE_INDEX = os.path.join(DATA_DIR, "matches_active.json")  # not-yet-completed matches only
+REG_MEMBERS = os.path.join(DATA_DIR, "Registered_Members.csv")
+FSYNC = os.environ.get("MPGB_FSYNC", "1") != "0"
+SNAPSHOT_EVERY = 12
+CHECKPOINT_EVERY = 36   # events between kept checkpoints (every third snapshot)
+WRITE_BEHIND = os.environ.get("MPGB_WRITE_BEHIND", "0") == "1"  # snapshots written by a background thread
+FLUSH_SECS = 0.5
+# Lists that grow with the match are kept short in the state and moved out in whole
+# pages (see page_out): kind -> (newest items kept, items per page)
+PAGING = {"commentary": (60, 100), "balls": (30, 60), "overs": (2, 10)}
+
+
+@metrics.timed("load_json")
+def load_json(path, default):
+    if not os.path.exists(path): return default
+    try:
+        with open(path, "r", encoding="utf-8") as f: return json.load(f)
+    except: return default
+
+
+def _fsync_dir(d):
+    # Make the rename itself durable (POSIX only)
+    try:
+        fd = os.open(d, os.O_RDONLY)
+    except (OSError, AttributeError):
+        return
+    try: os.fsync(fd)
+    except OSError: pass
+    finally: os.close(fd)
+
+
+@metrics.timed("save_json")
+def save_json(path, obj, compact=False):
+    # compact: one line via the C encoder (several times faster on big states)
+    d = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=d)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            if compact: f.write(json.dumps(obj, ensure_ascii=False, separators=(",", ":")))
+            else: json.dump(obj, f, indent=2, ensure_ascii=False)
+            f.flush()
+            if FSYNC: os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+    if FSYNC: _fsync_dir(d)
+
+
+def _file_sig(path):
+    try:
+        fs = os.stat(path); return (fs.st_size, fs.st_mtime_ns)
+    except OSError:
+        return None
+
+
+def match_state_path(mid): return os.path.join(DATA_DIR, f"match_{mid}_state.json")
+
+def match_log_path(mid): return os.path.join(DATA_DIR, f"match_{mid}_events.jsonl")
+
+def page_path(mid, kind, page): return os.path.join(DATA_DIR, f"match_{mid}_{kind.replace(' ', '')}_{page:04d}.json")
+
+def checkpoint_path(mid, seq): return os.path.join(DATA_DIR, f"match_{mid}_ckpt_{seq:06d}.json")
+
+def match_lock_path(mid): return os.path.join(DATA_DIR, f"match_{mid}")  # registry_lock adds ".lock"
+
+def now_ts(): return datetime.now().strftime('%H:%M:%S')
+
+
+def page_size(kind): return PAGING[kind.split("-")[0]][1]
+
+
+def page_out(s, write_page):
+    # Move whole pages of old commentary, balls_log and overs_index out of the state
+    # before it is snapshotted, so a snapshot stays the same size however long the
+    # match runs. Page k of a list always holds items [k*PAGE, (k+1)*PAGE), so
+    # rewriting one (after an amend rebuilt the state from a checkpoint) is harmless.
+    if not s: return
+    for kind, (items, paged) in paged_lists(s).items():
+        keep, size = PAGING[kind.split("-")[0]]
+        if len(items) < keep + size: continue
+        while len(items) >= keep + size:
+            write_page(kind, paged // size, items[:size])
+            del items[:size]; paged += size
+        if kind == "commentary": s["commentary_paged"] = paged
+        elif kind == "balls": s["balls_paged"] = paged
+        else: s.setdefault("overs_paged", {})[kind[6:]] = paged
+
+
+def history(db, mid, s, kind, start=0):
+    # Items [start:] of a paged list: the pages it needs from `db`, then the state's own
+    items, paged = paged_lists(s).get(kind, ([], 0))
+    size = page_size(kind); first = min(start, paged) // size
+    out = [x for page in range(first, paged // size) for x in db.list_page(mid, kind, page)]
+    return out[start - first * size:] + items[max(start - paged, 0):]
+
+
+def write_pages(mid, s):
+    page_out(s, lambda kind, page, items: save_json(page_path(mid, kind, page), items, compact=True))
+
+
+def save_snapshot(mid, s):
+    write_pages(mid, s)
+    save_json(match_state_path(mid), s, compact=True)
+    if s.get("_log_pos") and s.get("_seq", 0) % CHECKPOINT_EVERY == 0: save_checkpoint(mid, s)
+
+
+def save_checkpoint(mid, s): save_json(checkpoint_path(mid, s["_seq"]), s, compact=True)
+
+
+def checkpoints(mid):
+    # Sequence numbers of the stored checkpoints, oldest first
+    paths = glob.glob(os.path.join(DATA_DIR, f"match_{glob.escape(mid)}_ckpt_*.json"))
+    return sorted(int(p[-11:-5]) for p in paths)
+
+
+def _rebuild(mid, meta, end, first):
+    # State at log offset `end` after a correction of events >= `first`: the newest
+    # checkpoint before `first` with only the log after it re-folded
+    for seq in [q for q in checkpoints(mid) if q < first][::-1] + [0]:
+        base = load_json(checkpoint_path(mid, seq), None) if seq else {}
+        if base is None: continue
+        events = []
+        with open(match_log_path(mid), "rb") as f:
+            f.seek(base.get("_log_pos", 0))
+            while f.tell() < end: events.append((seq + len(events) + 1, json.loads(f.readline())))
+        # A checkpoint an amend after it has touched is stale (a crash kept it): go older
+        if all(amend_floor(ev) > seq for _, ev in events if ev["t"] == "amend"): break
+    s = fold_amended(base, events)
+    ensure_state_defaults(s, meta); s["_log_pos"] = end
+    return s
+
+
+@metrics.timed("append_event")
+def append_event(mid, ev):
+    line = (json.dumps(ev, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+    with open(match_log_path(mid), "a+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                # A crash tore the previous append: drop the partial line before writing
+                f.seek(0); data = f.read()
+                f.truncate(data.rfind(b"\n") + 1)
+        f.write(line)
+        f.flush()
+        if FSYNC: os.fsync(f.fileno())
+        return f.tell()
+
+
+def load_match_state(mid, meta):
+    s = load_json(match_state_path(mid), {})
+    if meta.get("storage") != "eventlog" or not os.path.exists(match_log_path(mid)):
+        return s
+    if s.get("_log_pos", 0) > os.path.getsize(match_log_path(mid)):
+        s = {}  # snapshot is ahead of the log: trust the log
+    # Fold the events written after the snapshot
+    with open(match_log_path(mid), "rb") as f:
+        f.seek(s.get("_log_pos", 0))
+        while True:
+            line = f.readline()
+            if not line.endswith(b"\n"): break  # EOF or a torn last line
+            try: ev = json.loads(line)
+            except ValueError: break
+            ensure_state_defaults(s, meta)
+            if ev["t"] == "amend": s = _rebuild(mid, meta, f.tell(), amend_floor(ev))
+            else: fold_event(s, ev); s["_seq"] = s.get("_seq", 0) + 1
+            s["_log_pos"] = f.tell()
+    return s
+
+
+class StaleState(Exception):
+    # record_event(expect=...) found that another scorer wrote since this one loaded
+    pass
+
+
+def _is_current(mid, meta, s):
+    # Does `s` already include everything stored for the match?
+    if meta.get("storage") == "eventlog":
+        try: return os.path.getsize(match_log_path(mid)) == s.get("_log_pos", 0)
+        except OSError: return not s
+    return load_json(match_state_path(mid), {}).get("_seq", 0) == s.get("_seq", 0)
+
+
+def record_event(mid, meta, s, ev, expect=None):
+    # Applies `ev` to `s` and persists it, under the match lock. If another scorer wrote
+    # first, `s` is refreshed from storage; then an event whose "id" is already recorded
+    # is dropped (returns False), `expect` (the _seq the scorer saw) out of date raises
+    # StaleState, and anything else is applied on top of the latest state. Pages pass
+    # `expect` for balls and for control events (players, end_over, end_innings) alike.
+    # An "amend" (undo / edit) re-folds from the nearest checkpoint instead.
+    ev.setdefault("ts", now_ts())
+    with registry_lock(match_lock_path(mid)):
+        if not _is_current(mid, meta, s):
+            latest = load_match_state(mid, meta); s.clear(); s.update(latest)
+            if s: ensure_state_defaults(s, meta)
+        if ev.get("id") and ev["id"] in s.get("_ids", ()): return False
+        if expect is not None and s.get("_seq", 0) != expect: raise StaleState(s.get("_seq", 0))
+        if ev["t"] == "amend": _amend(mid, meta, s, ev); return True
+        with metrics.span("fold_event"): fold_event(s, ev)
+        if meta.get("storage") != "eventlog":
+            s["_seq"] = s.get("_seq", 0) + 1
+            save_snapshot(mid, s); return True
+        s["_log_pos"] = append_event(mid, ev)
+        s["_seq"] = s.get("_seq", 0) + 1
+        if ev["t"] != "ball" or s["_seq"] % SNAPSHOT_EVERY == 0:
+            if WRITE_BEHIND:
+                # Pages go now (once per ~60 balls), so the copy stays small and no page
+                # is lost when the writer coalesces this snapshot away
+                write_pages(mid, s)
+                snapshot_writer().submit(mid, copy.deepcopy(s), save_snapshot)
+            else: save_snapshot(mid, s)
+    return True
+
+
+def _amend(mid, meta, s, ev):
+    # Caller holds the match lock. Stale checkpoints go before the amend is logged, so a
+    # crash in between only costs a longer rebuild.
+    if meta.get("storage") != "eventlog": raise ValueError("corrections need an event-log match")
+    first = amend_floor(ev)
+    if not 1 < first <= s.get("_seq", 0): raise ValueError(f"no event {first} to correct")
+    for q in checkpoints(mid):
+        if q >= first: os.remove(checkpoint_path(mid, q))
+    pos = append_event(mid, ev)
+    with metrics.span("amend"): latest = _rebuild(mid, meta, pos, first)
+    s.clear(); s.update(latest)
+    if _WRITER: _WRITER.discard(mid)
+    save_snapshot(mid, s)
+    save_checkpoint(mid, s)  # the next correction starts here at the latest
+
+
+# -------------------- Backends --------------------
+def match_filter(mid, meta, q="", status=None, venue="", player="", date_from=None, date_to=None):
+    # Catalog filters; status is "live" / "completed", dates are datetime.date
+    low = lambda x: str(x or "").lower()
+    if q and low(q) not in low(meta.get("title")): return False
+    if status == "live" and meta.get("status") == "COMPLETED": return False
+    if status == "completed" and meta.get("status") != "COMPLETED": return False
+    if venue and low(venue) not in low(meta.get("venue")): return False
+    if player and not any(low(player) in low(p) for p in meta.get("teamA", []) + meta.get("teamB", [])): return False
+    day = (meta.get("created_at") or f"{mid[:4]}-{mid[4:6]}-{mid[6:8]}")[:10]  # mids start YYYYMMDD
+    if date_from and day < date_from.isoformat(): return False
+    if date_to and day > date_to.isoformat(): return False
+    return True
+
+
+class FileStore:
+    # matches.json + matches_active.json + per-match snapshot/log files + Registered_Members.csv
+    name = "files"
+
+    def __init__(self):
+        self._index = (None, {})  # (file sig, parsed matches.json)
+        self._sorted = (None, [])  # (file sig, matches.json newest first)
+        self._found = (None, [])  # (file sig + filters, last list_matches result)
+
+    def load_matches(self):
+        sig = _file_sig(MATCH_INDEX)
+        if sig != self._index[0]: self._index = (sig, load_json(MATCH_INDEX, {}))
+        return dict(self._index[1])
+
+    # Index writes are read-modify-write of two files: one lock for both, so two
+    # sessions creating or finishing matches at once don't drop each other's entry
+    def save_match(self, mid, meta):
+        meta.setdefault("status", "INNINGS1")
+        self.active_matches()
+        with registry_lock(MATCH_INDEX):
+            matches = self.load_matches(); matches[mid] = meta
+            save_json(MATCH_INDEX, matches)
+            if meta["status"] != "COMPLETED":
+                active = load_json(ACTIVE_INDEX, {}); active[mid] = meta
+                save_json(ACTIVE_INDEX, active)
+
+    def set_status(self, mid, status):
+        self.active_matches()
+        with registry_lock(MATCH_INDEX):
+            matches = self.load_matches()
+            if mid not in matches or matches[mid].get("status") == status: return
+            matches[mid] = dict(matches[mid], status=status)
+            save_json(MATCH_INDEX, matches)
+            active = load_json(ACTIVE_INDEX, {})
+            if status == "COMPLETED": active.pop(mid, None)
+            else: active[mid] = matches[mid]
+            save_json(ACTIVE_INDEX, active)
+
+    def active_matches(self):
+        # Small index the live pages read instead of the full history
+        if not os.path.exists(ACTIVE_INDEX):
+            with registry_lock(MATCH_INDEX):
+                if not os.path.exists(ACTIVE_INDEX):
+                    # One-off for data folders from before the active index: record each status
+                    matches = self.load_matches()
+                    for mid, meta in matches.items():
+                        if "status" not in meta:
+                            matches[mid] = dict(meta, status=self.load_state(mid, meta).get("status", "INNINGS1"))
+                    save_json(MATCH_INDEX, matches)
+                    save_json(ACTIVE_INDEX, {m: v for m, v in matches.items() if v["status"] != "COMPLETED"})
+        return load_json(ACTIVE_INDEX, {})
+
+    def list_matches(self, offset=0, limit=20, **filters):
+        # Newest first; returns (page of (mid, meta), total matching). The sorted index
+        # and the last filtered list are kept until matches.json changes, so paging
+        # through one search doesn't re-sort or re-filter.
+        self.active_matches()
+        sig = _file_sig(MATCH_INDEX)
+        if sig != self._sorted[0]:
+            self._sorted = (sig, sorted(self.load_matches().items(),
+                                        key=lambda r: (r[1].get("created_at") or "", r[0]), reverse=True))
+        key = (sig, tuple(sorted(filters.items())))
+        if key != self._found[0]:
+            self._found = (key, [r for r in self._sorted[1] if match_filter(*r, **filters)])
+        rows = self._found[1]
+        return rows[offset:offset + limit], len(rows)
+
+    def delete_match(self, mid):
+        if _WRITER: _WRITER.discard(mid)
+        pages = glob.glob(os.path.join(DATA_DIR, f"match_{glob.escape(mid)}_*_[0-9][0-9][0-9][0-9].json"))
+        pages += [checkpoint_path(mid, q) for q in checkpoints(mid)]
+        for path in [match_state_path(mid), match_log_path(mid), match_lock_path(mid) + ".lock"] + pages:
+            try: os.remove(path)
+            except OSError: pass
+        with registry_lock(MATCH_INDEX):
+            matches = self.load_matches()
+            if matches.pop(mid, None) is not None: save_json(MATCH_INDEX, matches)
+            active = load_json(ACTIVE_INDEX, {})
+            if active.pop(mid, None) is not None: save_json(ACTIVE_INDEX, active)
+
+    def load_state(self, mid, meta): return load_match_state(mid, meta)
+
+    def match_version(self, mid):
+        # Change token for pollers: two stat() calls, no parsing
+        return tuple(_file_sig(p) for p in (match_log_path(mid), match_state_path(mid)))
+
+    def load_snapshot(self, mid): return load_json(match_state_path(mid), {})
+
+    def list_page(self, mid, kind, page): return load_json(page_path(mid, kind, page), [])
+
+    def read_events(self, mid):
+        return read_events(match_log_path(mid)) if os.path.exists(match_log_path(mid)) else []
+
+    def record_event(self, mid, meta, s, ev, expect=None):
+        done = record_event(mid, meta, s, ev, expect)
+        if done and ev["t"] in ("end_innings", "amend"): self.set_status(mid, s["status"])
+        return done
+
+    def read_members(self):
+        if not os.path.exists(REG_MEMBERS): return []
+        with open(REG_MEMBERS, "r", encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+
+    def write_members(self, rows):
+        with registry_lock(REG_MEMBERS):
+            d = os.path.dirname(REG_MEMBERS) or "."
+            fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=d)
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                w = csv.DictWriter(f, fieldnames=REG_COLS, extrasaction="ignore")
+                w.writeheader(); w.writerows(rows)
+            os.replace(tmp, REG_MEMBERS)
+            # Never hand out a number that is already in the file
+            with open(REG_MEMBERS + ".seq", "a+", encoding="utf-8") as f:
+                f.seek(0); last = int(f.read().strip() or 0)
+                f.seek(0); f.truncate(); f.write(str(max(last, len(rows))))
+
+    def register_member(self, name, mobile, branch, role):
+        return register_member(REG_MEMBERS, name, mobile, branch, role)
+
+    def register_many(self, rows):
+        return register_many(REG_MEMBERS, rows)
+
+
+class StateCache:
+    # Process-wide read-through cache of match states for read-only pages. Every
+    # Streamlit session in this process shares it, so N viewers of one match cost one
+    # load per ball instead of N. Entries are checked against store.match_version()
+    # on each get, so any scorer write (from any process) invalidates them; at most
+    # `maxsize` matches are kept, least recently used evicted first. Returned states
+    # are shared — callers must not mutate them.
+
+    def __init__(self, backend, maxsize=16):
+        self.backend, self.maxsize = backend, maxsize
+        self._entries = OrderedDict()  # mid -> (version, state)
+        self._lock = threading.Lock()
+        self._loading = {}  # mid -> Lock, so concurrent misses load once
+        self.hits = self.misses = 0
+
+    def get(self, mid, meta):
+        ver = self.backend.match_version(mid)
+        with self._lock:
+            hit = self._entries.get(mid)
+            if hit and hit[0] == ver:
+                self._entries.move_to_end(mid); self.hits += 1
+                return hit[1]
+            load_lock = self._loading.setdefault(mid, threading.Lock())
+        with load_lock:
+            with self._lock:  # another session may have loaded it meanwhile
+                hit = self._entries.get(mid)
+                if hit and hit[0] == ver:
+                    self.hits += 1; return hit[1]
+            s = self.backend.load_state(mid, meta)
+            if s: ensure_state_defaults(s, meta)
+            with self._lock:
+                self.misses += 1
+                self._entries[mid] = (ver, s); self._entries.move_to_end(mid)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            return s
+
+    def invalidate(self, mid=None):
+        with self._lock:
+            if mid is None: self._entries.clear()
+            else: self._entries.pop(mid, None)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                    "hit_rate": round(self.hits / total, 3) if total else 0.0}
+
+
+class SnapshotWriter:
+    # Write-behind for snapshots (MPGB_WRITE_BEHIND=1). record_event returns as soon as
+    # the event is in the fsynced log and hands over a copy of the state; this thread
+    # writes only the newest pending snapshot per match, at most every FLUSH_SECS. The
+    # log stays the source of truth, so a crash before a flush just means a longer
+    # roll-forward on the next load. Pending snapshots are flushed at exit. A coalesced
+    # snapshot that was due a checkpoint (_seq a multiple of CHECKPOINT_EVERY) is still
+    # written first, so write-behind never loses checkpoints. Failed writes are counted
+    # (self.failed, metric "snapshot_write_failed").
+    def __init__(self, interval=FLUSH_SECS):
+        self.interval = interval
+        self._pending = {}  # mid -> (state copy, write(mid, state), checkpoint states it replaced)
+        self._cv = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self.written = self.coalesced = self.failed = 0
+
+    def submit(self, mid, s, write):
+        with self._cv:
+            ckpts = []
+            if mid in self._pending:
+                self.coalesced += 1
+                prev, _, ckpts = self._pending[mid]
+                if prev.get("_seq", 0) % CHECKPOINT_EVERY == 0: ckpts = ckpts + [prev]
+            self._pending[mid] = (s, write, ckpts)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            self._cv.notify()
+
+    def _run(self):
+        while True:
+            with self._cv:
+                while not self._pending: self._cv.wait()
+            time.sleep(self.interval)  # let a burst of balls collapse into one write
+            self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._cv: batch, self._pending = self._pending, {}
+            for mid, (s, write, ckpts) in batch.items():
+                for state in ckpts + [s]:
+                    try:
+                        write(mid, state); self.written += 1
+                    except Exception:  # keep the thread alive; the log still has every event
+                        self.failed += 1; metrics.incr("snapshot_write_failed")
+
+    def discard(self, mid):
+        with self._cv: self._pending.pop(mid, None)
+
+    def pending(self):
+        with self._cv: return len(self._pending)
+
+
+_STORE = None
+_STATE_CACHE = None
+_WRITER = None
+
+
+def snapshot_writer():
+    global _WRITER
+    if _WRITER is None: _WRITER = SnapshotWriter()
+    return _WRITER
+
+def store():
+    global _STORE
+    if _STORE is None:
+        if os.environ.get("MPGB_STORAGE", "files") == "sqlite":
+            from storage_sqlite import SqliteStore
+            _STORE = SqliteStore(os.path.join(DATA_DIR, "mpgb.sqlite3"))
+        else:
+            _STORE = FileStore()
+    return _STORE
+
+
+def state_cache():
+    global _STATE_CACHE
+    if _STATE_CACHE is None: _STATE_CACHE = StateCache(store())
+    return _STATE_CACHE
+
+
+# -------------------- Fault injection / benchmark --------------------
+_TEAMS = {"Team A": [f"A{i}" for i in range(11)], "Team B": [f"B{i}" for i in range(11)]}
+_OUTCOMES = ["0", "1", "0", "2", "4", "1", "6", "Wide", "0", "1", "Wicket", "Bye"]
+
+
+def _scorer(mid, meta, n, acked, index_path=None, overs=50, outcomes=_OUTCOMES, timings=None):
+    # Scores one match event by event; `acked` = events confirmed written,
+    # `timings` collects (event type, seconds in record_event)
+    s = {}
+    record_event(mid, meta, s, {"t": "start", "overs": overs, "bat_team": "Team A", "teams": _TEAMS})
+    if acked is not None: acked.value = 1
+    i = 0
+    while n is None or i < n:
+        if s["status"] == "COMPLETED": break
+        bowl = _TEAMS[s["bowl_team"]]
+        if s["score"][s["bat_team"]]["balls"] >= s["overs_limit"] * 6 or s["score"][s["bat_team"]]["wkts"] >= 10:
+            ev = {"t": "end_innings"}
+        elif not s["over_in_progress"]:
+            bat = s["batting"]; order = s["teams"][s["bat_team"]]
+            bowlers = [p for p in bowl[5:] if p != s["bowling"]["last_over_bowler"]]
+            ev = {"t": "players", "striker": bat["striker"] or order[0], "non_striker": bat["non_striker"] or order[1],
+                  "bowler": bowlers[i % len(bowlers)]}
+        else:
+            ev = {"t": "ball", "outcome": outcomes[i % len(outcomes)], "runs": 1}
+        ev["ts"] = f"{i:08d}"
+        t0 = time.perf_counter()
+        record_event(mid, meta, s, ev)
+        if timings is not None: timings.append((ev["t"], time.perf_counter() - t0))
+        if index_path:
+            save_json(index_path, {f"m{k}": {"title": f"Match {k}"} for k in range(i + 1)})
+        if acked is not None: acked.value = s["_seq"]
+        i += 1
+    return s
+
+
+def crash_test(rounds=100, seed=1):
+    import multiprocessing as mp, random, signal
+    from scoring import replay
+    global DATA_DIR
+    rnd = random.Random(seed)
+    DATA_DIR = tempfile.mkdtemp()
+    meta = {"storage": "eventlog", "overs": 50}
+    index_path = os.path.join(DATA_DIR, "matches.json")
+    ctx = mp.get_context("fork")
+    failures = 0
+    for r in range(rounds):
+        mid = f"crash{r}"
+        acked = ctx.Value("i", 0)
+        p = ctx.Process(target=_scorer, args=(mid, meta, None, acked, index_path))
+        p.start()
+        time.sleep(rnd.uniform(0.005, 0.08))
+        os.kill(p.pid, signal.SIGKILL); p.join()
+        s = load_match_state(mid, meta)
+        idx = load_json(index_path, None)
+        good = (bool(s) and s.get("_seq", 0) >= acked.value
+                and same_state(s, replay(read_events(match_log_path(mid))))
+                and isinstance(idx, dict))
+        # Keep scoring after the crash: the log must stay appendable
+        if good:
+            record_event(mid, meta, s, {"t": "end_over"})
+            good = same_state(load_match_state(mid, meta), s)
+        failures += not good
+    print(f"crash test: {rounds} SIGKILLs mid-match, {failures} lost/corrupt matches")
+    return failures == 0
+
+
+def bench(balls=300):
+    global DATA_DIR, FSYNC
+    meta = {"storage": "eventlog", "overs": 50}
+    for fsync in (False, True):
+        FSYNC = fsync
+        for label, m in (("event log", meta), ("full JSON", {"overs": 50})):
+            DATA_DIR = tempfile.mkdtemp()
+            t0 = time.perf_counter()
+            _scorer("bench", m, balls, None)
+            dt = (time.perf_counter() - t0) / balls * 1000
+            print(f"{label:9} fsync={'on ' if fsync else 'off'}: {dt:.3f} ms/event over {balls} events")
+
+
+def poll_bench(viewers=300, balls=40, polls_per_ball=8):
+    # A ball every ~40s with viewers ticking every 5s: each viewer polls
+    # `polls_per_ball` times per ball. Compares reloading the full state on every
+    # poll with checking match_version and reloading only when it changed.
+    global DATA_DIR
+    DATA_DIR = tempfile.mkdtemp()
+    meta = {"storage": "eventlog", "overs": 50}
+    fs = FileStore()
+    s = _scorer("poll", meta, 300, None)  # a match well under way
+    full = token = 0.0
+    seen = {}
+    for b in range(balls):
+        for _ in range(polls_per_ball):
+            t0 = time.perf_counter()
+            for v in range(viewers): fs.load_state("poll", meta)
+            full += time.perf_counter() - t0
+            t0 = time.perf_counter()
+            for v in range(viewers):
+                ver = fs.match_version("poll")
+                if seen.get(v) != ver:
+                    fs.load_state("poll", meta); seen[v] = ver
+            token += time.perf_counter() - t0
+        record_event("poll", meta, s, {"t": "ball", "outcome": "1", "runs": 0})
+    polls = balls * polls_per_ball * viewers
+    for label, dt in (("full reload", full), ("version poll", token)):
+        print(f"{label:12}: {viewers} viewers x {polls_per_ball} polls/ball -> "
+              f"{dt / balls * 1000:.0f} ms server time per ball, {dt / polls * 1e6:.0f} us per poll")
+
+
+def ack_bench(balls=300):
+    # Scorer-visible latency of record_event with fsync on: synchronous snapshots vs
+    # write-behind (log fsync only; snapshots flushed by the background thread)
+    from scoring import replay
+    global DATA_DIR, FSYNC, WRITE_BEHIND
+    FSYNC = True
+    meta = {"storage": "eventlog"}
+    for wb in (False, True):
+        WRITE_BEHIND = wb
+        DATA_DIR = tempfile.mkdtemp()
+        timings = []
+        _scorer("ack", meta, balls, None, timings=timings)
+        t0 = time.perf_counter(); snapshot_writer().flush(); flush = time.perf_counter() - t0
+        ack = sorted(dt for _, dt in timings)
+        p = lambda q: ack[min(int(q * len(ack)), len(ack) - 1)] * 1000
+        print(f"{'write-behind' if wb else 'synchronous':12}: ack p50 {p(.5):.2f} ms, p95 {p(.95):.2f} ms, "
+              f"max {ack[-1] * 1000:.2f} ms over {len(ack)} events"
+              + (f" ({_WRITER.written} snapshot writes, {_WRITER.coalesced} coalesced, final flush "
+                 f"{flush * 1000:.1f} ms)" if wb else ""))
+        ok = same_state(load_match_state("ack", meta), replay(read_events(match_log_path("ack"))))
+        if not ok: print("  reloaded state differs from replay!")
+
+
+def edit_bench(overs=50, reps=5):
+    # Undo / edit-ball near the end of a full 50-over match vs re-folding its whole log.
+    # "rebuild" is the re-fold alone; "total" adds the snapshot + checkpoint writes.
+    from scoring import ball_list, replay, undo_edits
+    global DATA_DIR, FSYNC
+    FSYNC = False
+    DATA_DIR = tempfile.mkdtemp()
+    meta = {"storage": "eventlog"}
+    outcomes = (_OUTCOMES[:10] + ["1", "Bye"]) * 3 + ["Wicket"]  # a wicket every 37 balls: full innings
+    s = _scorer("edit", meta, None, None, overs=overs, outcomes=outcomes)
+    log = match_log_path("edit")
+    t0 = time.perf_counter()
+    for _ in range(reps): replay(read_events(log))
+    full = (time.perf_counter() - t0) / reps
+    print(f"{len(read_events(log))} events; full re-fold {full * 1e3:.1f} ms")
+    was = metrics.enabled(); metrics.enable()
+    out = {"full": full}
+
+    def timed_amend(label, edits):
+        metrics.reset(); t0 = time.perf_counter()
+        record_event("edit", meta, s, {"t": "amend", "edits": edits, "note": label})
+        return time.perf_counter() - t0, metrics.snapshot()["spans"]["amend"]["total_ms"] / 1e3
+
+    try:
+        for back in (1, 6, 36, 120):
+            runs = []
+            for _ in range(reps):
+                seq, _, label, ev = ball_list(read_events(log))[-back]
+                edit = dict(ev, outcome="0" if ev["outcome"] != "0" else "1", runs=0)
+                runs.append(timed_amend(f"edit {label}", {str(seq): edit}))
+            out[back] = tuple(statistics.median(r) for r in zip(*runs))
+            print(f"edit ball {back:3} from the end: total {out[back][0] * 1e3:5.2f} ms, "
+                  f"rebuild {out[back][1] * 1e3:5.2f} ms")
+        runs = [timed_amend("undo", undo_edits(read_events(log))) for _ in range(reps)]
+        out["undo"] = tuple(statistics.median(r) for r in zip(*runs))
+        print(f"undo last ball:           total {out['undo'][0] * 1e3:5.2f} ms, rebuild {out['undo'][1] * 1e3:5.2f} ms")
+    finally:
+        metrics.enable(was)
+    ok = same_state(load_match_state("edit", meta), replay(read_events(log)))
+    print(f"reloaded state matches a full replay: {ok}")
+    return out
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Storage fault injection and fsync benchmark")
+    ap.add_argument("--crash-test", type=int, metavar="ROUNDS")
+    ap.add_argument("--bench", type=int, metavar="EVENTS")
+    ap.add_argument("--bench-poll", type=int, metavar="VIEWERS")
+    ap.add_argument("--bench-ack", type=int, metavar="EVENTS")
+    ap.add_argument("--bench-edit", action="store_true")
+    a = ap.parse_args()
+    ok = True
+    if a.crash_test: ok = crash_test(a.crash_test)
+    if a.bench: bench(a.bench)
+    if a.bench_poll: poll_bench(a.bench_poll)
+    if a.bench_ack: ack_bench(a.bench_ack)
+    if a.bench_edit: edit_bench()
+    sys.exit(0 if ok else 1)
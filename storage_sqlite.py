@@ -0,0 +1,314 @@
+# storage_sqlite.py — SQLite (WAL mode) backend for MPGB Cricket Club
+# Same interface as storage.FileStore; enabled with MPGB_STORAGE=sqlite.
+# - matches: one row per match (meta JSON + indexed created_at/status)
+# - balls:   every scoring event, keyed (mid, seq) — a ball is a single INSERT
+# - states:  folded snapshot per match, refreshed every SNAPSHOT_EVERY balls
+# - checkpoints: a copy of the snapshot every CHECKPOINT_EVERY events, for undo / edit
+# - players: (mid, team, name), indexed by name for stats lookups
+# - commentary_pages: archived commentary, one row per page
+# - pages: the other lists paged out of states (balls_log, overs_index), one row per page
+# - members: registry; Reg_No numbers come from MAX(n)+1 inside one write transaction
+#
+# Import the existing JSON/CSV files:  python storage_sqlite.py --migrate [--data data]
+
+import copy, csv, json, os, re, sqlite3, sys, threading
+from contextlib import contextmanager
+from datetime import timedelta
+import metrics, storage
+from registry import REG_COLS, make_reg_no
+from scoring import amend_floor, ensure_state_defaults, fold_amended, fold_event, paged_lists, read_events, replay
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    mid TEXT PRIMARY KEY, title TEXT, venue TEXT, overs INTEGER,
+    created_at TEXT, status TEXT, meta TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS matches_created ON matches(created_at);
+CREATE INDEX IF NOT EXISTS matches_status ON matches(status);
+CREATE TABLE IF NOT EXISTS states (
+    mid TEXT PRIMARY KEY, seq INTEGER NOT NULL, state TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS balls (
+    mid TEXT NOT NULL, seq INTEGER NOT NULL, kind TEXT NOT NULL, event TEXT NOT NULL,
+    PRIMARY KEY (mid, seq)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS checkpoints (
+    mid TEXT NOT NULL, seq INTEGER NOT NULL, state TEXT NOT NULL,
+    PRIMARY KEY (mid, seq)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS players (
+    mid TEXT NOT NULL, team TEXT NOT NULL, name TEXT NOT NULL,
+    PRIMARY KEY (mid, team, name)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS players_name ON players(name);
+CREATE TABLE IF NOT EXISTS commentary_pages (
+    mid TEXT NOT NULL, page INTEGER NOT NULL, lines TEXT NOT NULL,
+    PRIMARY KEY (mid, page)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pages (
+    mid TEXT NOT NULL, kind TEXT NOT NULL, page INTEGER NOT NULL, items TEXT NOT NULL,
+    PRIMARY KEY (mid, kind, page)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS members (
+    n INTEGER PRIMARY KEY, reg_no TEXT UNIQUE NOT NULL,
+    name TEXT, mobile TEXT, branch TEXT, role TEXT);
+CREATE INDEX IF NOT EXISTS members_mobile ON members(mobile);
+"""
+
+_dumps = lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+class SqliteStore:
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()  # one connection per Streamlit session thread
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            c = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute(f"PRAGMA synchronous={'FULL' if storage.FSYNC else 'NORMAL'}")
+            self._local.conn = c
+        return c
+
+    @contextmanager
+    def _tx(self):
+        c = self._conn()
+        c.execute("BEGIN IMMEDIATE")
+        try: yield c
+        except BaseException:
+            c.execute("ROLLBACK"); raise
+        else: c.execute("COMMIT")
+
+    # ---------- matches ----------
+    def load_matches(self):
+        rows = self._conn().execute("SELECT mid, meta FROM matches ORDER BY created_at, mid")
+        return {mid: json.loads(meta) for mid, meta in rows}
+
+    def _put_match(self, c, mid, meta):
+        c.execute("INSERT OR REPLACE INTO matches (mid, title, venue, overs, created_at, status, meta) "
+                  "VALUES (?, ?, ?, ?, ?, COALESCE((SELECT status FROM matches WHERE mid=?), 'INNINGS1'), ?)",
+                  (mid, meta.get("title", ""), meta.get("venue", ""), int(meta.get("overs", 20)),
+                   meta.get("created_at", ""), mid, _dumps(meta)))
+        c.execute("DELETE FROM players WHERE mid=?", (mid,))
+        c.executemany("INSERT OR IGNORE INTO players (mid, team, name) VALUES (?, ?, ?)",
+                      [(mid, team, p) for team, key in (("Team A", "teamA"), ("Team B", "teamB"))
+                       for p in meta.get(key, [])])
+
+    def active_matches(self):
+        rows = self._conn().execute("SELECT mid, meta, status FROM matches WHERE status != 'COMPLETED' "
+                                    "ORDER BY created_at, mid")
+        return {mid: dict(json.loads(meta), status=st) for mid, meta, st in rows}
+
+    def list_matches(self, offset=0, limit=20, q="", status=None, venue="", player="", date_from=None, date_to=None):
+        # Newest first; returns (page of (mid, meta), total matching)
+        where, args = [], []
+        if q: where.append("title LIKE ?"); args.append(f"%{q}%")
+        if status == "live": where.append("status != 'COMPLETED'")
+        if status == "completed": where.append("status = 'COMPLETED'")
+        if venue: where.append("venue LIKE ?"); args.append(f"%{venue}%")
+        if player: where.append("mid IN (SELECT mid FROM players WHERE name LIKE ?)"); args.append(f"%{player}%")
+        if date_from: where.append("created_at >= ?"); args.append(date_from.isoformat())
+        if date_to: where.append("created_at < ?"); args.append((date_to + timedelta(days=1)).isoformat())
+        sql = (" WHERE " + " AND ".join(where)) if where else ""
+        c = self._conn()
+        total = c.execute(f"SELECT COUNT(*) FROM matches{sql}", args).fetchone()[0]
+        rows = c.execute(f"SELECT mid, meta, status FROM matches{sql} ORDER BY created_at DESC, mid DESC "
+                         "LIMIT ? OFFSET ?", args + [limit, offset])
+        return [(mid, dict(json.loads(meta), status=st)) for mid, meta, st in rows], total
+
+    def save_match(self, mid, meta):
+        with self._tx() as c: self._put_match(c, mid, meta)
+
+    def delete_match(self, mid):
+        with self._tx() as c:
+            for table in ("matches", "states", "balls", "checkpoints", "players", "commentary_pages", "pages"):
+                c.execute(f"DELETE FROM {table} WHERE mid=?", (mid,))
+
+    # ---------- match state ----------
+    def load_snapshot(self, mid):
+        row = self._conn().execute("SELECT state FROM states WHERE mid=?", (mid,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def load_state(self, mid, meta):
+        c = self._conn()
+        row = c.execute("SELECT seq, state FROM states WHERE mid=?", (mid,)).fetchone()
+        s = json.loads(row[1]) if row else {}
+        for seq, ev in c.execute("SELECT seq, event FROM balls WHERE mid=? AND seq>? ORDER BY seq",
+                                 (mid, row[0] if row else 0)).fetchall():
+            ensure_state_defaults(s, meta)
+            ev = json.loads(ev)
+            if ev["t"] == "amend": s = self._rebuild(c, mid, meta, seq, amend_floor(ev))
+            else: fold_event(s, ev)
+            s["_seq"] = seq
+        return s
+
+    def _rebuild(self, c, mid, meta, upto, first):
+        # Same as storage._rebuild: newest checkpoint before `first` + the events after it
+        seqs = [q for (q,) in c.execute("SELECT seq FROM checkpoints WHERE mid=? AND seq<? ORDER BY seq DESC",
+                                        (mid, first))]
+        for seq in seqs + [0]:
+            events = [(q, json.loads(ev)) for q, ev in c.execute(
+                "SELECT seq, event FROM balls WHERE mid=? AND seq>? AND seq<=? ORDER BY seq", (mid, seq, upto))]
+            if all(amend_floor(ev) > seq for _, ev in events if ev["t"] == "amend"): break
+        base = json.loads(c.execute("SELECT state FROM checkpoints WHERE mid=? AND seq=?",
+                                    (mid, seq)).fetchone()[0]) if seq else {}
+        s = fold_amended(base, events)
+        ensure_state_defaults(s, meta)
+        return s
+
+    def list_page(self, mid, kind, page):
+        if kind == "commentary":
+            row = self._conn().execute("SELECT lines FROM commentary_pages WHERE mid=? AND page=?",
+                                       (mid, page)).fetchone()
+        else:
+            row = self._conn().execute("SELECT items FROM pages WHERE mid=? AND kind=? AND page=?",
+                                       (mid, kind, page)).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def _put_page(self, c, mid, kind, page, items):
+        if kind == "commentary":
+            c.execute("INSERT OR REPLACE INTO commentary_pages (mid, page, lines) VALUES (?, ?, ?)",
+                      (mid, page, _dumps(items)))
+        else:
+            c.execute("INSERT OR REPLACE INTO pages (mid, kind, page, items) VALUES (?, ?, ?, ?)",
+                      (mid, kind, page, _dumps(items)))
+
+    def _put_snapshot(self, c, mid, s):
+        storage.page_out(s, lambda kind, page, items: self._put_page(c, mid, kind, page, items))
+        c.execute("INSERT OR REPLACE INTO states (mid, seq, state) VALUES (?, ?, ?)", (mid, s.get("_seq", 0), _dumps(s)))
+        if s.get("_seq", 0) % storage.CHECKPOINT_EVERY == 0: self._put_checkpoint(c, mid, s)
+        c.execute("UPDATE matches SET status=? WHERE mid=?", (s.get("status", ""), mid))
+
+    def _put_checkpoint(self, c, mid, s):
+        c.execute("INSERT OR REPLACE INTO checkpoints (mid, seq, state) VALUES (?, ?, ?)",
+                  (mid, s.get("_seq", 0), _dumps(s)))
+
+    def match_version(self, mid):
+        return self._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM balls WHERE mid=?", (mid,)).fetchone()[0]
+
+    def read_events(self, mid):
+        return [json.loads(ev) for (ev,) in
+                self._conn().execute("SELECT event FROM balls WHERE mid=? ORDER BY seq", (mid,))]
+
+    def record_event(self, mid, meta, s, ev, expect=None):
+        # Same contract as storage.record_event; BEGIN IMMEDIATE is the match lock
+        ev.setdefault("ts", storage.now_ts())
+        with metrics.span("sqlite_write"), self._tx() as c:
+            cur = c.execute("SELECT COALESCE(MAX(seq), 0) FROM balls WHERE mid=?", (mid,)).fetchone()[0]
+            if cur != s.get("_seq", 0):
+                latest = self.load_state(mid, meta); s.clear(); s.update(latest)
+                if s: ensure_state_defaults(s, meta)
+            if ev.get("id") and ev["id"] in s.get("_ids", ()): return False
+            if expect is not None and s.get("_seq", 0) != expect: raise storage.StaleState(s.get("_seq", 0))
+            if ev["t"] == "amend": self._amend(c, mid, meta, s, ev); return True
+            with metrics.span("fold_event"): fold_event(s, ev)
+            s["_seq"] = s.get("_seq", 0) + 1
+            c.execute("INSERT INTO balls (mid, seq, kind, event) VALUES (?, ?, ?, ?)",
+                      (mid, s["_seq"], ev["t"], _dumps(ev)))
+            if ev["t"] != "ball" or s["_seq"] % storage.SNAPSHOT_EVERY == 0:
+                if storage.WRITE_BEHIND:  # pages now, as in storage.record_event
+                    storage.page_out(s, lambda kind, page, items: self._put_page(c, mid, kind, page, items))
+                    storage.snapshot_writer().submit(mid, copy.deepcopy(s), self._write_snapshot)
+                else: self._put_snapshot(c, mid, s)
+        return True
+
+    def _amend(self, c, mid, meta, s, ev):
+        # storage._amend inside the write transaction. Matches migrated from a snapshot
+        # only (no "start" event, see migrate) have nothing to re-fold from.
+        row = c.execute("SELECT kind FROM balls WHERE mid=? AND seq=1", (mid,)).fetchone()
+        if not row or row[0] != "start": raise ValueError("corrections need an event-log match")
+        first = amend_floor(ev)
+        if not 1 < first <= s.get("_seq", 0): raise ValueError(f"no event {first} to correct")
+        c.execute("DELETE FROM checkpoints WHERE mid=? AND seq>=?", (mid, first))
+        seq = s.get("_seq", 0) + 1
+        c.execute("INSERT INTO balls (mid, seq, kind, event) VALUES (?, ?, ?, ?)", (mid, seq, ev["t"], _dumps(ev)))
+        with metrics.span("amend"): latest = self._rebuild(c, mid, meta, seq, first)
+        s.clear(); s.update(latest)
+        if storage.WRITE_BEHIND: storage.snapshot_writer().discard(mid)
+        self._put_snapshot(c, mid, s); self._put_checkpoint(c, mid, s)
+
+    def _write_snapshot(self, mid, s):
+        # Write-behind flush (runs on the SnapshotWriter thread, with its own connection)
+        with self._tx() as c:
+            row = c.execute("SELECT seq FROM states WHERE mid=?", (mid,)).fetchone()
+            if row is None or row[0] < s.get("_seq", 0): self._put_snapshot(c, mid, s)
+
+    # ---------- members ----------
+    def read_members(self):
+        rows = self._conn().execute("SELECT reg_no, name, mobile, branch, role FROM members ORDER BY n")
+        return [dict(zip(REG_COLS, r)) for r in rows]
+
+    def write_members(self, rows):
+        with self._tx() as c:
+            c.execute("DELETE FROM members")
+            n = 0
+            for r in rows:
+                m = re.search(r"(\d+)$", str(r.get("Reg_No", "")))
+                n = max(n + 1, int(m.group(1))) if m else n + 1
+                c.execute("INSERT INTO members (n, reg_no, name, mobile, branch, role) VALUES (?, ?, ?, ?, ?, ?)",
+                          (n, r.get("Reg_No") or make_reg_no(n), r.get("Name"), str(r.get("Mobile", "")),
+                           r.get("Branch"), r.get("Role")))
+
+    def register_member(self, name, mobile, branch, role):
+        with self._tx() as c:
+            n = c.execute("SELECT COALESCE(MAX(n), 0) + 1 FROM members").fetchone()[0]
+            reg_no = make_reg_no(n)
+            c.execute("INSERT INTO members (n, reg_no, name, mobile, branch, role) VALUES (?, ?, ?, ?, ?, ?)",
+                      (n, reg_no, name, mobile, branch, role))
+        return reg_no
+
+    def register_many(self, rows):
+        rows = list(rows)
+        with self._tx() as c:
+            n = c.execute("SELECT COALESCE(MAX(n), 0) FROM members").fetchone()[0]
+            reg_nos = [make_reg_no(n + i + 1) for i in range(len(rows))]
+            c.executemany("INSERT INTO members (n, reg_no, name, mobile, branch, role) VALUES (?, ?, ?, ?, ?, ?)",
+                          [(n + i + 1, r, *row) for i, (r, row) in enumerate(zip(reg_nos, rows))])
+        return reg_nos
+
+
+# -------------------- Migration --------------------
+def migrate(data_dir=storage.DATA_DIR, db_path=None):
+    db = SqliteStore(db_path or os.path.join(data_dir, "mpgb.sqlite3"))
+    matches = storage.load_json(os.path.join(data_dir, "matches.json"), {})
+    n_events = 0
+    for mid, meta in matches.items():
+        log = os.path.join(data_dir, f"match_{mid}_events.jsonl")
+        events = read_events(log) if os.path.exists(log) else []
+        if events:
+            s = replay(events)  # the log is the source of truth
+        else:
+            s = storage.load_json(os.path.join(data_dir, f"match_{mid}_state.json"), {})
+            s["_seq"] = 0
+        s.pop("_log_pos", None)
+        ensure_state_defaults(s, meta)
+        with db._tx() as c:
+            db._put_match(c, mid, meta)
+            c.execute("DELETE FROM balls WHERE mid=?", (mid,))
+            c.execute("DELETE FROM checkpoints WHERE mid=?", (mid,))
+            c.executemany("INSERT INTO balls (mid, seq, kind, event) VALUES (?, ?, ?, ?)",
+                          [(mid, i, ev["t"], _dumps(ev)) for i, ev in enumerate(events, 1)])
+            for kind, (_, paged) in paged_lists(s).items():  # pages a snapshot-only match already has
+                for page in range(paged // storage.page_size(kind)):
+                    path = os.path.join(data_dir, os.path.basename(storage.page_path(mid, kind, page)))
+                    items = storage.load_json(path, None)
+                    if items is not None: db._put_page(c, mid, kind, page, items)
+            db._put_snapshot(c, mid, s)
+        n_events += len(events)
+    members = []
+    reg_csv = os.path.join(data_dir, "Registered_Members.csv")
+    if os.path.exists(reg_csv):
+        with open(reg_csv, "r", encoding="utf-8", newline="") as f:
+            members = list(csv.DictReader(f))
+        db.write_members(members)
+    print(f"migrated {len(matches)} matches, {n_events} events, {len(members)} members -> {db.path}")
+    return db
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="SQLite backend tools")
+    ap.add_argument("--migrate", action="store_true", help="import matches.json, match files and the member CSV")
+    ap.add_argument("--data", default=storage.DATA_DIR)
+    ap.add_argument("--db", default=None)
+    a = ap.parse_args()
+    if a.migrate: migrate(a.data, a.db)
+    else: ap.print_help(); sys.exit(1)
@@ -0,0 +1,74 @@
+# Shared fixtures: every test runs in its own working directory, so the relative
+# data/ paths the modules use (storage.DATA_DIR, archive, photos) land in tmp_path.
+# test_storage.py: crash safety (SIGKILL, torn log line, lost snapshot) and paging;
+# test_concurrency.py: two scorers; test_corrections.py: undo / edit; the rest are
+# named after the module they test.
+
+import os, random, sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+from scoring import fold_event
+
+TEAMS = {"Team A": [f"A{i}" for i in range(11)], "Team B": [f"B{i}" for i in range(11)]}
+OUTCOMES = ["0", "1", "0", "2", "4", "1", "6", "Wide", "0", "1", "Wicket", "Bye", "No-Ball", "Leg Bye"]
+META = {"storage": "eventlog", "overs": 5, "title": "Test match", "created_at": "2025-05-01T10:00:00"}
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(storage.DATA_DIR, exist_ok=True)
+    monkeypatch.setattr(storage, "FSYNC", False)
+    return tmp_path / storage.DATA_DIR
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def db(request, data_dir):
+    if request.param == "files": return storage.FileStore()
+    import storage_sqlite
+    return storage_sqlite.SqliteStore(str(data_dir / "test.sqlite3"))
+
+
+def next_event(s, i, outcomes=OUTCOMES):
+    # What a scorer would record next on state `s` (the i-th action of the match)
+    if s["score"][s["bat_team"]]["balls"] >= s["overs_limit"] * 6 or s["score"][s["bat_team"]]["wkts"] >= 10:
+        return {"t": "end_innings", "ts": f"{i:08d}"}
+    if not s["over_in_progress"]:
+        bat = s["batting"]; order = s["teams"][s["bat_team"]]
+        bowlers = [p for p in TEAMS[s["bowl_team"]][5:] if p != s["bowling"]["last_over_bowler"]]
+        return {"t": "players", "striker": bat["striker"] or order[0], "non_striker": bat["non_striker"] or order[1],
+                "bowler": bowlers[i % len(bowlers)], "ts": f"{i:08d}"}
+    return {"t": "ball", "outcome": outcomes[i % len(outcomes)], "runs": 1, "ts": f"{i:08d}"}
+
+
+def reload(db, mid, meta=META):
+    # A fresh read, as another process would see it
+    storage.state_cache().invalidate()
+    return db.load_state(mid, meta)
+
+
+def score(db, mid, meta=META, n=None):
+    # Scores `n` actions after the start event (the whole match if None); returns the state
+    s = {}
+    db.save_match(mid, meta)
+    db.record_event(mid, meta, s, {"t": "start", "overs": meta["overs"], "bat_team": "Team A", "teams": TEAMS,
+                                   "ts": "start"})
+    i = 0
+    while (n is None or i < n) and s["status"] != "COMPLETED":
+        db.record_event(mid, meta, s, next_event(s, i)); i += 1
+    return s
+
+
+def play(n, seed=0):
+    # Event list of a match scored n actions in (random outcomes), no storage involved
+    rnd = random.Random(seed)
+    outcomes = [rnd.choice(["0", "1", "2", "4", "6", "Wicket", "Wide", "No-Ball", "Bye"]) for _ in range(50)]
+    s = {}; events = [{"t": "start", "overs": 5, "bat_team": "Team A", "teams": TEAMS, "ts": "start"}]
+    fold_event(s, events[0])
+    for i in range(n):
+        if s["status"] == "COMPLETED": break
+        ev = next_event(s, i, outcomes); events.append(ev); fold_event(s, ev)
+    return events, s
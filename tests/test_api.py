@@ -0,0 +1,52 @@
+import json
+from conftest import META, score
+import api, storage
+from scoring import replay
+
+
+def get(live, path, **headers):
+    status, out, body = live.get(path, {k.replace("_", "-"): v for k, v in headers.items()})
+    return status, out, json.loads(body) if body else None
+
+
+def test_conditional_get_and_new_versions():
+    db = storage.FileStore(); s = score(db, "live", n=20); live = api.LiveAPI(db)
+    status, h, data = get(live, "/matches/live")
+    assert status == 200 and data["seq"] == s["_seq"]
+    assert get(live, "/matches/live", If_None_Match=h["ETag"])[0] == 304
+    assert get(live, "/matches/live", If_Modified_Since=h["Last-Modified"])[0] == 304
+    db.record_event("live", META, s, {"t": "ball", "outcome": "4", "runs": 0})
+    # Same second as the previous version: both validators still see the change
+    status, h2, data = get(live, "/matches/live", If_Modified_Since=h["Last-Modified"])
+    assert status == 200 and data["seq"] == s["_seq"] and h2["Last-Modified"] != h["Last-Modified"]
+    assert get(live, "/matches/live", If_None_Match=h["ETag"])[0] == 200
+    assert get(live, "/matches/live", If_Modified_Since=h2["Last-Modified"])[0] == 304
+
+
+def test_ball_deltas_and_reset_after_a_correction():
+    db = storage.FileStore(); s = score(db, "delta", n=30); live = api.LiveAPI(db)
+    _, _, first = get(live, "/matches/delta/balls")
+    assert first["since"] == 0 and len(first["items"]) == first["balls"]
+    db.record_event("delta", META, s, {"t": "ball", "outcome": "1", "runs": 0})
+    _, _, more = get(live, f"/matches/delta/balls?since={first['balls']}&corrections={first['corrections']}")
+    assert not more["reset"] and len(more["items"]) == 1
+    db.record_event("delta", META, s, {"t": "amend", "edits": {str(s["_seq"]): None}})
+    _, _, fixed = get(live, f"/matches/delta/balls?since={more['balls']}&corrections={more['corrections']}")
+    assert fixed["reset"] and fixed["since"] == 0 and len(fixed["items"]) == first["balls"]
+
+
+def test_deltas_reach_balls_paged_out_of_the_state():
+    meta = dict(META, overs=20); db = storage.FileStore(); s = score(db, "long", meta=meta, n=None)
+    live = api.LiveAPI(db); log = replay(db.read_events("long"))["balls_log"]
+    assert s["balls_paged"] and get(live, "/matches/long")[2]["balls"] == len(log)
+    _, _, all_balls = get(live, "/matches/long/balls")
+    _, _, tail = get(live, "/matches/long/balls?since=10")
+    assert all_balls["items"] == log and tail["items"] == log[10:] and not tail["reset"]
+    assert get(live, f"/matches/long/balls?since={len(log) + 1}")[2]["reset"]
+
+
+def test_unknown_routes():
+    live = api.LiveAPI(storage.FileStore())
+    assert get(live, "/nope")[0] == 404
+    assert get(live, "/matches/none")[0] == 404
+    assert get(live, "/matches/x/balls?since=a")[0] == 400
@@ -0,0 +1,40 @@
+import os
+import pytest
+from conftest import META, score
+import storage
+
+pytest.importorskip("pyarrow")
+import archive, stats  # noqa: E402
+
+
+def test_match_with_no_deliveries_does_not_break_the_archive():
+    db = storage.FileStore()
+    s = score(db, "full", n=None)
+    empty = score(db, "empty", n=0)
+    for _ in range(2): db.record_event("empty", META, empty, {"t": "end_innings"})
+    assert empty["status"] == "COMPLETED" == s["status"]
+    assert stats.refresh(db, db.load_matches()) == 2
+    assert archive.archived_mids() == {"full", "empty"}
+    balls = stats.load_ball_table()
+    assert set(balls["mid"]) == {"full"} and len(balls) == len(stats.match_rows("full", META, db.read_events("full")))
+    assert set(archive.scan("scores")["mid"]) == {"full", "empty"}
+    assert stats.refresh(db, db.load_matches()) == 0  # nothing left to export
+
+
+def test_no_temp_files_left_in_partitions():
+    db = storage.FileStore(); score(db, "one", n=None)
+    stats.refresh(db, db.load_matches())
+    for root, _, files in os.walk(archive.ARCHIVE_DIR):
+        assert not [f for f in files if f.endswith(".tmp")]
+
+
+def test_version_changes_with_each_export(monkeypatch):
+    db = storage.FileStore(); score(db, "one", n=None); score(db, "two", n=None)
+    assert archive.version() is None
+    written = []
+    real = storage.save_json
+    monkeypatch.setattr(storage, "save_json", lambda path, *a, **k: (written.append(path), real(path, *a, **k)))
+    archive.export_match(db, "one", META); first = archive.version()
+    archive.export_match(db, "two", META)
+    assert isinstance(first, int) and archive.version() > first
+    assert written.count(archive.VERSION_FILE) == 2  # through the atomic writer
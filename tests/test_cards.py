@@ -0,0 +1,28 @@
+import io
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image, PdfParser  # noqa: E402
+import cards  # noqa: E402
+
+MEMBERS = [{"Reg_No": f"MPGBCC-2025-{i:04d}", "Name": f"Player {i}", "Mobile": f"9{i:09d}", "Branch": "BR1",
+            "Role": "Batsman"} for i in range(5)]
+
+
+def test_bulk_pdf_has_one_readable_page_per_member():
+    data = cards.render_bulk(MEMBERS, "pdf", workers=2)
+    pdf = PdfParser.PdfParser(buf=data)
+    assert len(pdf.pages) == len(MEMBERS)
+    for ref in pdf.pages:
+        page = pdf.read_indirect(ref)
+        img = pdf.read_indirect(page[b"Resources"][b"XObject"][b"Im"])
+        with Image.open(io.BytesIO(img.buf)) as jpg:
+            assert jpg.format == "JPEG" and jpg.size == (cards.W, cards.H)
+    for n in pdf.xref_table.keys():  # every xref entry points at its object
+        assert data[pdf.xref_table[n][0]:].startswith(b"%d 0 obj" % n)
+
+
+def test_bulk_zip_names_cards_by_reg_no():
+    import zipfile
+    with zipfile.ZipFile(io.BytesIO(cards.render_bulk(MEMBERS, "zip", workers=2))) as zf:
+        assert sorted(zf.namelist()) == sorted(f"{m['Reg_No']}.png" for m in MEMBERS)
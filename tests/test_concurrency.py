@@ -0,0 +1,38 @@
+import pytest
+from conftest import META, reload, score
+import storage
+
+
+def test_duplicate_ball_id_is_recorded_once(db):
+    s = score(db, "dup", n=10)
+    other = reload(db, "dup")
+    ev = {"t": "ball", "outcome": "4", "runs": 0, "id": "abc123"}
+    assert db.record_event("dup", META, s, dict(ev)) is True
+    assert db.record_event("dup", META, other, dict(ev)) is False  # the retry from a second session
+    assert db.record_event("dup", META, s, dict(ev)) is False
+    assert reload(db, "dup")["_seq"] == s["_seq"] == other["_seq"]
+    assert sum(e.get("id") == "abc123" for e in db.read_events("dup")) == 1
+
+
+def test_stale_expect_raises_and_writes_nothing(db):
+    s = score(db, "cas", n=10)
+    seen = s["_seq"]; other = reload(db, "cas")
+    db.record_event("cas", META, other, {"t": "ball", "outcome": "1", "runs": 0}, expect=seen)
+    with pytest.raises(storage.StaleState):
+        db.record_event("cas", META, s, {"t": "ball", "outcome": "6", "runs": 0}, expect=seen)
+    assert s["_seq"] == other["_seq"] == seen + 1  # refreshed to the latest state
+    assert [e["outcome"] for e in db.read_events("cas")[-1:]] == ["1"]
+
+
+def test_two_scorers_close_innings_once(db):
+    score(db, "ends", n=None)  # play to the end, then rewind to the last ball of innings 1
+    events = db.read_events("ends")
+    end1 = next(i for i, e in enumerate(events) if e["t"] == "end_innings")
+    db2 = storage.FileStore() if isinstance(db, storage.FileStore) else type(db)(db.path + "2")
+    a = score(db2, "e2", n=0)
+    for ev in events[1:end1]: db2.record_event("e2", META, a, dict(ev))
+    b = reload(db2, "e2")
+    db2.record_event("e2", META, a, {"t": "end_innings"}, expect=a["_seq"])
+    with pytest.raises(storage.StaleState):
+        db2.record_event("e2", META, b, {"t": "end_innings"}, expect=b["_seq"])
+    assert reload(db2, "e2")["innings"] == 2 and reload(db2, "e2")["status"] == "INNINGS2"
@@ -0,0 +1,92 @@
+import os, random
+import pytest
+from conftest import META, TEAMS, next_event, play, reload, score
+import storage
+from scoring import ball_list, effective_events, fold_amended, replay, same_state, undo_edits
+
+
+def test_undo_drops_the_last_ball_and_what_followed():
+    events, _ = play(40)
+    edits = undo_edits(events)
+    undone = replay(events + [{"t": "amend", "edits": edits, "note": "undo"}])
+    kept = [ev for seq, ev in enumerate(events, 1) if str(seq) not in edits]
+    expected = replay(kept)
+    assert undone["score"] == expected["score"]
+    assert undone["batsman_stats"] == expected["batsman_stats"]
+    assert undone["corrections"] == 1
+    assert len(ball_list(events)) - 1 == len(ball_list(events + [{"t": "amend", "edits": edits}]))
+
+
+def test_edit_replaces_one_ball():
+    events, _ = play(60, seed=3)
+    seq, _, _, ev = ball_list(events)[5]
+    edited = dict(ev, outcome="6", runs=0)
+    amended = events + [{"t": "amend", "edits": {str(seq): edited}}]
+    fixed = events[:seq - 1] + [edited] + events[seq:]
+    assert replay(amended)["score"] == replay(fixed)["score"]
+    assert [e for _, e in effective_events(amended)] == fixed
+
+
+def test_fold_amended_from_a_checkpoint_equals_full_replay():
+    events, _ = play(120, seed=7)
+    balls = ball_list(events)
+    amend = {"t": "amend", "edits": {str(balls[-10][0]): None, str(balls[-4][0]): dict(balls[-4][3], outcome="4")}}
+    full = replay(events + [amend])
+    floor = balls[-10][0]
+    base = replay(events, floor - 1)  # a checkpoint before the first corrected event
+    tail = list(enumerate(events[floor - 1:] + [amend], floor))
+    assert same_state(fold_amended(base, tail), full)
+
+
+def test_undo_with_no_balls():
+    events, _ = play(1)  # start + players only
+    assert undo_edits(events) is None
+
+
+def test_random_corrections_match_a_full_replay(db):
+    rnd = random.Random(5)
+    s = score(db, "amend", n=150)
+    for k in range(25):
+        events = db.read_events("amend")
+        balls = ball_list(events)
+        if k % 3 == 0:
+            edits = undo_edits(events)
+        else:
+            seq, _, _, ev = rnd.choice(balls[-60:])
+            edits = {str(seq): dict(ev, outcome=rnd.choice(["0", "4", "Wide", "Wicket"]), runs=0)}
+        db.record_event("amend", META, s, {"t": "amend", "edits": edits, "note": f"fix {k}"}, expect=s["_seq"])
+        if k % 4 == 0:  # keep scoring between corrections
+            for i in range(5):
+                if s["status"] != "COMPLETED": db.record_event("amend", META, s, next_event(s, 1000 + i))
+        full = replay(db.read_events("amend"))
+        assert same_state(s, full)
+        assert same_state(reload(db, "amend"), full)
+    assert s["corrections"] == 25
+
+
+def test_stale_checkpoint_after_a_crash_is_skipped():
+    db = storage.FileStore()
+    s = score(db, "ckpt", n=120)
+    balls = ball_list(db.read_events("ckpt"))
+    stale = {q: storage.load_json(storage.checkpoint_path("ckpt", q), None) for q in storage.checkpoints("ckpt")}
+    db.record_event("ckpt", META, s, {"t": "amend", "edits": {str(balls[3][0]): None}})
+    for q, ck in stale.items():  # as if the process died before removing them
+        storage.save_json(storage.checkpoint_path("ckpt", q), ck, compact=True)
+    os.remove(storage.match_state_path("ckpt"))
+    assert same_state(storage.load_match_state("ckpt", META), replay(db.read_events("ckpt")))
+
+
+def test_corrections_need_an_event_log(db):
+    legacy = {"overs": 5}  # scored before the event log (snapshot only)
+    if isinstance(db, storage.FileStore):
+        s = score(db, "old", meta=dict(legacy, overs=5), n=10)
+    else:
+        import storage_sqlite
+        from scoring import new_match_state
+        storage.save_json(os.path.join(storage.DATA_DIR, "matches.json"), {"old": legacy})
+        storage.save_json(storage.match_state_path("old"), new_match_state(5, "Team A", TEAMS["Team A"], TEAMS["Team B"]))
+        db = storage_sqlite.migrate(storage.DATA_DIR, db.path)
+        s = db.load_state("old", legacy)
+        for i in range(10): db.record_event("old", legacy, s, next_event(s, i))
+    with pytest.raises(ValueError):
+        db.record_event("old", legacy, s, {"t": "amend", "edits": {"3": None}})
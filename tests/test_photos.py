@@ -0,0 +1,30 @@
+import io, os
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+import photos  # noqa: E402
+
+
+def png(mode, size=(1200, 900), **info):
+    img = Image.linear_gradient("L").resize(size)
+    img = img.convert("I").point(lambda v: v * 256).convert("I;16") if mode == "I;16" else img.convert(mode)
+    buf = io.BytesIO(); img.save(buf, format="PNG", **info); buf.seek(0)
+    return buf
+
+
+@pytest.mark.parametrize("mode, info", [("P", {}), ("P", {"transparency": 0}), ("1", {}), ("I;16", {}),
+                                        ("LA", {}), ("RGB", {})])
+def test_large_pngs_of_every_mode_normalize(mode, info):
+    buf = png(mode, **info)
+    assert Image.open(buf).mode == mode; buf.seek(0)
+    out = photos.normalize(buf)
+    assert out.mode == "RGB" and out.size == photos.THUMB
+
+
+def test_concurrent_identical_uploads_store_one_photo():
+    data = png("RGB").getvalue()
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        keys = set(ex.map(lambda _: photos.save_photo(io.BytesIO(data)), range(16)))
+    assert len(keys) == 1 and os.listdir(photos.PHOTO_DIR) == [f"{keys.pop()}.jpg"]
+    assert Image.open(photos.photo_path(photos.save_photo(io.BytesIO(data)))).size == photos.THUMB
@@ -0,0 +1,60 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+import registry
+
+
+def _register(args):
+    path, i = args
+    return registry.register_member(path, f"Player {i}", f"9{i:09d}", "BR001", "Batsman")
+
+
+def test_parallel_registrations_get_unique_numbers(tmp_path):
+    path = str(tmp_path / "Registered_Members.csv")
+    with ProcessPoolExecutor(max_workers=8) as ex:
+        returned = list(ex.map(_register, [(path, i) for i in range(80)]))
+    with open(path, encoding="utf-8", newline="") as f: rows = list(csv.DictReader(f))
+    stored = [r["Reg_No"] for r in rows]
+    assert len(rows) == 80 and sorted(stored) == sorted(returned)
+    assert sorted(int(r[-4:]) for r in stored) == list(range(1, 81))
+
+
+def test_parallel_registrations_through_either_store(db):
+    # Session threads of one app process, files or SQLite
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        returned = list(ex.map(lambda i: db.register_member(f"P{i}", f"8{i:09d}", "BR1", "Bowler"), range(40)))
+    stored = [r["Reg_No"] for r in db.read_members()]
+    assert len(set(returned)) == 40 and sorted(stored) == sorted(returned)
+
+
+def test_existing_registry_without_a_counter_continues_its_numbering(tmp_path):
+    path = str(tmp_path / "Registered_Members.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f); w.writerow(registry.REG_COLS)
+        w.writerows([registry.make_reg_no(i), f"Old {i}", f"7{i:09d}", "BR1", "Batsman"] for i in range(1, 4))
+    assert registry.register_member(path, "New", "9000000009", "BR1", "Batsman")[-4:] == "0004"
+
+
+def test_bulk_registration_continues_the_sequence(tmp_path):
+    path = str(tmp_path / "Registered_Members.csv")
+    first = registry.register_member(path, "A", "9000000001", "BR1", "Bowler")
+    many = registry.register_many(path, [(f"P{i}", f"90000000{i + 10}", "BR1", "Batsman") for i in range(5)])
+    assert [int(r[-4:]) for r in [first] + many] == list(range(1, 7))
+
+
+def test_import_validation_reasons():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({
+        "Full Name": ["Asha", "Ravi", "", "Meena", "Kiran", "Asha Two", "Dev", "Lata"],
+        "Mobile No": ["+91-98765 43210", "9876500001", "9876500002", "9876500003", "12345",
+                      "98765-43210", 9876500004.0, "9876500005"],
+        "Branch": ["BR1", "BR1", "BR1", "BR2", "BR2", "BR3", "BR3", "BR3"],
+        "Role": ["batsman", "Bowler", "Bowler", "Batsman", "Batsman", "Batsman", "Keeper", " all-rounder "]})
+    paid = {"9876543210", "9876500002", "9876500003", "9876500004", "9876500005", "0000012345"}
+    accepted, rejected = registry.validate_import(df, paid, registered_mobiles={"9876500003"})
+    assert accepted.to_dict("records") == [
+        {"Name": "Asha", "Mobile": "9876543210", "Branch": "BR1", "Role": "Batsman"},
+        {"Name": "Lata", "Mobile": "9876500005", "Branch": "BR3", "Role": "All-Rounder"}]
+    assert dict(zip(rejected["Row"], rejected["Reason"])) == {
+        3: "not in paid list", 4: "missing name", 5: "already registered", 6: "invalid mobile",
+        7: "duplicate in file", 8: "unknown role"}
@@ -0,0 +1,27 @@
+import copy
+from conftest import play
+from scoring import apply_ball, apply_event, fold_event, replay, same_state
+
+
+def test_replay_matches_incremental_fold():
+    events, s = play(80)
+    assert same_state(replay(events), s)
+    assert replay(events)["_seq"] == len(events)
+
+
+def test_replay_on_top_of_a_snapshot():
+    events, _ = play(80)
+    mid = replay(events, 30)
+    assert same_state(replay(events[30:], state=mid), replay(events))
+
+
+def test_pure_reducers_leave_their_input_alone():
+    events, _ = play(60, seed=2)
+    s = replay(events[:20])
+    for ev in events[20:]:
+        before = copy.deepcopy(s)
+        out = apply_event(s, ev)
+        assert s == before and out == fold_event(copy.deepcopy(s), ev)
+        if ev["t"] == "ball": assert apply_ball(s, ev) == out and s == before
+        s = out
+    assert same_state(s, replay(events))
@@ -0,0 +1,93 @@
+import multiprocessing as mp, os, random, signal, sys, time
+import pytest
+from conftest import META, TEAMS, next_event, reload, score
+import storage
+from scoring import ball_list, read_events, replay, same_state
+
+
+# -------------------- Crash safety (SIGKILL mid-match) --------------------
+def _scorer(mid, acked):
+    s = {}
+    storage.record_event(mid, META, s, {"t": "start", "overs": 50, "bat_team": "Team A", "teams": TEAMS})
+    acked.value = s["_seq"]
+    for i in range(100000):
+        if s["status"] == "COMPLETED": break
+        storage.record_event(mid, META, s, next_event(s, i)); acked.value = s["_seq"]
+        storage.save_json(os.path.join(storage.DATA_DIR, "matches.json"), {f"m{k}": {} for k in range(i % 50)})
+
+
+@pytest.mark.skipif(sys.platform == "win32" or "fork" not in mp.get_all_start_methods(), reason="needs fork + SIGKILL")
+@pytest.mark.parametrize("fsync", [False, True])
+def test_sigkill_mid_match_loses_no_acknowledged_event(fsync, monkeypatch):
+    monkeypatch.setattr(storage, "FSYNC", fsync)
+    rnd = random.Random(1); ctx = mp.get_context("fork")
+    for r in range(8):
+        mid = f"crash{r}"; acked = ctx.Value("i", 0)
+        p = ctx.Process(target=_scorer, args=(mid, acked)); p.start()
+        time.sleep(rnd.uniform(0.02, 0.15))
+        os.kill(p.pid, signal.SIGKILL); p.join()
+        s = storage.load_match_state(mid, META)
+        assert s and s["_seq"] >= acked.value
+        assert same_state(s, replay(read_events(storage.match_log_path(mid))))
+        assert isinstance(storage.load_json(os.path.join(storage.DATA_DIR, "matches.json"), None), dict)
+        # The log stays appendable after the crash
+        storage.record_event(mid, META, s, {"t": "end_over"})
+        assert same_state(storage.load_match_state(mid, META), s)
+
+
+def test_torn_last_line_is_ignored():
+    s = score(storage.FileStore(), "torn", n=20)
+    with open(storage.match_log_path("torn"), "ab") as f: f.write(b'{"t":"ball","outc')
+    loaded = storage.load_match_state("torn", META)
+    assert loaded["_seq"] == s["_seq"] and same_state(loaded, s)
+
+
+def test_missing_snapshot_is_rebuilt_from_the_log():
+    s = score(storage.FileStore(), "nosnap", n=30)
+    os.remove(storage.match_state_path("nosnap"))
+    assert same_state(storage.load_match_state("nosnap", META), s)
+
+
+def test_growing_lists_are_paged_out_and_read_back_whole(db):
+    meta = dict(META, overs=20)
+    s = score(db, "long", meta=meta, n=None)
+    assert s["balls_paged"] and all(s["overs_paged"].values()) and len(s["balls_log"]) < sum(storage.PAGING["balls"])
+    for k in range(2):  # and again after an edit rebuilt the state from a checkpoint
+        full = replay(db.read_events("long"))
+        for state in (s, reload(db, "long", meta)):
+            assert same_state(state, full)
+            assert storage.history(db, "long", state, "balls") == full["balls_log"]
+            assert storage.history(db, "long", state, "balls", 100) == full["balls_log"][100:]
+            assert storage.history(db, "long", state, "commentary") == full["commentary"]
+            for team, overs in full["overs_index"].items():
+                assert storage.history(db, "long", state, f"overs-{team}") == overs
+        seq, _, _, ev = ball_list(db.read_events("long"))[150]
+        db.record_event("long", meta, s, {"t": "amend", "edits": {str(seq): dict(ev, outcome="6", runs=0)}})
+
+
+# -------------------- Match index --------------------
+def _create(args):
+    i, k = args
+    db = storage.FileStore()
+    for j in range(k): db.save_match(f"20250501{i:02d}{j:02d}", {"title": f"M{i}.{j}"})
+
+
+def test_parallel_match_creation_keeps_every_entry():
+    with mp.get_context("spawn" if sys.platform == "win32" else "fork").Pool(4) as pool:
+        pool.map(_create, [(i, 10) for i in range(4)])
+    db = storage.FileStore()
+    assert len(db.load_matches()) == len(db.active_matches()) == 40
+
+
+def test_catalog_dates_and_cached_index():
+    import datetime
+    db = storage.FileStore()
+    db.save_match("20250301-ABCD", {"title": "Old"})  # no created_at: the date comes from the mid
+    db.save_match("20250601-EFGH", {"title": "New", "created_at": "2025-06-01T09:00:00"})
+    day = lambda y, m, d: datetime.date(y, m, d)
+    assert [m for m, _ in db.list_matches(date_from=day(2025, 3, 1), date_to=day(2025, 3, 1))[0]] == ["20250301-ABCD"]
+    assert db.list_matches(date_from=day(2025, 4, 1))[1] == 1
+    rows, total = db.list_matches(limit=1)
+    assert total == 2 and rows[0][0] == "20250601-EFGH"
+    db.set_status("20250601-EFGH", "COMPLETED")  # a write invalidates the cached index
+    assert [m for m, _ in db.list_matches(status="completed")[0]] == ["20250601-EFGH"]
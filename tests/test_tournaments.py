@@ -0,0 +1,81 @@
+import pytest
+import tournaments
+from tournaments import nrr, record_result, standings
+
+
+def result(tid, fx, home, away, mid=None):
+    # A completed match of fixture `fx`: home / away = (runs, wkts, balls), 20 overs
+    state = {"status": "COMPLETED", "overs_limit": 20,
+             "teams": {"Team A": [f"A{i}" for i in range(11)], "Team B": [f"B{i}" for i in range(11)]},
+             "score": {"Team A": dict(zip(("runs", "wkts", "balls"), home)),
+                       "Team B": dict(zip(("runs", "wkts", "balls"), away))}}
+    meta = dict(tournaments.match_meta(tid, fx), status="COMPLETED")
+    return mid or f"m{fx['id']}", meta, state
+
+
+def play(tid, fx, home_wins=True):
+    runs = (150, 120) if home_wins else (120, 150)
+    return record_result(*result(tid, fx, (runs[0], 5, 120), (runs[1], 6, 120)))
+
+
+def fixtures(tid, rnd): return [f for f in tournaments.load()[tid]["fixtures"] if f["round"] == rnd]
+
+
+def test_round_robin_standings_and_nrr():
+    tid = tournaments.create("League", "round_robin", ["X", "Y", "Z"])
+    fx = {(f["home"], f["away"]): f for f in tournaments.load()[tid]["fixtures"]}
+    assert len(fx) == 3
+    games = {("X", "Y"): ((180, 5, 120), (150, 10, 90)),   # Y bowled out in 15 overs: counts 20
+             ("X", "Z"): ((140, 9, 120), (141, 3, 100)),
+             ("Y", "Z"): ((160, 4, 120), (160, 7, 120))}    # tie
+    for (h, a), (hs, as_) in games.items():
+        f = fx.get((h, a)) or fx[(a, h)]
+        if f["home"] != h: hs, as_ = as_, hs
+        assert record_result(*result(tid, f, hs, as_))
+        assert not record_result(*result(tid, f, hs, as_))  # a repeated call is a no-op
+    t = tournaments.load()[tid]
+    assert [(r["Team"], r["W"], r["L"], r["T"], r["Pts"]) for r in standings(t)] == \
+        [("Z", 1, 0, 1, 3), ("X", 1, 1, 0, 2), ("Y", 0, 1, 1, 1)]
+    x = t["table"]["X"]
+    assert (x["rf"], x["bf"], x["ra"], x["ba"]) == (320, 240, 291, 220)
+    assert nrr(x) == round(320 * 6 / 240 - 291 * 6 / 220, 3)
+    assert t["table"]["Y"]["bf"] == 240  # the all-out innings counts its full 120 balls
+    assert nrr({"rf": 180, "bf": 120, "ra": 150, "ba": 120}) == 1.5
+
+
+def test_knockout_seeding_keeps_top_seeds_apart():
+    tid = tournaments.create("Cup", "knockout", [f"S{i}" for i in range(1, 9)])
+    assert [(f["home"], f["away"]) for f in fixtures(tid, 1)] == \
+        [("S1", "S8"), ("S4", "S5"), ("S2", "S7"), ("S3", "S6")]
+    for f in fixtures(tid, 1): play(tid, f)
+    assert [(f["home"], f["away"]) for f in fixtures(tid, 2)] == [("S1", "S4"), ("S2", "S3")]
+    for f in fixtures(tid, 2): play(tid, f)
+    final, = fixtures(tid, 3)
+    assert (final["home"], final["away"]) == ("S1", "S2")
+    play(tid, final, home_wins=False)
+    assert fixtures(tid, 3)[0]["winner"] == "S2"
+
+
+def test_knockout_byes_go_to_the_top_seeds():
+    tid = tournaments.create("Cup", "knockout", [f"S{i}" for i in range(1, 7)])
+    first = fixtures(tid, 1)
+    assert [f["winner"] for f in first if f["away"] is None] == ["S1", "S2"]
+    assert [(f["home"], f["away"]) for f in tournaments.open_fixtures(tournaments.load()[tid])] == \
+        [("S4", "S5"), ("S3", "S6")]
+    for f in tournaments.open_fixtures(tournaments.load()[tid]): play(tid, f, home_wins=False)
+    assert [(f["home"], f["away"]) for f in fixtures(tid, 2)] == [("S1", "S5"), ("S2", "S6")]
+
+
+def test_tied_knockout_game_waits_for_a_tiebreak():
+    tid = tournaments.create("Cup", "knockout", ["P", "Q", "R", "S"])
+    f = fixtures(tid, 1)[0]
+    tie = result(tid, f, (150, 5, 120), (150, 8, 120))
+    assert record_result(*tie) is False
+    f = fixtures(tid, 1)[0]
+    assert f["pending"] and f["winner"] is None and fixtures(tid, 2)[0]["home"] is None
+    with pytest.raises(ValueError):
+        record_result(*tie, tiebreak="R")
+    assert record_result(*tie, tiebreak="S")
+    t = tournaments.load()[tid]
+    assert fixtures(tid, 1)[0]["winner"] == "S" and fixtures(tid, 2)[0]["home"] == "S"
+    assert t["table"]["P"]["T"] == t["table"]["S"]["T"] == 1
@@ -0,0 +1,35 @@
+import pytest
+from conftest import reload, score
+import metrics, storage
+from scoring import replay, same_state
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    # Write-behind on, with a writer that only writes when the test flushes it
+    w = storage.SnapshotWriter(interval=3600)
+    monkeypatch.setattr(storage, "WRITE_BEHIND", True)
+    monkeypatch.setattr(storage, "_WRITER", w)
+    return w
+
+
+def test_coalesced_snapshots_keep_their_checkpoints(db, writer):
+    s = score(db, "wb", n=150)
+    assert writer.coalesced and writer.pending() == 1
+    writer.flush()
+    due = list(range(storage.CHECKPOINT_EVERY, s["_seq"] + 1, storage.CHECKPOINT_EVERY))
+    if isinstance(db, storage.FileStore):
+        assert storage.checkpoints("wb") == due
+    else:
+        c = db._conn()
+        assert [q for (q,) in c.execute("SELECT seq FROM checkpoints WHERE mid='wb' ORDER BY seq")] == due
+    assert same_state(reload(db, "wb"), replay(db.read_events("wb")))
+
+
+def test_failed_writes_are_counted(writer, monkeypatch):
+    monkeypatch.setattr(metrics, "_on", True); metrics.reset()
+    def broken(mid, s): raise OSError("disk full")
+    writer.submit("x", {"_seq": 36}, broken); writer.submit("x", {"_seq": 37}, broken)
+    writer.flush()
+    assert writer.failed == 2 and writer.written == 0 and writer.pending() == 0
+    assert metrics.snapshot()["counters"]["snapshot_write_failed"] == 2
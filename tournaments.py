@@ -0,0 +1,168 @@
+# tournaments.py — inter-branch tournaments for MPGB Cricket Club
+# A tournament maps real team names onto matches ("Team A"/"Team B" in the state)
+# through each match's meta: {"tournament": tid, "fixture": n, "team_names": {...}}.
+# The points table is kept in data/tournaments.json next to the fixtures and is
+# updated once per completed match (record_result), so showing it never opens a
+# match file however many have been played. "applied" makes a repeated call a no-op.
+#
+# Points: win 2, tie / no result 1. NRR = runs scored per over - runs conceded per
+# over; a side bowled out counts its full quota of overs (standard rule).
+# Knockout: seeds in standard bracket order (1 and 2 can only meet in the final). A
+# tied or no-result knockout game needs its winner picked (super over, toss) before
+# it counts: record_result(..., tiebreak=team); until then the fixture is "pending".
+
+import os, uuid
+from datetime import datetime
+import storage
+from registry import registry_lock
+
+TOURNAMENTS = os.path.join(storage.DATA_DIR, "tournaments.json")
+FORMATS = ["round_robin", "knockout"]
+WIN_PTS, TIE_PTS = 2, 1
+
+
+def load(): return storage.load_json(TOURNAMENTS, {})
+
+
+def _update(fn):
+    # Read-modify-write of tournaments.json under a file lock; returns fn's result
+    with registry_lock(TOURNAMENTS):
+        data = load(); out = fn(data)
+        storage.save_json(TOURNAMENTS, data)
+    return out
+
+
+def _row(): return {"P": 0, "W": 0, "L": 0, "T": 0, "NR": 0, "Pts": 0, "rf": 0, "bf": 0, "ra": 0, "ba": 0}
+
+
+# -------------------- Fixtures --------------------
+def round_robin(teams):
+    # Circle method: every pair once, no team twice in a round
+    ts = list(teams) + ([None] if len(teams) % 2 else [])
+    n = len(ts); fixtures = []
+    for r in range(n - 1):
+        for i in range(n // 2):
+            home, away = ts[i], ts[n - 1 - i]
+            if home and away: fixtures.append({"round": r + 1, "home": home, "away": away})
+        ts = [ts[0], ts[-1]] + ts[1:-1]
+    return fixtures
+
+
+def seed_order(size):
+    # Standard bracket: 1v8, 4v5, 2v7, 3v6 for 8 (seed numbers from 1), built by
+    # pairing each seed of the half-size bracket with its mirror
+    order = [1]
+    while len(order) < size: order = [s for seed in order for s in (seed, 2 * len(order) + 1 - seed)]
+    return order
+
+
+def knockout(teams):
+    # Bracket of the next power of two in seed order (teams best first); top seeds meet
+    # the empty slots (byes). Later rounds start empty and are filled as winners come
+    # in (see _advance)
+    size = 1
+    while size < len(teams): size *= 2
+    slots = [teams[s - 1] if s <= len(teams) else None for s in seed_order(size)]
+    fixtures = [{"round": 1, "home": slots[i], "away": slots[i + 1]} for i in range(0, size, 2)]
+    rnd, games = 2, size // 4
+    while games:
+        fixtures += [{"round": rnd, "home": None, "away": None} for _ in range(games)]
+        rnd += 1; games //= 2
+    return fixtures
+
+
+def create(name, fmt, teams):
+    teams = list(dict.fromkeys(t.strip() for t in teams if t.strip()))
+    if fmt not in FORMATS: raise ValueError(f"unknown format {fmt!r}")
+    if len(teams) < 2: raise ValueError("need at least two teams")
+    fixtures = round_robin(teams) if fmt == "round_robin" else knockout(teams)
+    for i, f in enumerate(fixtures): f.update(id=i, mid=None, winner=None)
+    tid = datetime.now().strftime("%Y%m%d") + "-" + uuid.uuid4().hex[:4].upper()
+    t = {"name": name, "format": fmt, "teams": teams, "created_at": datetime.now().isoformat(),
+         "fixtures": fixtures, "table": {team: _row() for team in teams}, "applied": []}
+    for f in fixtures:
+        if f["round"] == 1 and f["away"] is None:  # bye: straight through
+            f["winner"] = f["home"]; _advance(t, f, f["home"])
+    _update(lambda data: data.__setitem__(tid, t))
+    return tid
+
+
+def open_fixtures(t):
+    # Fixtures that can be scheduled: both sides known, no match yet
+    return [f for f in t["fixtures"] if f["home"] and f["away"] and not f["mid"]]
+
+
+def link_match(tid, fixture_id, mid):
+    def fn(data): data[tid]["fixtures"][fixture_id]["mid"] = mid
+    _update(fn)
+
+
+def match_meta(tid, fixture):
+    # Meta keys for a match created from a fixture (home side is "Team A")
+    return {"tournament": tid, "fixture": fixture["id"],
+            "team_names": {"Team A": fixture["home"], "Team B": fixture["away"]}}
+
+
+# -------------------- Results --------------------
+def _innings(state, side):
+    # (runs, balls for NRR) of one side; all out counts the full quota
+    sc = state["score"][side]
+    all_out = sc["wkts"] >= max(len(state["teams"].get(side, [])) - 1, 1)
+    return sc["runs"], state["overs_limit"] * 6 if all_out else sc["balls"]
+
+
+def record_result(mid, meta, state, tiebreak=None):
+    # Fold one completed match into its tournament; O(1) in the number of matches.
+    # tiebreak: the side that won a tied / no-result knockout game (super over, toss);
+    # without it such a game is left pending and nothing is recorded.
+    tid = meta.get("tournament")
+    if not tid or state.get("status") != "COMPLETED": return False
+
+    def fn(data):
+        t = data.get(tid)
+        if t is None or mid in t["applied"]: return False
+        names = meta["team_names"]; home, away = names["Team A"], names["Team B"]
+        (ra, ba), (rb, bb) = _innings(state, "Team A"), _innings(state, "Team B")
+        no_result = ba == 0 or bb == 0
+        winner = None if no_result or ra == rb else (home if ra > rb else away)
+        fx = t["fixtures"][meta["fixture"]]
+        if t["format"] == "knockout" and winner is None:
+            if tiebreak is None: fx["pending"] = True; return False
+            if tiebreak not in (home, away): raise ValueError(f"{tiebreak!r} did not play this game")
+        for team, (rf, bf, rc, bc) in ((home, (ra, ba, rb, bb)), (away, (rb, bb, ra, ba))):
+            row = t["table"].setdefault(team, _row())
+            row["P"] += 1
+            if no_result: row["NR"] += 1; row["Pts"] += TIE_PTS; continue
+            row["rf"] += rf; row["bf"] += bf; row["ra"] += rc; row["ba"] += bc
+            if winner is None: row["T"] += 1; row["Pts"] += TIE_PTS
+            elif winner == team: row["W"] += 1; row["Pts"] += WIN_PTS
+            else: row["L"] += 1
+        fx.pop("pending", None)
+        if t["format"] == "knockout":
+            fx["winner"] = winner or tiebreak; _advance(t, fx, fx["winner"])
+        else: fx["winner"] = winner or ""
+        t["applied"].append(mid)
+        return True
+    return _update(fn)
+
+
+def _advance(t, fx, winner):
+    # Winner of the k-th game in round r takes a slot in game k//2 of round r+1
+    same = [f for f in t["fixtures"] if f["round"] == fx["round"]]
+    nxt = [f for f in t["fixtures"] if f["round"] == fx["round"] + 1]
+    if not nxt: return
+    k = same.index(fx)
+    nxt[k // 2]["home" if k % 2 == 0 else "away"] = winner
+
+
+def nrr(row):
+    f = row["rf"] * 6 / row["bf"] if row["bf"] else 0.0
+    a = row["ra"] * 6 / row["ba"] if row["ba"] else 0.0
+    return round(f - a, 3)
+
+
+def standings(t):
+    # Rows sorted by points, then NRR
+    rows = [{"Team": team, **{k: r[k] for k in ("P", "W", "L", "T", "NR", "Pts")}, "NRR": nrr(r)}
+            for team, r in t["table"].items()]
+    return sorted(rows, key=lambda r: (-r["Pts"], -r["NRR"], r["Team"]))
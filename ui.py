@@ -0,0 +1,259 @@
+# ui.py — shared Streamlit helpers for the MPGB Cricket Club pages
+# APP.py draws the chrome (theme, header, sidebar) and imports only the page module
+# that is open (page_*.py). Everything the pages share lives here, and heavy
+# libraries (pandas, openpyxl, pyarrow via stats) are imported inside the helpers
+# that need them, so a spectator on the Public View never loads them.
+
+import os
+import streamlit as st
+from registry import REG_COLS
+import metrics, storage
+
+DATA_DIR = storage.DATA_DIR; os.makedirs(DATA_DIR, exist_ok=True)
+db = storage.store()  # files by default, SQLite with MPGB_STORAGE=sqlite
+shared_states = storage.state_cache()  # process-wide, read-only match states
+LOGO_PATH = "RRB_LOGO_new.png"
+PAID_XLSX = "Members_Paid.xlsx"   # read priority
+PAID_CSV  = "Members_Paid.csv"    # write priority (admin page writes here)
+
+# Public View auto-refresh: a fragment re-runs just the score panel (Streamlit >= 1.37)
+LIVE_FRAGMENT = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+LIVE_REFRESH_SECS = 5
+
+# -------------------- Theme (Cricbuzz-ish) --------------------
+PRIMARY = "#0B8457"  # deep green
+DARK = "#0E3C2F"
+ACCENT = "#2ECC71"
+TEXT_ON_DARK = "#EAF8F0"
+
+THEME_CSS = f"""
+<style>
+/***** Global *****/
+:root {{
+  --primary: {PRIMARY};
+  --dark: {DARK};
+  --accent: {ACCENT};
+  --text-on-dark: {TEXT_ON_DARK};
+}}
+.block-container {{ padding-top: 0.75rem; }}
+html, body, [class*="css"] {{ font-family: Inter, system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; }}
+
+/***** Header Bar *****/
+.header-wrap {{
+  background: linear-gradient(90deg, var(--dark), var(--primary));
+  color: var(--text-on-dark);
+  border-radius: 14px;
+  padding: 12px 16px; margin-bottom: 10px;
+}}
+.header-title {{ font-size: 1.25rem; font-weight: 700; letter-spacing: .2px; }}
+.header-sub {{ opacity:.9; font-size:.9rem; margin-top:-3px; }}
+
+/***** Score Cards *****/
+.score-card {{
+  background: #ffffff; border-radius: 16px; box-shadow: 0 4px 14px rgba(0,0,0,.08);
+  padding: 16px; border: 1px solid rgba(0,0,0,.06);
+}}
+.score-strip {{
+  background: var(--dark); color: var(--text-on-dark);
+  border-radius: 14px; padding: 10px 14px; font-weight: 700;
+}}
+.metric-inline {{ display:flex; gap:14px; flex-wrap:wrap; align-items:center; }}
+.metric-inline .pill {{
+  background: rgba(11,132,87,.1); color: var(--dark); font-weight: 600;
+  padding: 8px 12px; border-radius: 12px; border: 1px solid rgba(11,132,87,.25);
+}}
+
+/***** Ball chips *****/
+.ball-feed {{ margin-top: 6px; }}
+.ball-chip {{ display:inline-block; padding: 6px 10px; border-radius: 999px; margin: 3px 4px; font-weight:700; border:1px solid rgba(0,0,0,.08); }}
+.chip-0 {{ background:#F3F4F6; }}
+.chip-1, .chip-2, .chip-3 {{ background:#E8FFF2; }}
+.chip-4 {{ background:#FFF4D6; }}
+.chip-6 {{ background:#FFE3E3; }}
+.chip-w {{ background:#1F2937; color:white; }}
+.chip-nb {{ background:#DCFCE7; }}
+.chip-wide {{ background:#E0E7FF; }}
+.chip-bye {{ background:#F1F5F9; }}
+
+/***** Buttons *****/
+.stButton>button {{ border-radius: 12px; font-weight: 700; padding: .5rem 1rem; border:1px solid rgba(0,0,0,.05) }}
+.stButton>button[kind="primary"] {{ background: var(--primary) !important; color:white !important; }}
+
+/***** Forms *****/
+label, .stSelectbox label {{ font-weight: 700 !important; color: #0F172A; }}
+.stRadio > div {{ gap: 8px; }}
+
+/***** Mobile tweaks *****/
+@media (max-width: 768px) {{
+  .header-title {{ font-size: 1.05rem; }}
+  .score-strip {{ font-size:.95rem; }}
+}}
+</style>
+"""
+
+# -------------------- Helpers --------------------
+def norm_mobile(x) -> str:
+    # 98765 43210 / +91-9876543210 / 9876543210.0 (Excel float) -> 9876543210
+    txt = str(x).strip()
+    if txt.endswith(".0"): txt = txt[:-2]
+    digits = "".join(ch for ch in txt if ch.isdigit())
+    return digits[-10:] if len(digits) > 10 else digits
+
+
+def _file_sig(path):
+    # (mtime, size) — cache key that changes whenever the file is rewritten
+    try:
+        fs = os.stat(path); return (fs.st_mtime_ns, fs.st_size)
+    except OSError:
+        return None
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_paid_members(xlsx_sig, csv_sig):
+    # Parsed once per file version and shared by all sessions; returns (df, mobile set, warning)
+    import pandas as pd
+    df, warn = None, ""
+    if xlsx_sig:
+        try: df = pd.read_excel(PAID_XLSX, dtype={"Mobile_No": str})
+        except Exception as e:
+            warn = f"Excel read failed ({e}). Using CSV if present."
+    if df is None and csv_sig:
+        df = pd.read_csv(PAID_CSV, dtype={"Mobile_No": str})
+    if df is None:
+        df = pd.DataFrame(columns=["Mobile_No"])  # default shape
+    mobiles = frozenset(m for m in df.get("Mobile_No", pd.Series(dtype=str)).dropna().map(norm_mobile) if m)
+    return df, mobiles, warn
+
+
+def _paid_members():
+    df, mobiles, warn = _load_paid_members(_file_sig(PAID_XLSX), _file_sig(PAID_CSV))
+    if warn: st.warning(warn)
+    return df, mobiles
+
+
+def read_paid_members():
+    return _paid_members()[0].copy()
+
+
+def is_paid_mobile(mobile) -> bool:
+    m = norm_mobile(mobile)
+    return bool(m) and m in _paid_members()[1]
+
+
+def write_paid_members(df):
+    import pandas as pd
+    # Always write CSV (safer for Streamlit Cloud); keep a simple column Mobile_No
+    try:
+        df = df[["Mobile_No"]].copy()
+    except Exception:
+        df = pd.DataFrame({"Mobile_No": pd.Series(dtype=str)})
+    df["Mobile_No"] = df["Mobile_No"].astype(str).str.strip()
+    df = df[df["Mobile_No"] != ""]
+    df.to_csv(PAID_CSV, index=False)
+    _load_paid_members.clear()
+
+
+def read_registered():
+    import pandas as pd
+    return pd.DataFrame(db.read_members(), columns=REG_COLS)
+
+
+def write_registered(df):
+    db.write_members(df.to_dict("records"))
+
+
+def record_event(mid, meta, s, ev, expect=None):
+    # Persist one scoring action, then run the match-completed hooks. Returns False for
+    # a duplicate ball id; raises storage.StaleState if `expect` is no longer current.
+    with metrics.span("record_event"): done = db.record_event(mid, meta, s, ev, expect)
+    if done and ev["t"] == "end_innings" and s.get("status") == "COMPLETED":
+        import stats
+        stats.add_match(db, mid, meta)
+        _player_tables.clear()
+        if meta.get("tournament"):
+            import tournaments
+            tournaments.record_result(mid, meta, s)
+    return done
+
+
+def seen_seq(name, mid, state):
+    # _seq of `mid` that the widgets under `name` were drawn from on the previous run
+    # (a click is handled on the run after the one that drew the button), for use as
+    # record_event's `expect`. Remembers this run's _seq for the next run.
+    prev = st.session_state.get(f"seen_{name}")
+    st.session_state[f"seen_{name}"] = (mid, state.get("_seq", 0))
+    return prev[1] if prev and prev[0] == mid else state.get("_seq", 0)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _player_tables(table_version):
+    import stats
+    balls = stats.load_ball_table()
+    return stats.career_table(balls), stats.season_table(balls)
+
+
+def player_tables():
+    import stats
+    return _player_tables(stats.table_version())
+
+
+MATCH_PAGE_SIZE = 20
+
+def match_label(mid, meta):
+    return f"{'🏁' if meta.get('status') == 'COMPLETED' else '🟢'} {meta.get('title', '')} — {mid}"
+
+
+def browse_matches(key):
+    # Filters + one page of the match catalog (newest first); returns [(mid, meta), ...]
+    with st.expander("Search matches", expanded=False):
+        c1, c2, c3 = st.columns(3)
+        q = c1.text_input("Title", key=f"{key}_q")
+        status = c2.selectbox("Status", ["Any", "Live", "Completed"], key=f"{key}_status")
+        venue = c3.text_input("Venue", key=f"{key}_venue")
+        c4, c5, c6 = st.columns(3)
+        player = c4.text_input("Player", key=f"{key}_player")
+        date_from = c5.date_input("From", value=None, key=f"{key}_from")
+        date_to = c6.date_input("To", value=None, key=f"{key}_to")
+    filters = dict(q=q.strip(), status=None if status == "Any" else status.lower(), venue=venue.strip(),
+                   player=player.strip(), date_from=date_from, date_to=date_to)
+    # One catalog query per run: the page number is the widget's value from the last run
+    page_key = f"{key}_page"; page_no = st.session_state.get(page_key, 1)
+    rows, total = db.list_matches(offset=(page_no - 1) * MATCH_PAGE_SIZE, limit=MATCH_PAGE_SIZE, **filters)
+    pages = max((total - 1) // MATCH_PAGE_SIZE + 1, 1)
+    if page_no > pages:  # the filters changed while on a later page
+        st.session_state[page_key] = 1
+        rows, _ = db.list_matches(limit=MATCH_PAGE_SIZE, **filters)
+    if pages > 1: st.number_input(f"Page (of {pages}, {total} matches)", 1, pages, key=page_key)
+    return rows
+
+
+def match_picker(key, label="Select Match"):
+    # Live matches come from the small active index; older ones via the catalog search
+    active = db.active_matches()
+    if active and not st.toggle("Search all matches", key=f"{key}_all"):
+        rows = list(active.items())[::-1]
+    else:
+        rows = browse_matches(key)
+    if not rows: st.info("No matches found."); return None, None
+    metas = dict(rows)
+    mid = st.selectbox(label, list(metas), format_func=lambda k: match_label(k, metas[k]), key=f"{key}_mid")
+    return mid, metas[mid]
+
+
+def projection_strip(mid, state, team_names=None):
+    # Chase equation, projected total and win probability (projection.py); shared by
+    # every viewer of the same ball. `state` is only read.
+    import projection
+    p = projection.project(mid, state)
+    if not p: return
+    name = lambda side: (team_names or {}).get(side, side)
+    win = " • ".join(f"{name(side)} {pr * 100:.0f}%" for side, pr in p["win"].items())
+    lo, mid_total, hi = p["projected"]
+    if p["target"]:
+        eq = (f"Need <b>{p['need']}</b> off {p['balls_left']} balls • RRR {p['rrr']}" if p["rrr"]
+              else f"Target {p['target']}")
+        line = f"{eq} • Projected {mid_total} ({lo}–{hi})"
+    else:
+        line = f"Projected total <b>{mid_total}</b> ({lo}–{hi})"
+    st.markdown(f"<div class='score-strip'>{line}<br>Win probability: {win}</div>", unsafe_allow_html=True)
+    st.caption(f"{p['sims']} simulations from the club's ball-by-ball history; tie {p['tie'] * 100:.1f}%.")